@@ -1,35 +1,45 @@
 import os
 import re
+import csv
 import glob
 import cv2
 import pandas as pd
 import numpy as np
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
 from openpyxl.drawing.image import Image as XLImage  # 이미지 삽입
 from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional
 
-# ===== 0) 사용자 설정 =====
-image_dir = r"Z:\03_혁신운영과\26) IoT과제 발굴심의 협의체\3.IoT 개발 과제\2511_선각1B공장 강재추적_DMIC\10. 영상기반\강재 AR부착사진\case_1"
-excel_path = os.path.join(image_dir, "marker_bottom_y.xlsx")
-thumb_dir = os.path.join(image_dir, "_excel_thumbs")  # 썸네일 저장 폴더
-os.makedirs(thumb_dir, exist_ok=True)
+# ===== 0) 설정 (기본값, CLI로 재정의 가능) =====
+DEFAULT_IMAGE_DIR = r"Z:\03_혁신운영과\26) IoT과제 발굴심의 협의체\3.IoT 개발 과제\2511_선각1B공장 강재추적_DMIC\10. 영상기반\강재 AR부착사진\case_1"
+DEFAULT_EXCEL_NAME = "marker_bottom_y.xlsx"
+DEFAULT_CSV_NAME = "marker_bottom_y.csv"  # 처리되는 대로 한 줄씩 기록
 
 # 엑셀에 넣을 이미지 최대 가로폭(픽셀). 너무 크면 엑셀 용량이 커집니다.
 THUMB_MAX_W = 900
 
-# 오버레이 이미지(마커 박스/ID/아래쪽 y 라인) 생성해서 넣기
-EMBED_OVERLAY = True
+# ArUco 사전
+DEFAULT_DICT = "DICT_6X6_250"
 
 # 처리할 이미지 확장자
 EXTS = ("*.png", "*.jpg", "*.jpeg", "*.bmp", "*.tif", "*.tiff")
 
+COLUMNS = ["파일명", "순번", "마커값", "아래쪽 Y좌표"]
+
 
 # ===== 1) 유틸 =====
-def load_image_any_path(path: str):
+def load_image_any_path(path: str) -> Optional[np.ndarray]:
     """한글/공백 경로 안전 로드: np.fromfile + cv2.imdecode"""
-    data = np.fromfile(path, dtype=np.uint8)
-    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+    try:
+        data = np.fromfile(path, dtype=np.uint8)
+        return cv2.imdecode(data, cv2.IMREAD_COLOR)
+    except Exception:
+        return None
+
 
-def save_thumb(img_bgr: np.ndarray, save_path: str, max_w: int = THUMB_MAX_W):
+def save_thumb(img_bgr: np.ndarray, save_path: str, max_w: int = THUMB_MAX_W) -> str:
     """썸네일 저장(PNG). 가로 기준으로 축소."""
     h, w = img_bgr.shape[:2]
     if w > max_w:
@@ -40,35 +50,36 @@ def save_thumb(img_bgr: np.ndarray, save_path: str, max_w: int = THUMB_MAX_W):
     cv2.imencode(".png", img_bgr)[1].tofile(save_path)
     return save_path
 
-def draw_overlay(img_bgr: np.ndarray, corners_list, ids_arr, marker_info):
-    """
-    corners_list: detectMarkers 결과 corners(list of (1,4,2))
-    ids_arr     : detectMarkers 결과 ids(np.ndarray Nx1)
-    marker_info : [(max_y, marker_id), ...] (정렬 전/후 무관)
-    """
+
+class MarkerRecord(NamedTuple):
+    """검출된 마커 1개"""
+    marker_id: int
+    bottom_y: float      # 가장 아래쪽 y(아래로 갈수록 큼)
+    corners: np.ndarray  # (4, 2) float32, detectMarkers 꼭짓점 순서
+
+
+def draw_overlay(img_bgr: np.ndarray, records: List[MarkerRecord]) -> np.ndarray:
+    """마커 박스/ID + 아래쪽 y(가장 큰 y) 수평선"""
     out = img_bgr.copy()
     # 마커 박스 & ID
-    for i, corner in enumerate(corners_list):
-        pts = corner[0].astype(int)  # (4,2)
+    for r in records:
+        pts = r.corners.astype(int)  # (4,2)
         # 테두리
         cv2.polylines(out, [pts], isClosed=True, color=(0, 200, 0), thickness=3)
         # ID 표기(좌상단 근처)
-        mid = pts.mean(axis=0).astype(int)
-        top_left = tuple(pts[0])
-        txt = f"ID {int(ids_arr[i][0])}"
-        cv2.putText(out, txt, (top_left[0], top_left[1] - 10),
+        top_left = tuple(int(v) for v in pts[0])
+        cv2.putText(out, f"ID {r.marker_id}", (top_left[0], top_left[1] - 10),
                     cv2.FONT_HERSHEY_SIMPLEX, 1.0, (0, 60, 255), 3, cv2.LINE_AA)
 
-    # 아래쪽 y(가장 큰 y) 수평선
-    H = out.shape[0]
     W = out.shape[1]
-    for max_y, m_id in marker_info:
-        y = int(round(max_y))
-        cv2.line(out, (0, y), (W-1, y), (255, 180, 0), 2)
-        cv2.putText(out, f"max_y({m_id})={y}", (10, max(30, y - 10)),
+    for r in records:
+        y = int(round(r.bottom_y))
+        cv2.line(out, (0, y), (W - 1, y), (255, 180, 0), 2)
+        cv2.putText(out, f"max_y({r.marker_id})={y}", (10, max(30, y - 10)),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.9, (255, 180, 0), 2, cv2.LINE_AA)
     return out
 
+
 def clean_sheet_name(name: str) -> str:
     """파일명 -> 엑셀 시트명(금지문자 제거, 31자 제한)"""
     base = os.path.splitext(name)[0]
@@ -76,133 +87,259 @@ def clean_sheet_name(name: str) -> str:
     return base[:31] or "sheet"
 
 
-# ===== 2) 이미지 수집 =====
-image_files = []
-for pat in EXTS:
-    image_files += glob.glob(os.path.join(image_dir, pat))
-if not image_files:
-    raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_dir}")
+def collect_images(image_dir: str) -> List[str]:
+    files = []
+    for pat in EXTS:
+        files.extend(glob.glob(os.path.join(image_dir, pat)))
+    return files
 
-# 파일명(베이스) -> 원본 경로
-file_map = {os.path.basename(p): p for p in image_files}
 
+# ===== 2) ArUco 검출 =====
+class MarkerDetector:
+    """ArUco 사전/파라미터/검출기를 한 번만 만들어 재사용 (OpenCV 버전 호환)"""
 
-# ===== 3) ArUco 준비 (버전 호환) =====
-aruco_dict = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_6X6_250)
-try:
-    parameters = cv2.aruco.DetectorParameters()
-except AttributeError:
-    parameters = cv2.aruco.DetectorParameters_create()
+    def __init__(self, dict_name: str = DEFAULT_DICT):
+        self.dictionary = cv2.aruco.getPredefinedDictionary(getattr(cv2.aruco, dict_name))
+        try:
+            self.parameters = cv2.aruco.DetectorParameters()
+        except AttributeError:
+            self.parameters = cv2.aruco.DetectorParameters_create()
+        try:
+            self._detector = cv2.aruco.ArucoDetector(self.dictionary, self.parameters)
+        except AttributeError:
+            self._detector = None  # 4.7 이전 API
 
-try:
-    detector = cv2.aruco.ArucoDetector(aruco_dict, parameters)
-    use_new_api = True
-except AttributeError:
-    detector = None
-    use_new_api = False
+    def detect(self, img: np.ndarray):
+        if self._detector is not None:
+            corners, ids, _ = self._detector.detectMarkers(img)
+        else:
+            corners, ids, _ = cv2.aruco.detectMarkers(img, self.dictionary, parameters=self.parameters)
+        return corners, ids
 
 
-# ===== 4) 처리 =====
-rows = []        # 엑셀 표 데이터
-thumb_for_file = {}  # 각 파일별로 삽입할 썸네일 경로
+_default_detector: Optional[MarkerDetector] = None
 
-for f in image_files:
-    img = load_image_any_path(f)
-    fname = os.path.basename(f)
 
-    print(f"\n=== {fname} ===")
-    if img is None:
-        print("[경고] 이미지 로드 실패")
-        rows.append([fname, None, None, None])
-        # 그래도 이미지 썸네일 생성 시도(원본이 없으니 생략)
-        continue
-
-    # 마커 검출
-    if use_new_api:
-        corners, ids, _ = detector.detectMarkers(img)
-    else:
-        corners, ids, _ = cv2.aruco.detectMarkers(img, aruco_dict, parameters=parameters)
+def detect_markers(img: np.ndarray, detector: Optional[MarkerDetector] = None) -> List[MarkerRecord]:
+    """이미지 1장의 마커를 아래쪽(큰 y) -> 위쪽 순으로 반환. 마커가 없으면 빈 목록"""
+    global _default_detector
+    if detector is None:
+        if _default_detector is None:
+            _default_detector = MarkerDetector()
+        detector = _default_detector
 
+    corners, ids = detector.detect(img)
     if ids is None or len(ids) == 0:
-        print("마커 없음")
-        rows.append([fname, None, None, None])
-        # 이미지 썸네일(원본 그대로) 저장
-        thumb_path = os.path.join(thumb_dir, Path(fname).stem + "_thumb.png")
-        save_thumb(img, thumb_path, THUMB_MAX_W)
-        thumb_for_file[fname] = thumb_path
-        continue
-
-    # 각 마커의 가장 아래쪽 y 계산
-    marker_info = []
-    for i, corner in enumerate(corners):
-        ys = corner[0][:, 1]
-        max_y = float(ys.max())  # 아래로 갈수록 y 큼
-        marker_id = int(ids[i][0])
-        marker_info.append((max_y, marker_id))
-
-    # 아래쪽(큰 y) -> 위쪽(작은 y) 정렬
-    marker_info.sort(reverse=True, key=lambda x: x[0])
-
-    # 터미널 출력 + 결과 누적
-    for idx, (max_y, marker_id) in enumerate(marker_info):
-        print(f"{idx:02d}\tID={marker_id}\tmax_y={max_y:.2f}")
-        rows.append([fname, f"{idx:02d}", marker_id, max_y])
+        return []
+    records = []
+    for corner, marker_id in zip(corners, np.asarray(ids).reshape(-1)):  # ids: (N,1) 또는 (N,)
+        pts = corner.reshape(4, 2)
+        records.append(MarkerRecord(int(marker_id), float(pts[:, 1].max()), pts))
+    # 아래쪽(큰 y) -> 위쪽(작은 y), 같으면 ID 순
+    records.sort(key=lambda r: (-r.bottom_y, r.marker_id))
+    return records
+
+
+# ===== 3) 이미지 1장 처리 =====
+@dataclass(frozen=True)
+class ProcessOptions:
+    """이미지 1장 처리 옵션(워커 프로세스로 그대로 전달)"""
+    thumb_dir: str
+    no_overlay: bool = False
+    thumb_max_w: int = THUMB_MAX_W
+
+
+@dataclass
+class ImageResult:
+    fname: str
+    rows: List[List[object]]
+    thumb_path: Optional[str] = None
+    log: List[str] = field(default_factory=list)
+
+
+def process_image(path: str, opts: ProcessOptions, detector: Optional[MarkerDetector] = None) -> ImageResult:
+    """로드 -> 마커 검출 -> (오버레이) 썸네일 저장"""
+    fname = os.path.basename(path)
+    img = load_image_any_path(path)
+    result = ImageResult(fname, [])
+
+    if img is None:
+        result.log.append("[경고] 이미지 로드 실패")
+        result.rows.append([fname, None, None, None])
+        return result
+
+    records = detect_markers(img, detector)
+    if not records:
+        result.log.append("마커 없음")
+        result.rows.append([fname, None, None, None])
+        thumb_path = os.path.join(opts.thumb_dir, Path(fname).stem + "_thumb.png")
+        result.thumb_path = save_thumb(img, thumb_path, opts.thumb_max_w)
+        return result
+
+    for idx, r in enumerate(records):
+        result.log.append(f"{idx:02d}\tID={r.marker_id}\tmax_y={r.bottom_y:.2f}")
+        result.rows.append([fname, f"{idx:02d}", r.marker_id, r.bottom_y])
 
     # 엑셀 삽입용 이미지(오버레이 or 원본) 썸네일 저장
-    if EMBED_OVERLAY:
-        img_overlay = draw_overlay(img, corners, ids, marker_info)
-        thumb_path = os.path.join(thumb_dir, Path(fname).stem + "_overlay_thumb.png")
-        save_thumb(img_overlay, thumb_path, THUMB_MAX_W)
+    if opts.no_overlay:
+        thumb_path = os.path.join(opts.thumb_dir, Path(fname).stem + "_thumb.png")
+        result.thumb_path = save_thumb(img, thumb_path, opts.thumb_max_w)
     else:
-        thumb_path = os.path.join(thumb_dir, Path(fname).stem + "_thumb.png")
-        save_thumb(img, thumb_path, THUMB_MAX_W)
-    thumb_for_file[fname] = thumb_path
-
-
-# ===== 5) DataFrame & 엑셀 저장(통합 + 파일별 시트 + 이미지 삽입) =====
-df = pd.DataFrame(rows, columns=["파일명", "순번", "마커값", "아래쪽 Y좌표"])
-
-# openpyxl 필요: pip install openpyxl pillow
-with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
-    # (1) 통합 시트
-    df.to_excel(writer, sheet_name="all_results", index=False)
-    ws_all = writer.sheets["all_results"]
-    ws_all.freeze_panes = "A2"
-    ws_all.column_dimensions["A"].width = 40
-    ws_all.column_dimensions["B"].width = 8
-    ws_all.column_dimensions["C"].width = 10
-    ws_all.column_dimensions["D"].width = 14
-
-    # (2) 파일별 시트 + 이미지 삽입
-    used = {"all_results"}
-    for fname, g in df.groupby("파일명", sort=False):
-        sheet = clean_sheet_name(fname)
-        base = sheet
-        i = 2
-        while sheet in used:
-            sheet = clean_sheet_name(f"{base}_{i}")
-            i += 1
-        used.add(sheet)
-
-        g.to_excel(writer, sheet_name=sheet, index=False)
-        ws = writer.sheets[sheet]
-        ws.freeze_panes = "A2"
-
-        # 표 가독성
-        ws.column_dimensions["A"].width = 40  # 파일명
-        ws.column_dimensions["B"].width = 8   # 순번
-        ws.column_dimensions["C"].width = 10  # 마커값
-        ws.column_dimensions["D"].width = 14  # 아래쪽 Y좌표
-
-        # 이미지 삽입(썸네일)
-        img_path = thumb_for_file.get(fname)
-        if img_path and os.path.exists(img_path):
-            try:
-                xlimg = XLImage(img_path)
-                # G2에 앵커(표 오른쪽에 이미지가 보이게)
-                ws.add_image(xlimg, "F2")
-            except Exception as e:
-                print(f"[이미지 삽입 실패] {fname}: {e}")
-
-print(f"\n엑셀 저장 완료: {excel_path}")
-print(f"썸네일/오버레이 파일 폴더: {thumb_dir}")
+        thumb_path = os.path.join(opts.thumb_dir, Path(fname).stem + "_overlay_thumb.png")
+        result.thumb_path = save_thumb(draw_overlay(img, records), thumb_path, opts.thumb_max_w)
+    return result
+
+
+# ===== 4) 배치(직렬/병렬) =====
+_worker_detector: Optional[MarkerDetector] = None
+
+
+def _init_worker(dict_name: str):
+    # 워커마다 검출기를 한 번만 만든다. 프로세스 수만큼 병렬이므로 OpenCV 내부 스레드는 1개로
+    global _worker_detector
+    cv2.setNumThreads(1)
+    _worker_detector = MarkerDetector(dict_name)
+
+
+def _process_in_worker(path: str, opts: ProcessOptions) -> ImageResult:
+    return process_image(path, opts, _worker_detector)
+
+
+def iter_results(files: List[str], opts: ProcessOptions, workers: int = 1,
+                 dict_name: str = DEFAULT_DICT) -> Iterator[ImageResult]:
+    """
+    끝난 이미지부터 ImageResult를 내보낸다(workers > 1 이면 완료 순서, 파일 순서와 다를 수 있음 -
+    CSV는 이 순서로 기록되고, 엑셀은 write_excel이 파일 순서로 다시 정렬한다).
+    풀에는 워커 수의 몇 배만큼만 미리 넣어 두고 하나 끝날 때마다 하나씩 채우므로
+    폴더가 커도 대기 중인 작업/결과가 메모리에 쌓이지 않는다.
+    """
+    if workers <= 1:
+        detector = MarkerDetector(dict_name)
+        for f in files:
+            yield process_image(f, opts, detector)
+        return
+
+    pending = iter(files)
+    window = workers * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dict_name,)) as pool:
+        running = set()
+        for f in pending:
+            running.add(pool.submit(_process_in_worker, f, opts))
+            if len(running) >= window:
+                break
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                nxt = next(pending, None)
+                if nxt is not None:
+                    running.add(pool.submit(_process_in_worker, nxt, opts))
+
+
+# ===== 5) 엑셀 저장(통합 + 파일별 시트 + 이미지 삽입) =====
+def write_excel(csv_path: str, thumb_for_file: dict, excel_path: str, files: Optional[List[str]] = None):
+    """
+    스트리밍으로 기록한 CSV를 읽어 엑셀 리포트 작성(배치가 끝난 뒤 한 번).
+    CSV는 처리가 끝난 순서(병렬이면 완료 순서)이므로 files(입력 순서)가 있으면 그 순서로 행/시트를 정렬한다.
+    thumb_for_file: 파일명 -> process_image가 저장한 썸네일 경로
+    """
+    df = pd.read_csv(csv_path, encoding="utf-8-sig", dtype={"순번": str, "마커값": "Int64"})
+    if files is not None:
+        order = {os.path.basename(f): i for i, f in enumerate(files)}
+        # 안정 정렬이므로 같은 파일 안의 순번 순서는 유지된다
+        df = df.sort_values("파일명", key=lambda s: s.map(order).fillna(len(order)), kind="stable")
+
+    # openpyxl 필요: pip install openpyxl pillow
+    with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
+        # (1) 통합 시트
+        df.to_excel(writer, sheet_name="all_results", index=False)
+        ws_all = writer.sheets["all_results"]
+        ws_all.freeze_panes = "A2"
+        ws_all.column_dimensions["A"].width = 40
+        ws_all.column_dimensions["B"].width = 8
+        ws_all.column_dimensions["C"].width = 10
+        ws_all.column_dimensions["D"].width = 14
+
+        # (2) 파일별 시트 + 이미지 삽입
+        used = {"all_results"}
+        for fname, g in df.groupby("파일명", sort=False):
+            sheet = clean_sheet_name(fname)
+            base = sheet
+            i = 2
+            while sheet in used:
+                sheet = clean_sheet_name(f"{base}_{i}")
+                i += 1
+            used.add(sheet)
+
+            g.to_excel(writer, sheet_name=sheet, index=False)
+            ws = writer.sheets[sheet]
+            ws.freeze_panes = "A2"
+
+            # 표 가독성
+            ws.column_dimensions["A"].width = 40  # 파일명
+            ws.column_dimensions["B"].width = 8   # 순번
+            ws.column_dimensions["C"].width = 10  # 마커값
+            ws.column_dimensions["D"].width = 14  # 아래쪽 Y좌표
+
+            # 이미지 삽입(썸네일) - 마커가 있으면 오버레이, 없으면 원본 썸네일
+            img_path = thumb_for_file.get(fname)
+            if img_path and os.path.exists(img_path):
+                try:
+                    xlimg = XLImage(img_path)
+                    # F2에 앵커(표 오른쪽에 이미지가 보이게)
+                    ws.add_image(xlimg, "F2")
+                except Exception as e:
+                    print(f"[이미지 삽입 실패] {fname}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ArUco 마커 아래쪽 Y 좌표 계산 및 CSV/엑셀 리포트")
+    parser.add_argument("--dir", dest="image_dir", default=DEFAULT_IMAGE_DIR, help="이미지 폴더 경로")
+    parser.add_argument("--excel", dest="excel_name", default=DEFAULT_EXCEL_NAME, help="엑셀 파일명")
+    parser.add_argument("--csv", dest="csv_name", default=DEFAULT_CSV_NAME, help="처리되는 대로 기록하는 CSV 파일명")
+    parser.add_argument("--no-excel", action="store_true", help="CSV만 기록(엑셀 리포트 생략)")
+    parser.add_argument("--no-overlay", action="store_true", help="엑셀 썸네일에 오버레이 미적용")
+    parser.add_argument("--thumb-max-w", type=int, default=THUMB_MAX_W, help="썸네일 최대 가로폭(px)")
+    parser.add_argument("--dict", dest="dict_name", default=DEFAULT_DICT, help="ArUco 사전 이름(cv2.aruco.DICT_*)")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 처리 프로세스 수(1이면 직렬, 0이면 CPU 수)")
+    args = parser.parse_args()
+
+    if not hasattr(cv2.aruco, args.dict_name):
+        parser.error(f"알 수 없는 ArUco 사전: {args.dict_name}")
+
+    image_dir = args.image_dir
+    excel_path = os.path.join(image_dir, args.excel_name)
+    csv_path = os.path.join(image_dir, args.csv_name)
+    thumb_dir = os.path.join(image_dir, "_excel_thumbs")  # 썸네일 저장 폴더
+    os.makedirs(thumb_dir, exist_ok=True)
+
+    files = collect_images(image_dir)
+    if not files:
+        raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_dir}")
+
+    opts = ProcessOptions(thumb_dir=thumb_dir, no_overlay=args.no_overlay, thumb_max_w=args.thumb_max_w)
+    workers = args.workers or os.cpu_count() or 1
+
+    # 결과는 끝나는 대로 CSV에 한 줄씩 기록(전체 결과를 메모리에 모으지 않음, 파일당 썸네일 경로만 보관)
+    thumb_for_file = {}
+    with open(csv_path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for n, result in enumerate(iter_results(files, opts, workers, args.dict_name), 1):
+            print(f"\n=== {result.fname} ({n}/{len(files)}) ===")
+            for line in result.log:
+                print(line)
+            writer.writerows(result.rows)
+            f.flush()
+            if result.thumb_path:
+                thumb_for_file[result.fname] = result.thumb_path
+
+    print(f"\nCSV 저장 완료: {csv_path}")
+    if not args.no_excel:
+        write_excel(csv_path, thumb_for_file, excel_path, files)
+        print(f"엑셀 저장 완료: {excel_path}")
+    print(f"썸네일/오버레이 파일 폴더: {thumb_dir}")
+
+
+if __name__ == "__main__":
+    main()
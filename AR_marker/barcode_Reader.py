@@ -5,9 +5,10 @@ import cv2
 import pandas as pd
 import numpy as np
 import argparse
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, List, NamedTuple, Tuple, Optional
 from pyzbar.pyzbar import decode, ZBarSymbol
 from openpyxl.drawing.image import Image as XLImage
 
@@ -17,6 +18,13 @@ DEFAULT_EXCEL_NAME = "barcode_results.xlsx"
 THUMB_MAX_W = 900  # 썸네일 최대 가로폭(px)
 IMAGE_CELL_ANCHOR = "F2"  # 엑셀 내 이미지 삽입 위치(좌상단 셀)
 
+# ROI 우선 탐색(--roi): 축소 이미지에서 후보 영역을 찾고 원본 해상도 crop만 디코딩
+ROI_SCAN_W = 1000          # 후보 영역 탐색용 축소 가로폭(px)
+ROI_PAD = 0.15             # 후보 영역 여백(영역 크기 대비 비율, quiet zone 포함용)
+ROI_MIN_AREA = 0.0005      # 축소 이미지 면적 대비 최소 후보 면적
+ROI_MAX_COUNT = 12         # 이미지당 최대 후보 영역 수(큰 것부터)
+ROI_MAX_COVER = 0.6        # 후보 영역이 화면의 이 비율 이상이면 전체 화면 디코딩과 차이가 없으므로 전체로
+
 # 처리 대상 확장자
 EXTS = ("*.png", "*.jpg", "*.jpeg", "*.bmp", "*.tif", "*.tiff")
 
@@ -56,30 +64,23 @@ def clean_sheet_name(name: str) -> str:
     return base[:31] or "sheet"
 
 
-def bottom_y_of_decoded_like(rect: Tuple[int, int, int, int], polygon: Optional[List[Tuple[int, int]]]) -> float:
-    if polygon and len(polygon) > 0:
-        return float(max(y for _, y in polygon))
-    x, y, w, h = rect
-    return float(y + h)
-
-
-@dataclass
-class SimpleDecoded:
+class CodeRecord(NamedTuple):
+    """디코딩된 코드 1개(원본 좌표). bottom_y는 만들 때 한 번만 계산"""
     type: str
-    data: bytes
+    value: str
+    bottom_y: float
     rect: Tuple[int, int, int, int]
-    polygon: Optional[List[Tuple[int, int]]]
+    polygon: Optional[np.ndarray]  # (N, 2) int32, 꼭짓점이 없으면 None
 
 
-def draw_overlay(img_bgr: np.ndarray, decoded_list: List[SimpleDecoded], code_info: List[Tuple[float, str, str]]):
+def draw_overlay(img_bgr: np.ndarray, decoded_list: List[CodeRecord], code_info: List[Tuple[float, str, str]]):
     """디텍션 박스/라벨 + 정렬 기준선(max_y) 오버레이"""
     out = img_bgr.copy()
     H, W = out.shape[:2]
 
     for d in decoded_list:
-        pts = d.polygon
-        if pts and len(pts) >= 4:
-            pts_np = np.array(pts, dtype=np.int32)
+        pts_np = d.polygon
+        if pts_np is not None:
             cv2.polylines(out, [pts_np], isClosed=True, color=(0, 200, 0), thickness=3)
             mid = pts_np.mean(axis=0).astype(int)
             label_xy = (int(mid[0]), max(20, int(mid[1]) - 10))
@@ -89,7 +90,7 @@ def draw_overlay(img_bgr: np.ndarray, decoded_list: List[SimpleDecoded], code_in
             label_xy = (x, max(20, y - 10))
 
         t = d.type
-        val = d.data.decode("utf-8", "ignore")
+        val = d.value
         txt = f"{t}: {val[:40]}{'...' if len(val) > 40 else ''}"
         cv2.putText(out, txt, label_xy, cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 60, 255), 2, cv2.LINE_AA)
 
@@ -102,12 +103,10 @@ def draw_overlay(img_bgr: np.ndarray, decoded_list: List[SimpleDecoded], code_in
     return out
 
 
-def enhance_for_barcode(img_bgr: np.ndarray) -> np.ndarray:
-    """그레이 + CLAHE로 대비 향상(선택적 전처리)."""
-    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+def enhance_for_barcode(gray: np.ndarray) -> np.ndarray:
+    """그레이 이미지에 CLAHE로 대비 향상(선택적 전처리)."""
     clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    eq = clahe.apply(gray)
-    return cv2.cvtColor(eq, cv2.COLOR_GRAY2BGR)
+    return clahe.apply(gray)
 
 
 def rotate_image(img: np.ndarray, k90: int) -> np.ndarray:
@@ -132,64 +131,180 @@ def map_point_back_from_rot(x: int, y: int, W: int, H: int, k90: int) -> Tuple[i
     return W - 1 - y, x
 
 
-def decode_with_rotations(img_bgr: np.ndarray, try_enhance: bool, rotations: List[int]) -> Tuple[List[SimpleDecoded], List[Tuple[float, str, str]]]:
-    H, W = img_bgr.shape[:2]
-    decoded_agg: List[SimpleDecoded] = []
-    seen = set()
+def _bottom_y_back_from_rot(pts, H: int, k90: int) -> int:
+    """회전 이미지의 꼭짓점들을 원본으로 되돌렸을 때의 최대 y(map_point_back_from_rot의 y 성분만)"""
+    k = k90 % 4
+    if k == 0:
+        return max(p.y for p in pts)
+    if k == 1:
+        return H - 1 - min(p.x for p in pts)
+    if k == 2:
+        return H - 1 - min(p.y for p in pts)
+    return max(p.x for p in pts)
 
-    candidates = [(0, img_bgr)]
+
+def map_points_back_from_rot(pts: np.ndarray, W: int, H: int, k90: int) -> np.ndarray:
+    """map_point_back_from_rot의 배열 버전: (N, 2) 좌표를 한 번에 되돌림"""
+    k = k90 % 4
+    if k == 0:
+        return pts
+    x, y = pts[:, 0], pts[:, 1]
+    if k == 1:
+        return np.stack((y, H - 1 - x), axis=1)
+    if k == 2:
+        return np.stack((W - 1 - x, H - 1 - y), axis=1)
+    return np.stack((W - 1 - y, x), axis=1)
+
+
+def iter_candidates(gray: np.ndarray, try_enhance: bool, rotations: List[int]):
+    """
+    (k90, 그레이 이미지) 후보를 필요할 때 하나씩 만든다(전체 목록을 미리 만들지 않음).
+    순서: 원본, 원본+CLAHE, 회전, 회전+CLAHE ...
+    CLAHE는 원본에 한 번만 적용하고 회전은 그 결과를 돌려서 쓴다(8x8 타일 격자는 90도 회전해도 같은 격자).
+    """
+    yield 0, gray
+    enhanced = None
     if try_enhance:
-        candidates.append((0, enhance_for_barcode(img_bgr)))
+        enhanced = enhance_for_barcode(gray)
+        yield 0, enhanced
     for k90 in rotations:
         if k90 % 4 == 0:
             continue
-        rot_img = rotate_image(img_bgr, k90)
-        candidates.append((k90, rot_img))
-        if try_enhance:
-            candidates.append((k90, enhance_for_barcode(rot_img)))
+        yield k90, rotate_image(gray, k90)
+        if enhanced is not None:
+            yield k90, rotate_image(enhanced, k90)
+
+
+def _merge_rects(rects: List[List[int]]) -> List[List[int]]:
+    """겹치는 사각형(x0, y0, x1, y1)을 더 이상 겹치지 않을 때까지 합친다"""
+    merged = True
+    while merged:
+        merged = False
+        out: List[List[int]] = []
+        for r in rects:
+            for m in out:
+                if r[0] <= m[2] and m[0] <= r[2] and r[1] <= m[3] and m[1] <= r[3]:
+                    m[0], m[1] = min(m[0], r[0]), min(m[1], r[1])
+                    m[2], m[3] = max(m[2], r[2]), max(m[3], r[3])
+                    merged = True
+                    break
+            else:
+                out.append(list(r))
+        rects = out
+    return rects
+
+
+def find_barcode_rois(gray: np.ndarray, scan_w: int = ROI_SCAN_W) -> List[Tuple[int, int, int, int]]:
+    """
+    축소 이미지에서 바코드/QR 후보 영역을 찾아 원본 좌표 (x, y, w, h) 목록으로 반환.
+    코드 영역은 가로/세로 경계가 촘촘해 기울기 크기가 크다 -> 기울기 + 닫힘 연산으로 덩어리를 만들고 윤곽을 딴다.
+    후보가 화면 대부분을 덮으면 [전체 화면] 하나를 반환.
+    """
+    H, W = gray.shape[:2]
+    scale = min(1.0, scan_w / float(W))
+    small = cv2.resize(gray, (int(W * scale), int(H * scale)), interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+    h, w = small.shape[:2]
+
+    gx = cv2.Sobel(small, cv2.CV_16S, 1, 0, ksize=3)
+    gy = cv2.Sobel(small, cv2.CV_16S, 0, 1, ksize=3)
+    grad = cv2.addWeighted(cv2.convertScaleAbs(gx), 0.5, cv2.convertScaleAbs(gy), 0.5, 0)
+    grad = cv2.blur(grad, (5, 5))
+    _, mask = cv2.threshold(grad, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 9)))
+    mask = cv2.erode(mask, None, iterations=3)   # 잔무늬(강재 표면 질감) 제거
+    mask = cv2.dilate(mask, None, iterations=3)
+
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    rects = []
+    for c in sorted(contours, key=cv2.contourArea, reverse=True)[:ROI_MAX_COUNT]:
+        x, y, cw, ch = cv2.boundingRect(c)
+        if cw * ch < ROI_MIN_AREA * w * h:
+            break
+        pad = int(ROI_PAD * max(cw, ch)) + 4
+        rects.append([max(0, x - pad), max(0, y - pad), min(w, x + cw + pad), min(h, y + ch + pad)])
+    rects = _merge_rects(rects)
+
+    if sum((r[2] - r[0]) * (r[3] - r[1]) for r in rects) >= ROI_MAX_COVER * w * h:
+        return [(0, 0, W, H)]
+    inv = 1.0 / scale
+    rois = []
+    for x0, y0, x1, y1 in rects:
+        X0, Y0 = int(x0 * inv), int(y0 * inv)
+        X1, Y1 = min(W, int(np.ceil(x1 * inv))), min(H, int(np.ceil(y1 * inv)))
+        rois.append((X0, Y0, X1 - X0, Y1 - Y0))
+    return rois
+
+
+def decode_with_rotations(img_bgr: np.ndarray, try_enhance: bool, rotations: List[int], expect: int = 0,
+                          roi: bool = False, roi_fallback: bool = True) -> Tuple[List[CodeRecord], List[Tuple[float, str, str]]]:
+    """
+    회전/전처리 후보를 차례로 디코딩해 (타입, 값) 기준으로 모은다.
+    expect > 0 이면 서로 다른 코드가 expect개 모이는 즉시 남은 후보는 만들지도 디코딩하지도 않는다.
+    (1이면 코드가 하나라도 나온 첫 후보에서 멈춤, 0이면 모든 후보 탐색)
+    roi=True 이면 find_barcode_rois 영역만 원본 해상도로 잘라 디코딩하고(좌표는 원본 기준으로 되돌림),
+    roi_fallback=True 이면 영역에서 하나도 못 찾았을 때 전체 화면으로 다시 찾는다.
+    """
+    H, W = img_bgr.shape[:2]
+    decoded_agg: Dict[Tuple[str, str], CodeRecord] = {}  # (타입, 값) -> 하단Y가 가장 큰 기록
+
+    # pyzbar는 3채널 배열이면 첫 채널만 쓰므로 그레이로 한 번만 변환해 넘긴다(회전도 1채널로)
+    gray = img_bgr if img_bgr.ndim == 2 else cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
 
-    for k90, img in candidates:
+    full = (0, 0, W, H)
+    regions = find_barcode_rois(gray) if roi else [full]
+    for ox, oy, rw, rh in regions:
+        if expect and len(decoded_agg) >= expect:
+            break
+        _decode_region(gray[oy:oy + rh, ox:ox + rw], ox, oy, try_enhance, rotations, expect, decoded_agg)
+    if roi and roi_fallback and not decoded_agg and regions != [full]:
+        _decode_region(gray, 0, 0, try_enhance, rotations, expect, decoded_agg)  # 영역에서 못 찾으면 전체 화면
+
+    code_info = [(r.bottom_y, r.type, r.value) for r in decoded_agg.values()]
+    # 하단Y 큰 순, 같으면 타입/값 순(발견 순서와 무관하게 결과를 고정 -> 직렬/병렬 결과 동일)
+    code_info.sort(key=lambda x: (-x[0], x[1], x[2]))
+
+    return list(decoded_agg.values()), code_info
+
+
+def _decode_region(gray: np.ndarray, ox: int, oy: int, try_enhance: bool, rotations: List[int], expect: int,
+                   decoded_agg: Dict[Tuple[str, str], CodeRecord]):
+    """영역(crop) 하나의 회전/전처리 후보를 디코딩해 decoded_agg에 합친다. (ox, oy): crop의 원본 내 위치"""
+    H, W = gray.shape[:2]
+    offset = np.array((ox, oy), dtype=np.int32)
+    for k90, img in iter_candidates(gray, try_enhance, rotations):
         dec = decode(img, symbols=SYMBOLS)
         if not dec:
             continue
         for d in dec:
             t = d.type
             v = d.data.decode("utf-8", "ignore")
-            rect = (d.rect.left, d.rect.top, d.rect.width, d.rect.height)
-            poly = None
+            key = (t, v)
+            prev = decoded_agg.get(key)
             pts = getattr(d, "polygon", None)
             if pts and len(pts) >= 4:
-                poly = [map_point_back_from_rot(p.x, p.y, W, H, k90) for p in pts]
-                xs = [p[0] for p in poly]
-                ys = [p[1] for p in poly]
-                rect = (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+                # 하단Y만 먼저 계산해 비교하고, 기록을 바꿀 때만 꼭짓점 배열을 만든다
+                btm = float(_bottom_y_back_from_rot(pts, H, k90) + oy)
+                if prev is not None and btm <= prev.bottom_y:
+                    continue
+                poly = map_points_back_from_rot(np.array(pts, dtype=np.int32), W, H, k90) + offset
+                x0, y0 = poly.min(axis=0)
+                x1, y1 = poly.max(axis=0)
+                rect = (int(x0), int(y0), int(x1 - x0), int(y1 - y0))
             else:
-                x, y, w, h = rect
+                poly = None
+                x, y, w, h = d.rect.left, d.rect.top, d.rect.width, d.rect.height
                 x0, y0 = map_point_back_from_rot(x, y, W, H, k90)
                 x1, y1 = map_point_back_from_rot(x + w, y + h, W, H, k90)
-                rect = (min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0))
+                rect = (min(x0, x1) + ox, min(y0, y1) + oy, abs(x1 - x0), abs(y1 - y0))
+                btm = float(rect[1] + rect[3])
+                if prev is not None and btm <= prev.bottom_y:
+                    continue
 
-            key = (t, v)
-            btm = bottom_y_of_decoded_like(rect, poly)
             # 중복 제거(동일 타입+값): 더 큰 하단Y 우선
-            replaced = False
-            for i, sd in enumerate(decoded_agg):
-                if sd.type == t and sd.data.decode("utf-8", "ignore") == v:
-                    prev_btm = bottom_y_of_decoded_like(sd.rect, sd.polygon)
-                    if btm > prev_btm:
-                        decoded_agg[i] = SimpleDecoded(t, v.encode("utf-8"), rect, poly)
-                    replaced = True
-                    break
-            if not replaced:
-                decoded_agg.append(SimpleDecoded(t, v.encode("utf-8"), rect, poly))
+            decoded_agg[key] = CodeRecord(t, v, btm, rect, poly)
 
-    code_info: List[Tuple[float, str, str]] = []
-    for sd in decoded_agg:
-        v = sd.data.decode("utf-8", "ignore")
-        code_info.append((bottom_y_of_decoded_like(sd.rect, sd.polygon), sd.type, v))
-    code_info.sort(reverse=True, key=lambda x: x[0])
-
-    return decoded_agg, code_info
+        if expect and len(decoded_agg) >= expect:
+            return  # 기대한 코드 수를 모두 찾음 -> 남은 회전/전처리 후보 생략
 
 
 def collect_images(image_dir: str) -> List[str]:
@@ -199,6 +314,91 @@ def collect_images(image_dir: str) -> List[str]:
     return files
 
 
+@dataclass(frozen=True)
+class ProcessOptions:
+    """이미지 1장 처리 옵션(워커 프로세스로 그대로 전달)"""
+    thumb_dir: str
+    try_enhance: bool = False
+    rotations: Tuple[int, ...] = (1, 2, 3)
+    no_overlay: bool = False
+    thumb_max_w: int = THUMB_MAX_W
+    expect: int = 0
+    roi: bool = False
+    roi_fallback: bool = True
+
+
+@dataclass
+class ImageResult:
+    fname: str
+    rows: List[List[object]]
+    thumb_path: Optional[str] = None
+    log: List[str] = field(default_factory=list)  # 터미널 출력(메인 프로세스에서 파일 순서대로 출력)
+
+
+def parse_rotations(try_rot: str) -> Tuple[int, ...]:
+    if try_rot == "all":
+        return (1, 2, 3)
+    if try_rot == "none":
+        return ()
+    return ({"90": 1, "180": 2, "270": 3}[try_rot],)
+
+
+def process_image(path: str, opts: ProcessOptions) -> ImageResult:
+    """로드 -> 회전/전처리 디코딩 -> 오버레이 -> 썸네일 저장. 직렬/병렬 모드 공통"""
+    fname = os.path.basename(path)
+    img = load_image_any_path(path)
+    result = ImageResult(fname, [])
+
+    if img is None:
+        result.log.append("[경고] 이미지 로드 실패")
+        result.rows.append([fname, None, None, None, None])
+        return result
+
+    decoded_list, code_info = decode_with_rotations(img, try_enhance=opts.try_enhance, rotations=list(opts.rotations), expect=opts.expect,
+                                                    roi=opts.roi, roi_fallback=opts.roi_fallback)
+
+    if not code_info:
+        result.log.append("바코드/QR 미검출")
+        result.rows.append([fname, None, None, None, None])
+        thumb_path = os.path.join(opts.thumb_dir, Path(fname).stem + "_thumb.png")
+        result.thumb_path = save_thumb(img, thumb_path, opts.thumb_max_w)
+        return result
+
+    for idx, (btm_y, t, v) in enumerate(code_info):
+        show_val = v if len(v) <= 80 else (v[:80] + "...")
+        result.log.append(f"{idx:02d}\tTYPE={t}\tmax_y={btm_y:.2f}\tVAL={show_val}")
+        result.rows.append([fname, f"{idx:02d}", t, v, btm_y])
+
+    overlay_img = img if opts.no_overlay else draw_overlay(img, decoded_list, code_info)
+    thumb_path = os.path.join(opts.thumb_dir, Path(fname).stem + ("_thumb.png" if opts.no_overlay else "_overlay_thumb.png"))
+    result.thumb_path = save_thumb(overlay_img, thumb_path, opts.thumb_max_w)
+    return result
+
+
+def _init_worker():
+    # 프로세스 수만큼 병렬이므로 OpenCV 내부 스레드는 1개로(코어 과다 점유 방지)
+    cv2.setNumThreads(1)
+
+
+def _process_one(args: Tuple[str, ProcessOptions]) -> ImageResult:
+    return process_image(*args)
+
+
+def iter_results(files: List[str], opts: ProcessOptions, workers: int = 1, chunksize: int = 0):
+    """
+    파일 순서대로 ImageResult를 내보낸다.
+    workers > 1 이면 프로세스 풀에 청크 단위로 나눠 맡기고, map으로 입력 순서대로 모으므로 결과는 직렬 모드와 같다.
+    """
+    if workers <= 1:
+        for f in files:
+            yield process_image(f, opts)
+        return
+    if chunksize <= 0:
+        chunksize = max(1, len(files) // (workers * 4))  # 워커당 4청크 정도: 분배 균형과 IPC 횟수 절충
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        yield from pool.map(_process_one, ((f, opts) for f in files), chunksize=chunksize)
+
+
 def main():
     parser = argparse.ArgumentParser(description="바코드/QR 하단 Y 좌표 계산 및 엑셀 리포트")
     parser.add_argument("--dir", dest="image_dir", default=DEFAULT_IMAGE_DIR, help="이미지 폴더 경로")
@@ -207,6 +407,11 @@ def main():
     parser.add_argument("--thumb-max-w", type=int, default=THUMB_MAX_W, help="썸네일 최대 가로폭(px)")
     parser.add_argument("--enhance", action="store_true", help="그레이/CLAHE 전처리 시도")
     parser.add_argument("--try-rot", default="all", choices=["none", "90", "180", "270", "all"], help="추가 회전 탐색")
+    parser.add_argument("--expect", type=int, default=0, help="이미지당 코드가 이 개수만큼 나오면 남은 회전/전처리 탐색 중단(0이면 전부 탐색)")
+    parser.add_argument("--roi", action="store_true", help="축소 이미지에서 코드 후보 영역을 찾아 그 부분만 원본 해상도로 디코딩")
+    parser.add_argument("--no-roi-fallback", action="store_true", help="--roi에서 영역 내 코드가 없어도 전체 화면 재탐색 안 함")
+    parser.add_argument("--workers", type=int, default=1, help="병렬 처리 프로세스 수(1이면 직렬, 0이면 CPU 수)")
+    parser.add_argument("--chunksize", type=int, default=0, help="워커에 한 번에 넘기는 이미지 수(0이면 자동)")
     args = parser.parse_args()
 
     image_dir = args.image_dir
@@ -214,51 +419,40 @@ def main():
     thumb_dir = os.path.join(image_dir, "_excel_thumbs")
     os.makedirs(thumb_dir, exist_ok=True)
 
-    rotations = []
-    if args.try_rot == "all":
-        rotations = [1, 2, 3]
-    elif args.try_rot == "none":
-        rotations = []
-    else:
-        rotations = [{"90": 1, "180": 2, "270": 3}[args.try_rot]]
-
     files = collect_images(image_dir)
     if not files:
         raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {image_dir}")
 
+    opts = ProcessOptions(
+        thumb_dir=thumb_dir,
+        try_enhance=args.enhance,
+        rotations=parse_rotations(args.try_rot),
+        no_overlay=args.no_overlay,
+        thumb_max_w=args.thumb_max_w,
+        expect=args.expect,
+        roi=args.roi,
+        roi_fallback=not args.no_roi_fallback,
+    )
+    workers = args.workers or os.cpu_count() or 1
+
     rows: List[List[object]] = []
     thumb_for_file: dict = {}
 
-    for f in files:
-        img = load_image_any_path(f)
-        fname = os.path.basename(f)
+    for result in iter_results(files, opts, workers, args.chunksize):
+        print(f"\n=== {result.fname} ===")
+        for line in result.log:
+            print(line)
+        rows.extend(result.rows)
+        if result.thumb_path:
+            thumb_for_file[result.fname] = result.thumb_path
 
-        print(f"\n=== {fname} ===")
-        if img is None:
-            print("[경고] 이미지 로드 실패")
-            rows.append([fname, None, None, None, None])
-            continue
-
-        decoded_list, code_info = decode_with_rotations(img, try_enhance=args.enhance, rotations=rotations)
-
-        if not code_info:
-            print("바코드/QR 미검출")
-            rows.append([fname, None, None, None, None])
-            thumb_path = os.path.join(thumb_dir, Path(fname).stem + "_thumb.png")
-            save_thumb(img, thumb_path, args.thumb_max_w)
-            thumb_for_file[fname] = thumb_path
-            continue
+    write_excel(rows, thumb_for_file, excel_path)
 
-        for idx, (btm_y, t, v) in enumerate(code_info):
-            show_val = v if len(v) <= 80 else (v[:80] + "...")
-            print(f"{idx:02d}\tTYPE={t}\tmax_y={btm_y:.2f}\tVAL={show_val}")
-            rows.append([fname, f"{idx:02d}", t, v, btm_y])
+    print(f"\n엑셀 저장 완료: {excel_path}")
+    print(f"썸네일 폴더: {thumb_dir}")
 
-        overlay_img = img if args.no_overlay else draw_overlay(img, decoded_list, code_info)
-        thumb_path = os.path.join(thumb_dir, Path(fname).stem + ("_thumb.png" if args.no_overlay else "_overlay_thumb.png"))
-        save_thumb(overlay_img, thumb_path, args.thumb_max_w)
-        thumb_for_file[fname] = thumb_path
 
+def write_excel(rows: List[List[object]], thumb_for_file: dict, excel_path: str):
     df = pd.DataFrame(rows, columns=["파일명", "순번", "바코드종류", "값", "하단Y좌표"])
 
     with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
@@ -301,10 +495,6 @@ def main():
                 except Exception as e:
                     print(f"[이미지 삽입 실패] {fname}: {e}")
 
-    print(f"\n엑셀 저장 완료: {excel_path}")
-    print(f"썸네일 폴더: {thumb_dir}")
-
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,285 @@
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from typing import List
+
+import numpy as np
+
+import barcode_Reader
+from barcode_Reader import (ProcessOptions, collect_images, decode_with_rotations, iter_results,
+                            load_image_any_path, map_point_back_from_rot, parse_rotations)
+
+
+# ===== 워커 수별 처리량 =====
+def bench_workers(args):
+    files = collect_images(args.image_dir)[: args.limit or None]
+    if not files:
+        raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {args.image_dir}")
+    counts = [int(n) for n in args.workers.split(",")]
+
+    print(f"이미지 {len(files)}장, 회전={args.try_rot}, 전처리={'O' if args.enhance else 'X'}")
+    print(f"{'워커':>4}{'초':>9}{'장/초':>9}{'배속':>7}  결과")
+    baseline_rows = None
+    baseline_sec = None
+    with tempfile.TemporaryDirectory() as thumb_dir:
+        opts = ProcessOptions(thumb_dir=thumb_dir, try_enhance=args.enhance, rotations=parse_rotations(args.try_rot),
+                              expect=args.expect)
+        for n in counts:
+            started = time.perf_counter()
+            rows: List[List[object]] = []
+            for result in iter_results(files, opts, n):
+                rows.extend(result.rows)
+            sec = time.perf_counter() - started
+
+            if baseline_rows is None:
+                baseline_rows, baseline_sec = rows, sec
+            same = "동일" if rows == baseline_rows else "불일치!"
+            print(f"{n:>4}{sec:>9.2f}{len(files) / sec:>9.2f}{baseline_sec / sec:>7.2f}  {same}")
+
+
+# ===== 회전/전처리 탐색: 전체 탐색 vs 조기 종료 =====
+def bench_search(args):
+    files = collect_images(args.image_dir)[: args.limit or None]
+    if not files:
+        raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {args.image_dir}")
+    rotations = list(parse_rotations(args.try_rot))
+
+    # pyzbar decode 호출 수 집계
+    calls = [0]
+    real_decode = barcode_Reader.decode
+
+    def counting_decode(*a, **kw):
+        calls[0] += 1
+        return real_decode(*a, **kw)
+
+    barcode_Reader.decode = counting_decode
+    modes = [("전체 탐색", 0)] + [(f"expect={n}", n) for n in (int(x) for x in args.expect.split(","))]
+    print(f"이미지 {len(files)}장, 회전={args.try_rot}, 전처리={'O' if args.enhance else 'X'}")
+    print(f"{'모드':<12}{'초/장':>8}{'디코딩/장':>10}{'최대MB':>9}{'코드 수':>8}")
+    try:
+        for name, expect in modes:
+            sec = 0.0
+            peak = 0
+            codes = 0
+            calls[0] = 0
+            for f in files:
+                img = load_image_any_path(f)
+                tracemalloc.start()
+                started = time.perf_counter()
+                _, code_info = decode_with_rotations(img, args.enhance, rotations, expect=expect)
+                sec += time.perf_counter() - started
+                peak = max(peak, tracemalloc.get_traced_memory()[1])  # 입력 이미지 제외, 탐색 중 추가 할당
+                tracemalloc.stop()
+                codes += len(code_info)
+            n = len(files)
+            print(f"{name:<14}{sec / n:>8.2f}{calls[0] / n:>10.1f}{peak / 1e6:>9.1f}{codes:>8}")
+    finally:
+        barcode_Reader.decode = real_decode
+
+
+# ===== ROI 우선 탐색: 전체 화면 대비 속도/재현율 =====
+def load_labels(path: str) -> dict:
+    """정답 CSV(헤더: 파일명,값 / 코드 1개당 1행) -> {파일명: {값, ...}}"""
+    labels: dict = {}
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            labels.setdefault(row["파일명"], set())
+            if row.get("값"):
+                labels[row["파일명"]].add(row["값"])
+    return labels
+
+
+def bench_roi(args):
+    files = collect_images(args.image_dir)[: args.limit or None]
+    if not files:
+        raise FileNotFoundError(f"이미지 파일을 찾을 수 없습니다: {args.image_dir}")
+    labels = load_labels(args.labels) if args.labels else None
+    rotations = list(parse_rotations(args.try_rot))
+    modes = [
+        ("전체 화면", dict(roi=False)),
+        ("ROI", dict(roi=True, roi_fallback=False)),
+        ("ROI+fallback", dict(roi=True, roi_fallback=True)),
+    ]
+    sec = {name: 0.0 for name, _ in modes}
+    found = {name: 0 for name, _ in modes}     # 전체 화면 결과 중 찾은 코드 수
+    hits = {name: 0 for name, _ in modes}      # 정답 중 찾은 코드 수
+    total_full = 0
+    total_labels = 0
+
+    for f in files:
+        fname = os.path.basename(f)
+        img = load_image_any_path(f)
+        if img is None:
+            continue
+        values = {}
+        for name, kw in modes:
+            started = time.perf_counter()
+            _, code_info = decode_with_rotations(img, args.enhance, rotations, **kw)
+            sec[name] += time.perf_counter() - started
+            values[name] = {(t, v) for _, t, v in code_info}
+
+        reference = values["전체 화면"]
+        total_full += len(reference)
+        truth = labels.get(fname, set()) if labels is not None else None
+        if truth is not None:
+            total_labels += len(truth)
+        for name, _ in modes:
+            found[name] += len(values[name] & reference)
+            if truth is not None:
+                hits[name] += len(truth & {v for _, v in values[name]})
+        if args.verbose and values["ROI"] != reference:
+            missed = sorted(v for _, v in reference - values["ROI"])
+            extra = sorted(v for _, v in values["ROI"] - reference)
+            print(f"[차이] {fname}: ROI에서 놓침 {missed}, ROI에서만 찾음 {extra}")
+
+    n = len(files)
+    print(f"이미지 {n}장, 회전={args.try_rot}, 전처리={'O' if args.enhance else 'X'}")
+    header = f"{'모드':<14}{'초/장':>8}{'배속':>7}{'재현율(전체 화면 대비)':>20}"
+    print(header + (f"{'재현율(정답)':>14}" if labels is not None else ""))
+    base = sec["전체 화면"]
+    for name, _ in modes:
+        line = f"{name:<16}{sec[name] / n:>8.2f}{base / sec[name]:>7.1f}{found[name] / max(1, total_full):>20.1%}"
+        if labels is not None:
+            line += f"{hits[name] / max(1, total_labels):>14.1%}"
+        print(line)
+
+
+# ===== 중복 제거: 이전 선형 탐색 vs dict =====
+_Rect = namedtuple("Rect", "left top width height")
+_Point = namedtuple("Point", "x y")
+_Symbol = namedtuple("Symbol", "data type rect polygon")
+
+
+def synthetic_symbols(n_codes: int, size: int, rng: np.random.Generator) -> List[_Symbol]:
+    """후보 이미지 1장에서 pyzbar가 돌려줄 법한 결과 n_codes개(위치는 후보마다 조금씩 다름)"""
+    out = []
+    for i in range(n_codes):
+        x, y = (int(v) for v in rng.integers(0, size - 60, 2))
+        poly = [_Point(x, y), _Point(x + 50, y), _Point(x + 50, y + 50), _Point(x, y + 50)]
+        out.append(_Symbol(f"PLATE-{i:05d}".encode(), "QRCODE", _Rect(x, y, 50, 50), poly))
+    return out
+
+
+def _legacy_bottom_y(rect, polygon) -> float:
+    if polygon and len(polygon) > 0:
+        return float(max(y for _, y in polygon))
+    x, y, w, h = rect
+    return float(y + h)
+
+
+def legacy_aggregate(per_candidate, W: int, H: int) -> list:
+    """기존 decode_with_rotations의 중복 제거(리스트 선형 탐색 + 매 비교마다 bytes 디코딩)"""
+    decoded_agg = []
+    for k90, dec in per_candidate:
+        for d in dec:
+            t = d.type
+            v = d.data.decode("utf-8", "ignore")
+            poly = [map_point_back_from_rot(p.x, p.y, W, H, k90) for p in d.polygon]
+            xs = [p[0] for p in poly]
+            ys = [p[1] for p in poly]
+            rect = (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+            btm = _legacy_bottom_y(rect, poly)
+            replaced = False
+            for i, sd in enumerate(decoded_agg):
+                if sd[0] == t and sd[1].decode("utf-8", "ignore") == v:
+                    if btm > _legacy_bottom_y(sd[2], sd[3]):
+                        decoded_agg[i] = (t, v.encode("utf-8"), rect, poly)
+                    replaced = True
+                    break
+            if not replaced:
+                decoded_agg.append((t, v.encode("utf-8"), rect, poly))
+    return decoded_agg
+
+
+def bench_dedup(args):
+    rng = np.random.default_rng(0)
+    size = args.size
+    gray = np.zeros((size, size), dtype=np.uint8)  # 정사각형: 회전해도 좌표 범위가 같음
+    rotations = [1, 2, 3]
+    n_candidates = 2 * (1 + len(rotations))  # --enhance + --try-rot all
+
+    print(f"후보 {n_candidates}개/이미지, 반복 {args.repeat}회 (pyzbar 대신 합성 결과 사용, 집계 비용만 측정)")
+    print(f"{'코드 수':>7}{'이전(ms)':>10}{'dict(ms)':>10}{'배속':>7}  결과")
+    real_decode = barcode_Reader.decode
+    try:
+        for n_codes in (int(x) for x in args.codes.split(",")):
+            per_candidate = [synthetic_symbols(n_codes, size, rng) for _ in range(n_candidates)]
+            ks = [0, 0] + [k for k in rotations for _ in range(2)]
+
+            calls = iter(())
+
+            def fake_decode(img, symbols=None):
+                return next(calls)
+
+            # 후보 생성(회전/CLAHE) 비용은 빼고 집계 비용만 비교
+            barcode_Reader.decode = lambda img, symbols=None: []
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                decode_with_rotations(gray, True, rotations)
+            base_ms = (time.perf_counter() - started) / args.repeat * 1000
+
+            barcode_Reader.decode = fake_decode
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                calls = iter(per_candidate)
+                records, code_info = decode_with_rotations(gray, True, rotations)
+            new_ms = (time.perf_counter() - started) / args.repeat * 1000 - base_ms
+
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                legacy = legacy_aggregate(zip(ks, per_candidate), size, size)
+            old_ms = (time.perf_counter() - started) / args.repeat * 1000
+
+            same = sorted((r.type, r.value, r.rect, r.polygon.tolist()) for r in records) == \
+                sorted((t, v.decode(), rect, [list(p) for p in poly]) for t, v, rect, poly in legacy)
+            print(f"{n_codes:>7}{old_ms:>10.2f}{new_ms:>10.2f}{old_ms / new_ms:>7.1f}  {'동일' if same else '불일치!'}")
+    finally:
+        barcode_Reader.decode = real_decode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="barcode_Reader 성능 측정")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("workers", help="--workers 수별 처리량(장/초)과 직렬 대비 결과 동일 여부")
+    p.add_argument("--dir", dest="image_dir", required=True, help="이미지 폴더 경로")
+    p.add_argument("--workers", default=f"1,2,4,{os.cpu_count() or 1}", help="측정할 워커 수 목록(첫 값이 기준)")
+    p.add_argument("--limit", type=int, default=0, help="앞에서부터 N장만 사용(0이면 전체)")
+    p.add_argument("--enhance", action="store_true")
+    p.add_argument("--try-rot", default="all", choices=["none", "90", "180", "270", "all"])
+    p.add_argument("--expect", type=int, default=0)
+    p.set_defaults(func=bench_workers)
+
+    p = sub.add_parser("search", help="decode_with_rotations 전체 탐색 대비 --expect 조기 종료의 시간/디코딩 횟수/메모리")
+    p.add_argument("--dir", dest="image_dir", required=True, help="이미지 폴더 경로")
+    p.add_argument("--expect", default="1", help="비교할 expect 값 목록(쉼표 구분)")
+    p.add_argument("--limit", type=int, default=0)
+    p.add_argument("--enhance", action="store_true")
+    p.add_argument("--try-rot", default="all", choices=["none", "90", "180", "270", "all"])
+    p.set_defaults(func=bench_search)
+
+    p = sub.add_parser("roi", help="--roi 후보 영역 디코딩의 전체 화면 대비 속도와 재현율")
+    p.add_argument("--dir", dest="image_dir", required=True, help="이미지 폴더 경로")
+    p.add_argument("--labels", help="정답 CSV(파일명,값). 없으면 전체 화면 디코딩 결과만 기준으로 비교")
+    p.add_argument("--limit", type=int, default=0)
+    p.add_argument("--enhance", action="store_true")
+    p.add_argument("--try-rot", default="none", choices=["none", "90", "180", "270", "all"])
+    p.add_argument("--verbose", action="store_true", help="ROI에서 놓친 코드를 파일별로 출력")
+    p.set_defaults(func=bench_roi)
+
+    p = sub.add_parser("dedup", help="코드가 많은 합성 결과로 decode_with_rotations 중복 제거 비용 비교(이전 방식 대비)")
+    p.add_argument("--codes", default="5,20,50,200", help="이미지당 코드 수 목록")
+    p.add_argument("--size", type=int, default=256, help="합성 이미지 한 변(px, 회전 비용을 작게 유지)")
+    p.add_argument("--repeat", type=int, default=20)
+    p.set_defaults(func=bench_dedup)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,10 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+The tag event stream (/tag-events/) is served asynchronously under ASGI, e.g.
+    uvicorn rasp.asgi:application --host 0.0.0.0 --port 8000
+so idle kiosk connections do not hold a worker thread.
 """
 
 import os
@@ -14,3 +18,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rasp.settings')
 
 application = get_asgi_application()
+
+# 웹 서버 프로세스에서만 자동 잠금/MQTT 드레이너/RFID 감시를 시작(관리 명령에서는 돌지 않음)
+from rfid.background import start_server_tasks  # noqa: E402
+
+start_server_tasks()
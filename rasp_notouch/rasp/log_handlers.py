@@ -0,0 +1,151 @@
+# rasp/log_handlers.py
+# settings.LOGGING에서 쓰는 로깅 핸들러/포매터/필터.
+# 'rasp' 로거의 기록은 QueueingHandler가 큐에 넣기만 하고(요청 스레드는 디스크를 기다리지 않음),
+# 백그라운드 QueueListener 스레드가 'rasp.sink' 로거의 파일 핸들러로 넘겨 쓴다.
+# 파일은 크기/날짜 기준으로 교체하고 지난 파일은 gzip으로 압축한다(SD 카드 용량 보호).
+import atexit
+import copy
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+from datetime import datetime, timezone
+
+# JSON 로그에 있으면 함께 기록하는 구조화 필드(logger.info(..., extra={...}))
+STRUCTURED_FIELDS = ('uid', 'asgn_cd', 'delta', 'latency_ms')
+
+
+_exc_formatter = logging.Formatter()
+
+
+class _SinkHandler(logging.Handler):
+    """리스너 스레드에서 받은 레코드를 sink 로거의 핸들러들로 전달(각 핸들러의 level이 적용됨)"""
+
+    def __init__(self, sink):
+        super().__init__()
+        self.sink = sink
+
+    def handle(self, record):
+        logging.getLogger(self.sink).handle(record)
+        return True
+
+
+class QueueingHandler(logging.handlers.QueueHandler):
+    """
+    레코드를 큐에 넣고 바로 반환. 큐가 가득 차면 기다리지 않고 버린 뒤 개수만 센다.
+    리스너를 직접 만들므로 dictConfig에는 'class'가 아닌 '()' 키로 등록한다.
+    """
+
+    def __init__(self, sink='rasp.sink', maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.dropped = 0
+        self.listener = logging.handlers.QueueListener(self.queue, _SinkHandler(sink))
+        self.listener.start()
+        atexit.register(self.close)  # 종료 시 큐에 남은 기록까지 쓰고 끝낸다
+
+    def prepare(self, record):
+        # 메시지는 미리 완성하되 예외는 exc_text로 따로 두어 파일 포매터(JSON의 exc 필드)가 다루게 한다
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        super().close()
+
+
+def _gzip_rotator(source, dest):
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _gzip_namer(name):
+    return name + '.gz'
+
+
+class CompressedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """크기 기준 교체 + gzip 압축(info.log.1.gz ...). 로그 디렉터리가 없으면 만든다"""
+
+    def __init__(self, filename, **kwargs):
+        os.makedirs(os.path.dirname(os.fspath(filename)) or '.', exist_ok=True)
+        kwargs.setdefault('delay', True)  # 첫 기록 때 파일을 연다
+        super().__init__(filename, **kwargs)
+        self.rotator = _gzip_rotator
+        self.namer = _gzip_namer
+
+
+class CompressedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """날짜 기준 교체 + gzip 압축(error.log.2026-10-17.gz ...)"""
+
+    def __init__(self, filename, **kwargs):
+        os.makedirs(os.path.dirname(os.fspath(filename)) or '.', exist_ok=True)
+        kwargs.setdefault('delay', True)
+        super().__init__(filename, **kwargs)
+        self.rotator = _gzip_rotator
+        self.namer = _gzip_namer
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 JSON 하나(JSON Lines). STRUCTURED_FIELDS는 extra로 넘긴 경우에만 포함"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'module': record.module,
+            'func': record.funcName,
+            'msg': record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    자주 찍히는 경로('모듈.함수')의 기록을 레벨별로 N건 중 1건만 남긴다.
+    rates 예: {'INFO': 10} -> INFO는 10건 중 1건, 설정하지 않은 레벨(WARNING 이상 등)은 모두 남김
+    settings.LOG_SAMPLING = True일 때만 'queue' 핸들러에 붙는다(기본은 모두 기록).
+    """
+
+    def __init__(self, paths=(), rates=None):
+        super().__init__()
+        self.paths = set(paths)
+        self.rates = {logging.getLevelName(level): n for level, n in (rates or {}).items()}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        every = self.rates.get(record.levelno)
+        if not every or every <= 1:
+            return True
+        path = f"{record.module}.{record.funcName}"
+        if path not in self.paths:
+            return True
+        with self._lock:
+            count = self._counts.get((path, record.levelno), 0)
+            self._counts[(path, record.levelno)] = count + 1
+        return count % every == 0
@@ -15,6 +15,8 @@ from pathlib import Path
 # 세션 만료 시간 (초)
 SESSION_COOKIE_AGE = 600  # 5분
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True  # 브라우저 닫으면 세션 만료
+DISPOSAL_TIMEOUT = 30 * 60  # 문이 열린 뒤 자동 잠금까지(초)
+SESSION_SWEEP_MINUTES = 30  # 만료 세션 정리 주기(자동 잠금 자체는 rfid.lock_timer가 정시에 처리)
 
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -35,6 +37,73 @@ DEBUG = False
 ALLOWED_HOSTS = ['localhost', '127.0.0.1', 'raspberrypi.local', '10.150.8.165', '10.150.190.49']
 
 
+# 하드웨어 소유 방식
+# 'local': 웹 프로세스가 직접 잠금 GPIO/RFID 리더/저울을 연다(프로세스 1개일 때만)
+# 'daemon': 하드웨어 데몬(manage.py run_hwd)이 장치를 전담하고 웹 워커는 유닉스 소켓으로 요청
+HARDWARE_MODE = 'local'
+HARDWARE_SOCKET = BASE_DIR / 'hwd.sock'
+HARDWARE_TIMEOUT = 10         # 데몬 요청 응답 대기(초), 저울 안정 대기(SCALE_STABLE_MAX_WAIT)보다 길게
+HARDWARE_RECONNECT_DELAY = 2  # 데몬 연결이 끊겼을 때 태그 구독 재연결 대기(초)
+
+# 장치 백엔드(rfid/hardware.py 레지스트리) - 실제 장치가 없는 PC에서는 모두 'sim'으로
+LOCK_BACKEND = 'gpio'         # 'gpio': GPIO 21 잠금장치, 'sim': 가상 잠금장치(rfid/sim/gpio.py)
+SCALE_BACKEND = 'serial'      # 'serial': SCALE_PORT 저울, 'sim': 가상 저울(rfid/sim/scale.py)
+SCALE_SIM_WEIGHT = 0.0        # 가상 저울 초기 무게(kg)
+
+# 저울(시리얼) 설정 - rfid/scale.py 의 백그라운드 리더가 사용
+SCALE_PORT = "/dev/serial0"
+SCALE_BAUDRATE = 9600
+SCALE_TIMEOUT = 1             # readline 타임아웃(초)
+SCALE_BUFFER_SIZE = 32        # 링 버퍼에 보관할 최근 측정값 개수
+SCALE_RECONNECT_DELAY = 2     # 포트 오류 후 재연결 대기(초)
+SCALE_MAX_AGE = 3             # 이 시간(초)보다 오래된 측정값은 사용하지 않음
+# 안정 판정(median/MAD) - 최근 WINDOW개 값의 폭이 TOLERANCE(kg) 이내면 즉시 반환
+SCALE_STABLE_WINDOW = 5
+SCALE_STABLE_TOLERANCE = 0.2
+SCALE_STABLE_MAX_WAIT = 3     # 안정되지 않을 때 최대 대기(초), 이후 중앙값 사용
+SCALE_OUTLIER_K = 3.5         # 중앙값에서 K*MAD 이상 벗어난 값은 버림
+
+# RFID 리더 설정 - rfid/tag_monitor.py 가 카드 삽입 이벤트를 받아 큐에 보관
+RFID_BACKEND = 'pcsc'         # 'pcsc': 실제 PC/SC 리더, 'sim': 가상 리더(rfid/sim/reader.py)
+                              # (HARDWARE_MODE = 'daemon'이면 데몬이 이 백엔드를 쓰고 워커는 데몬을 구독)
+RFID_EVENT_BUFFER = 32        # 보관할 최근 태그 이벤트 개수
+RFID_EVENT_MAX_AGE = 10       # 이 시간(초)보다 오래된 태그 이벤트는 무시
+TAG_STREAM_KEEPALIVE = 15     # 태그 이벤트 스트림(SSE) keepalive 주기(초)
+TAG_STREAM_MAX_DURATION = 600 # 스트림 최대 유지 시간(초), 이후 브라우저가 자동 재연결
+
+# 사용자 캐시(rfid/user_cache.py) - UID -> 사용자 정보 LRU
+USER_CACHE_SIZE = 512
+USER_CACHE_TTL = 3600         # 항목을 무조건 다시 읽는 주기(초) - 변경 감지는 아래 버전 확인이 담당
+USER_CACHE_CHECK_INTERVAL = 5 # 다른 프로세스의 사용자 변경(수/updated_at)을 확인하는 주기(초)
+COMPANY_CACHE_TTL = 300       # 회사코드 등록부(Company)를 다시 읽는 주기(초)
+
+# MQTT 설정 - rfid/mqtt_publisher.py 가 연결을 유지하며 발행
+MQTT_HOST = "10.150.232.41"
+MQTT_PORT = 1883
+MQTT_CLIENT_ID = "rp165"
+MQTT_TOPIC = "test/rp165"
+# 아웃박스(rfid/outbox.py) - 발행 전 로컬 저널에 기록 후 드레이너가 QoS 1로 전송
+MQTT_OUTBOX_PATH = BASE_DIR / 'mqtt_outbox.sqlite3'
+MQTT_OUTBOX_BATCH_SIZE = 50
+MQTT_OUTBOX_POLL_INTERVAL = 5       # 새 이벤트가 없을 때 재시도 주기(초)
+MQTT_OUTBOX_RETENTION_DAYS = 7      # 전송 완료 이벤트 보존 기간
+# 발행 방식 - 'event': 폐기 1건당 1메시지 / 'batch': 창(초 또는 건수) 단위로 회사별 합계를 1메시지로
+MQTT_PUBLISH_MODE = 'event'
+MQTT_BATCH_WINDOW = 5               # 묶음 창 길이(초)
+MQTT_BATCH_MAX_EVENTS = 20          # 창 안에서 이 건수가 모이면 바로 발행
+
+
+# 로깅 - rasp/log_handlers.py
+# 'rasp' 로거는 큐에만 넣고, 백그라운드 스레드가 'rasp.sink' 로거의 파일 핸들러로 쓴다.
+LOG_DIR = BASE_DIR / 'logs'
+LOG_FORMAT = 'verbose'        # 'verbose': 기존 텍스트 형식, 'json': JSON Lines(uid/asgn_cd/delta/latency_ms 필드 포함)
+LOG_SAMPLING = False          # True면 LOG_SAMPLE_PATHS의 INFO 로그를 LOG_SAMPLE_RATES 비율로만 남김(analyze_logs 집계가 표본이 됨)
+LOG_SAMPLE_PATHS = [          # 요청/메시지마다 찍히는 INFO 로그
+    'weight.read_local_weight',
+    'outbox.drain_once',
+]
+LOG_SAMPLE_RATES = {'INFO': 10}  # 레벨별 N건 중 1건
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -47,33 +116,63 @@ LOGGING = {
             'format': '{levelname} {message}',
             'style': '{',
         },
+        'json': {
+            '()': 'rasp.log_handlers.JsonFormatter',
+        },
+    },
+    'filters': {
+        'sampling': {
+            '()': 'rasp.log_handlers.SamplingFilter',
+            'paths': LOG_SAMPLE_PATHS,
+            'rates': LOG_SAMPLE_RATES,
+        },
     },
     'handlers': {
+        'queue': {
+            # 'class'가 아닌 '()'로 만든다 - 3.12+ dictConfig는 'class'가 QueueHandler면
+            # queue/listener/handlers 키를 따로 해석해 sink/maxsize 인자와 충돌한다
+            '()': 'rasp.log_handlers.QueueingHandler',
+            'sink': 'rasp.sink',
+            'filters': ['sampling'] if LOG_SAMPLING else [],
+        },
         'error_file': {
             'level': 'ERROR',
-            'class': 'logging.FileHandler',
-            'filename': '/home/pi/Desktop/rasp_notouch/logs/error.log',
-            'formatter': 'verbose',
+            'class': 'rasp.log_handlers.CompressedTimedRotatingFileHandler',
+            'filename': LOG_DIR / 'error.log',
+            'when': 'midnight',
+            'backupCount': 30,
+            'encoding': 'utf-8',
+            'formatter': LOG_FORMAT,
         },
         'info_file': {
             'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': '/home/pi/Desktop/rasp_notouch/logs/info.log',
-            'formatter': 'verbose',
+            'class': 'rasp.log_handlers.CompressedRotatingFileHandler',
+            'filename': LOG_DIR / 'info.log',
+            'maxBytes': 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'formatter': LOG_FORMAT,
         },
         'warning_file': {
-        'level': 'WARNING',
-        'class': 'logging.FileHandler',
-        'filename': '/home/pi/Desktop/rasp_notouch/logs/warning.log',
-        'formatter': 'verbose',
-    },
+            'level': 'WARNING',
+            'class': 'rasp.log_handlers.CompressedTimedRotatingFileHandler',
+            'filename': LOG_DIR / 'warning.log',
+            'when': 'midnight',
+            'backupCount': 14,
+            'encoding': 'utf-8',
+            'formatter': LOG_FORMAT,
+        },
     },
     'loggers': {
         'rasp': {
-            'handlers': ['info_file', 'error_file', 'warning_file'],
+            'handlers': ['queue'],
             'level': 'INFO',
             'propagate': False,
         },
+        'rasp.sink': {
+            'handlers': ['info_file', 'error_file', 'warning_file'],
+            'propagate': False,
+        },
     },
 }
 
@@ -51,6 +51,8 @@ urlpatterns = [
     path('disposal/<str:uid>/', views_v2.disposal, name='disposal'),  # 태깅 후 이동
     path('check-rfid-disposal/', views_v2.check_rfid_disposal, name='check_rfid_disposal'),  # Ajax RFID 확인
     path('check-rfid/', views_v2.check_rfid, name='check_rfid'),  # RFID 상태 확인 API
+    path('tag-events/', views_v2.tag_events, name='tag_events'),  # 태그 이벤트 스트림(SSE)
+    path('metrics', views_v2.metrics_view, name='metrics'),  # Prometheus 스크랩
 
     #정보 발행
     path('send_weight/', weight.publish_weight),
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'rasp.settings')
 
 application = get_wsgi_application()
+
+# 웹 서버 프로세스에서만 자동 잠금/MQTT 드레이너/RFID 감시를 시작(관리 명령에서는 돌지 않음)
+from rfid.background import start_server_tasks  # noqa: E402
+
+start_server_tasks()
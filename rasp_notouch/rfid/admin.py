@@ -1,3 +1,11 @@
 from django.contrib import admin
 
-# Register your models here.
\ No newline at end of file
+from .models import Company
+
+# Register your models here.
+
+
+@admin.register(Company)
+class CompanyAdmin(admin.ModelAdmin):
+    list_display = ('code', 'name', 'department')
+    search_fields = ('name',)
@@ -1,25 +1,13 @@
 from django.apps import AppConfig
-import os
-import logging
 
-logger = logging.getLogger('rasp')
 
 class RfidConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'rfid'
 
     def ready(self):
-        # 개발 서버 reload 중복 실행 방지
-        if os.environ.get('RUN_MAIN') != 'true':
-            return
-
-        from apscheduler.schedulers.background import BackgroundScheduler
-        from django_apscheduler.jobstores import DjangoJobStore
-        from rfid.session_tasks import check_timeout_sessions
-
-        scheduler = BackgroundScheduler()
-        scheduler.add_jobstore(DjangoJobStore(), "default")
-        scheduler.add_job(check_timeout_sessions, 'interval', minutes=1, id='check_sessions', replace_existing=True)
-        scheduler.start()
-
-        logger.info("APScheduler 시작됨 (세션 타임아웃 자동 정리)")
+        # 모델 변경 시 캐시 무효화 시그널 등록
+        from rfid import signals  # noqa: F401
+        # 백그라운드 작업(자동 잠금, MQTT 드레이너, RFID 감시)은 웹 서버 프로세스가 애플리케이션을
+        # 불러올 때(rasp/asgi.py, rasp/wsgi.py) rfid.background.start_server_tasks()가 시작한다.
+        # migrate 같은 관리 명령이나 runserver의 자동 재시작 감시 프로세스에서는 돌지 않는다.
@@ -0,0 +1,68 @@
+# rfid/background.py
+# 프로세스 시작 시 띄우는 백그라운드 작업.
+# start_server_tasks(): 웹 서버 프로세스가 애플리케이션을 불러올 때(rasp/asgi.py, rasp/wsgi.py).
+#   runserver(자동 재시작 시 실제로 요청을 받는 자식 프로세스), uvicorn, gunicorn 모두 여기를 거친다.
+# start_device_tasks(): 장치를 맡은 프로세스(hardware.owns_devices())에서만 -
+#   local 모드는 웹 서버 프로세스, daemon 모드는 하드웨어 데몬(run_hwd).
+#   웹 워커를 몇 개 띄우든 자동 잠금/세션 정리와 MQTT 아웃박스 전송은 한 프로세스에서만 돈다.
+import logging
+import threading
+
+from django.conf import settings
+
+from rfid import hardware
+
+logger = logging.getLogger('rasp')
+
+_started = False
+_started_lock = threading.Lock()
+
+
+def start_device_tasks():
+    global _started
+    with _started_lock:
+        if _started:
+            return
+        _started = True
+
+    from rfid.outbox import get_outbox
+
+    # 이전 실행에서 남은 미전송 MQTT 이벤트 재전송 시작
+    get_outbox()
+
+    from apscheduler.schedulers.background import BackgroundScheduler
+    from django_apscheduler.jobstores import DjangoJobStore
+    from rfid import lock_timer
+    from rfid.session_tasks import check_timeout_sessions
+
+    scheduler = BackgroundScheduler()
+    scheduler.add_jobstore(DjangoJobStore(), "default")
+    scheduler.add_job(
+        check_timeout_sessions, 'interval', minutes=settings.SESSION_SWEEP_MINUTES,
+        id='check_sessions', replace_existing=True,
+    )
+    scheduler.start()
+
+    logger.info("APScheduler 시작됨 (세션 타임아웃 자동 정리)")
+
+    # 문 자동 잠금 타이머 시작 + 재시작 전 열려 있던 세션의 마감 시각 복원
+    try:
+        lock_timer.load()
+    except Exception as e:
+        logger.error(f"자동 잠금 타이머 복원 실패: {e}")
+
+
+def start_server_tasks():
+    if hardware.owns_devices():
+        start_device_tasks()
+
+    from rfid.tag_monitor import get_tag_monitor
+    from rfid.user_cache import get_user_cache
+
+    # RFID 리더 감시 시작(첫 요청 전에 태깅해도 이벤트를 놓치지 않도록)
+    get_tag_monitor()
+    # 태깅 -> 문 열림 경로에서 DB를 거치지 않도록 사용자 캐시 미리 적재
+    try:
+        get_user_cache().warm_up()
+    except Exception as e:
+        logger.error(f"사용자 캐시 적재 실패: {e}")
@@ -0,0 +1,63 @@
+# rfid/company_registry.py
+# 회사명 <-> asgn_cd 조회용 프로세스 캐시.
+# Company 테이블(수십 행)을 처음 조회할 때 한 번에 읽어 두 방향 dict로 보관하고,
+# Company 저장·삭제 시그널(rfid/signals.py)로 무효화한다. 다른 프로세스에서 바뀐 내용은 TTL이 지나면 다시 읽는다.
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+from .models import Company
+
+logger = logging.getLogger('rasp')
+
+
+class CompanyRegistry:
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self._by_name = None  # 회사명 -> asgn_cd
+        self._by_code = None  # asgn_cd -> 회사명
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _tables(self):
+        with self._lock:
+            if self._by_name is not None and time.monotonic() - self._loaded_at < self.ttl:
+                return self._by_name, self._by_code
+            rows = list(Company.objects.values_list('name', 'asgn_cd'))
+            self._by_name = dict(rows)
+            self._by_code = {asgn_cd: name for name, asgn_cd in rows}
+            self._loaded_at = time.monotonic()
+            logger.debug(f"회사코드 등록부 적재: {len(rows)}개")
+            return self._by_name, self._by_code
+
+    def asgn_cd(self, name):
+        """회사명 -> asgn_cd(int), 등록되지 않은 회사는 None"""
+        return self._tables()[0].get(name)
+
+    def company(self, asgn_cd):
+        """asgn_cd -> 회사명, 없으면 None"""
+        return self._tables()[1].get(int(asgn_cd))
+
+    def code(self, name):
+        """회사명 -> 4자리 asgn_cd 문자열(MQTT payload용), 없으면 None"""
+        asgn_cd = self.asgn_cd(name)
+        return None if asgn_cd is None else f"{asgn_cd:04d}"
+
+    def invalidate(self):
+        with self._lock:
+            self._by_name = self._by_code = None
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_company_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = CompanyRegistry(ttl=settings.COMPANY_CACHE_TTL)
+    return _registry
@@ -1,10 +1,79 @@
 # rfid/hardware.py
-from gpiozero import DigitalOutputDevice
+# 장치 백엔드 레지스트리와 잠금장치(GPIO 21) 접근.
+# 어떤 백엔드를 쓸지는 settings의 LOCK_BACKEND / RFID_BACKEND / SCALE_BACKEND로 고르고,
+# 장치 드라이버(gpiozero, pyscard, pyserial)는 백엔드를 처음 만들 때 불러온다.
+# 그래서 migrate나 관리 명령처럼 장치를 쓰지 않는 프로세스는 드라이버를 import하지 않는다.
+# HARDWARE_MODE = 'daemon'이면 웹 워커는 장치 대신 하드웨어 데몬(rfid/hwd.py)에 요청한다.
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+LOCK_PIN = 21
+
+BACKENDS = {
+    'lock': {
+        'gpio': 'rfid.hardware.gpio_lock',
+        'sim': 'rfid.sim.gpio.FakeLock',
+    },
+    'reader': {
+        'pcsc': 'rfid.tag_monitor.PcscBackend',
+        'sim': 'rfid.sim.reader.FakeReader',
+        'ipc': 'rfid.hwd.IpcTagBackend',  # 하드웨어 데몬의 태그 이벤트 구독
+    },
+    'scale': {
+        'serial': 'rfid.scale.ScaleReader',
+        'sim': 'rfid.sim.scale.SimScaleReader',
+    },
+}
+
+
+def get_backend(kind, name):
+    """레지스트리에서 백엔드 클래스(또는 팩토리)를 불러온다"""
+    try:
+        path = BACKENDS[kind][name]
+    except KeyError:
+        raise ImproperlyConfigured(f"알 수 없는 {kind} 백엔드입니다: {name}")
+    return import_string(path)
+
+
+def gpio_lock():
+    from gpiozero import DigitalOutputDevice
+    return DigitalOutputDevice(LOCK_PIN, active_high=True)
+
 
 _lock = None
+_lock_guard = threading.Lock()
+_device_owner = False
+
+
+def claim_devices():
+    """이 프로세스가 장치를 직접 연다고 표시(run_hwd가 장치를 열기 전에 호출)"""
+    global _device_owner
+    _device_owner = True
+
+
+def owns_devices():
+    """
+    장치와 장치에 딸린 백그라운드 작업(자동 잠금 타이머, MQTT 드레이너)을 이 프로세스가 맡는지.
+    local 모드는 웹 프로세스, daemon 모드는 하드웨어 데몬(run_hwd)
+    """
+    return settings.HARDWARE_MODE != 'daemon' or _device_owner
+
+
+def make_local_lock():
+    """이 프로세스에서 직접 여는 잠금장치(get_lock()을 거쳐 프로세스당 하나만 연다)"""
+    return get_backend('lock', settings.LOCK_BACKEND)()
+
 
 def get_lock():
     global _lock
-    if _lock is None:
-        _lock = DigitalOutputDevice(21, active_high=True)
+    with _lock_guard:
+        if _lock is None:
+            if not owns_devices():
+                from rfid.hwd import RemoteLock, get_client
+                _lock = RemoteLock(get_client())
+            else:
+                _lock = make_local_lock()
     return _lock
@@ -0,0 +1,343 @@
+# rfid/hwd.py
+# 하드웨어 데몬(manage.py run_hwd)과 클라이언트.
+# 잠금 GPIO, RFID 리더, 저울 포트는 데몬 프로세스 하나만 열고,
+# 웹 워커(HARDWARE_MODE = 'daemon')는 유닉스 소켓으로 요청만 보낸다. 워커는 몇 개를 띄워도 된다.
+#
+# 프로토콜: 한 줄에 JSON 하나
+#   -> {"op": "unlock" | "lock" | "read_weight"} / {"op": "claim_tag", "seq": seq}
+#   <- {"ok": true, "result": ...} / {"ok": false, "error": "...", "status": 484}
+#   claim_tag는 seq까지의 태그를 처리된 것으로 표시하고, 다른 워커가 먼저 표시했으면 false를 돌려준다.
+#   -> {"op": "arm_timer", "key": 세션 키, "deadline": epoch 초} / {"op": "cancel_timer", "key": 세션 키}
+#   자동 잠금 타이머(rfid/lock_timer.py)는 데몬에서 돌고 워커는 등록/취소만 보낸다.
+#   -> {"op": "wake_outbox"}  워커가 MQTT 아웃박스 저널에 기록한 뒤 데몬의 드레이너를 깨운다.
+#   -> {"op": "subscribe_tags", "after": seq 또는 null}
+#   <- {"ok": true, "seq": 시작 seq} 다음부터 {"seq", "uid", "timestamp"} 또는 {"keepalive": true}가 계속 온다
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+from rfid import hardware
+from rfid.exceptions import CustomException
+from rfid.tag_monitor import TagEvent, TagMonitor
+
+logger = logging.getLogger('rasp')
+
+
+class DeviceBackend:
+    """실제 장치 백엔드 - 잠금 GPIO, RFID_BACKEND 리더, 저울(ScaleReader)"""
+
+    def __init__(self):
+        from rfid import scale
+        self._lock = hardware.get_lock()  # 자동 잠금(session_tasks.expire_session)과 같은 장치
+        self.tags = TagMonitor(
+            hardware.get_backend('reader', settings.RFID_BACKEND)(), max_events=settings.RFID_EVENT_BUFFER,
+        ).start()
+        scale.get_scale_reader()  # 첫 요청 전에 포트를 열어 측정값을 쌓아 둔다
+
+    def unlock(self):
+        self._lock.on()
+
+    def lock(self):
+        self._lock.off()
+
+    def read_weight(self):
+        from rfid.weight import read_local_weight
+        return read_local_weight()
+
+    def close(self):
+        self.tags.stop()
+        self._lock.close()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                self._send({'ok': False, 'error': "잘못된 요청입니다.", 'status': 400})
+                continue
+            op = request.get('op')
+            if op == 'subscribe_tags':
+                self._stream_tags(request.get('after'))
+                return
+            self._send(self.server.dispatch(op, request))
+
+    def _send(self, message):
+        self.wfile.write(json.dumps(message, ensure_ascii=False).encode() + b"\n")
+        self.wfile.flush()
+
+    def _stream_tags(self, after):
+        tags = self.server.backend.tags
+        # 처음 구독하거나 데몬이 재시작되어 seq가 줄었으면 지금부터의 이벤트만 보낸다
+        if after is None or after > tags.last_seq:
+            after = tags.last_seq
+        self.server.streams.add(self.connection)
+        try:
+            self._send({'ok': True, 'seq': after})
+            while True:
+                event = tags.wait_event(after, self.server.keepalive)
+                if event is None:
+                    self._send({'keepalive': True})  # 끊긴 클라이언트는 여기서 쓰기 오류로 정리
+                    continue
+                after = event.seq
+                self._send({'seq': event.seq, 'uid': event.uid, 'timestamp': event.timestamp})
+        except OSError:
+            pass
+        finally:
+            self.server.streams.discard(self.connection)
+
+
+class HardwareServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, backend, keepalive=15, timer=None):
+        self.path = str(path)
+        self.backend = backend
+        self.keepalive = keepalive
+        self.timer = timer  # DeadlineScheduler(arm_timer/cancel_timer 요청)
+        # 같은 장치 요청만 한 번에 하나씩 - 저울을 읽는 동안(최대 수 초)에도 잠금장치는 바로 동작한다
+        self._lock_lock = threading.Lock()
+        self._scale_lock = threading.Lock()
+        self.streams = set()  # 태그 구독 중인 연결(종료 시 끊어서 클라이언트가 재연결하도록)
+
+        if os.path.exists(self.path):
+            if _is_listening(self.path):
+                raise RuntimeError(f"하드웨어 데몬이 이미 실행 중입니다: {self.path}")
+            os.unlink(self.path)  # 이전 실행에서 남은 소켓 파일
+        super().__init__(self.path, _Handler)
+        os.chmod(self.path, 0o660)
+
+    def dispatch(self, op, request=None):
+        if op == 'claim_tag':
+            try:
+                seq = int((request or {})['seq'])
+            except (KeyError, TypeError, ValueError):
+                return {'ok': False, 'error': "claim_tag에는 seq가 필요합니다.", 'status': 400}
+            # TagMonitor.claim은 자체 조건변수로 원자적이다
+            return {'ok': True, 'result': self.backend.tags.claim(seq)}
+        if op in ('arm_timer', 'cancel_timer'):
+            return self._timer_op(op, request or {})
+        if op == 'wake_outbox':
+            from rfid.outbox import get_outbox
+            get_outbox().wake()
+            return {'ok': True, 'result': None}
+        handler, lock = {
+            'unlock': (self.backend.unlock, self._lock_lock),
+            'lock': (self.backend.lock, self._lock_lock),
+            'read_weight': (self.backend.read_weight, self._scale_lock),
+        }.get(op, (None, None))
+        if handler is None:
+            return {'ok': False, 'error': f"알 수 없는 요청: {op}", 'status': 400}
+        try:
+            with lock:
+                return {'ok': True, 'result': handler()}
+        except CustomException as e:
+            return {'ok': False, 'error': e.message, 'status': e.status_code}
+        except Exception as e:
+            logger.error(f"하드웨어 요청 처리 중 오류({op}): {e}")
+            return {'ok': False, 'error': str(e), 'status': 500}
+
+    def _timer_op(self, op, request):
+        if self.timer is None:
+            return {'ok': False, 'error': "자동 잠금 타이머가 없습니다.", 'status': 503}
+        try:
+            key = str(request['key'])
+            if op == 'cancel_timer':
+                return {'ok': True, 'result': self.timer.cancel(key)}
+            deadline = datetime.fromtimestamp(float(request['deadline']), timezone.utc)
+        except (KeyError, TypeError, ValueError):
+            return {'ok': False, 'error': f"{op}에는 key/deadline이 필요합니다.", 'status': 400}
+        self.timer.arm(key, deadline)
+        return {'ok': True, 'result': None}
+
+    def server_close(self):
+        super().server_close()
+        for conn in list(self.streams):
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _is_listening(path):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class HardwareClient:
+    """하드웨어 데몬 클라이언트. 요청마다 연결하며 장치 상태를 갖지 않는다."""
+
+    def __init__(self, path, timeout=10, keepalive=15):
+        self.path = str(path)
+        self.timeout = timeout
+        self.keepalive = keepalive
+
+    def _connect(self, timeout):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(self.path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def call(self, op, **params):
+        try:
+            with self._connect(self.timeout) as sock:
+                sock.sendall(json.dumps({'op': op, **params}).encode() + b"\n")
+                line = sock.makefile('rb').readline()
+        except OSError as e:
+            raise CustomException(f"하드웨어 데몬 통신 오류: {e}", status_code=503)
+        if not line:
+            raise CustomException("하드웨어 데몬이 응답하지 않습니다.", status_code=503)
+        response = json.loads(line)
+        if not response.get('ok'):
+            raise CustomException(response.get('error'), status_code=response.get('status', 500))
+        return response.get('result')
+
+    def unlock(self):
+        self.call('unlock')
+
+    def lock(self):
+        self.call('lock')
+
+    def read_weight(self):
+        return self.call('read_weight')
+
+    def claim_tag(self, seq):
+        return self.call('claim_tag', seq=seq)
+
+    def arm_timer(self, key, deadline):
+        self.call('arm_timer', key=key, deadline=deadline.timestamp())
+
+    def cancel_timer(self, key):
+        return self.call('cancel_timer', key=key)
+
+    def subscribe_tags(self, after_seq=None):
+        """태그 이벤트(TagEvent) 제너레이터. 연결이 끊기면 OSError/CustomException"""
+        # keepalive가 3번 연속 오지 않으면 데몬이 멈춘 것으로 본다
+        with self._connect(self.keepalive * 3) as sock:
+            sock.sendall(json.dumps({'op': 'subscribe_tags', 'after': after_seq}).encode() + b"\n")
+            stream = sock.makefile('rb')
+            ack = stream.readline()
+            if not ack or not json.loads(ack).get('ok'):
+                raise CustomException("태그 구독에 실패했습니다.", status_code=503)
+            for line in stream:
+                message = json.loads(line)
+                if 'uid' in message:
+                    yield TagEvent(message['seq'], message['uid'], message['timestamp'])
+        raise CustomException("하드웨어 데몬 연결이 끊겼습니다.", status_code=503)
+
+
+class RemoteLock:
+    """DigitalOutputDevice와 같은 on()/off() - 데몬의 잠금장치를 제어"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def on(self):
+        self.client.unlock()
+
+    def off(self):
+        self.client.lock()
+
+    def close(self):
+        pass
+
+
+class RemoteTimer:
+    """DeadlineScheduler와 같은 arm()/cancel() - 데몬의 자동 잠금 타이머에 등록"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def arm(self, key, deadline):
+        self.client.arm_timer(key, deadline)
+
+    def cancel(self, key):
+        return self.client.cancel_timer(key)
+
+
+class IpcTagBackend:
+    """
+    TagMonitor 백엔드(HARDWARE_MODE = 'daemon') - 데몬의 태그 이벤트를 구독해 그대로 전달.
+    처리 표시(claim)는 데몬이 맡으므로 워커가 여럿이어도 한 태그는 한 번만 꺼내진다.
+    워커 쪽 seq는 데몬 seq + offset(데몬이 재시작되어 seq가 줄면 그만큼 올려 계속 증가하게 함)
+    """
+
+    def __init__(self, client=None, reconnect_delay=None):
+        self.client = client or get_client()
+        self.reconnect_delay = (
+            reconnect_delay if reconnect_delay is not None else settings.HARDWARE_RECONNECT_DELAY
+        )
+        self._on_tag = None
+        self._offset = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self, on_tag, on_remove):
+        self._on_tag = on_tag
+        self._thread = threading.Thread(target=self._run, name='hwd-tags', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        after = None
+        connected = True
+        while not self._stop_event.is_set():
+            try:
+                for event in self.client.subscribe_tags(after):
+                    if not connected:
+                        logger.info("하드웨어 데몬 태그 구독 재연결")
+                        connected = True
+                    if after is not None and event.seq <= after:
+                        self._offset += after  # 데몬 재시작
+                    after = event.seq  # 재연결 시 끊긴 동안의 이벤트부터 다시 받는다
+                    self._on_tag(event.uid, event.seq + self._offset, event.timestamp)
+            except (OSError, ValueError, CustomException) as e:
+                if connected:
+                    logger.warning(f"하드웨어 데몬 태그 구독 끊김: {e}")
+                    connected = False
+            self._stop_event.wait(self.reconnect_delay)
+
+    def claim(self, seq):
+        """워커 seq를 데몬 seq로 바꿔 claim_tag 요청. 데몬 재시작 전 이벤트는 꺼낼 수 없음"""
+        remote = seq - self._offset
+        if remote <= 0:
+            return False
+        return self.client.claim_tag(remote)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HardwareClient(
+                settings.HARDWARE_SOCKET,
+                timeout=settings.HARDWARE_TIMEOUT,
+                keepalive=settings.TAG_STREAM_KEEPALIVE,
+            )
+    return _client
@@ -0,0 +1,63 @@
+# rfid/ledger.py
+# 폐기 이벤트 원장(DisposalEvent)과 일/월 집계(DisposalRollup) 기록/조회.
+# record_disposal()은 누적량 갱신(weight.accumulate_weight)과 같은 트랜잭션 안에서 호출된다.
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DisposalEvent, DisposalRollup
+
+
+def record_disposal(uid, asgn_cd, weight_before, weight_after, delta):
+    """이벤트 1행 추가 + 해당 일/월 집계 증분. 생성된 DisposalEvent 반환"""
+    event = DisposalEvent.objects.create(
+        uid=uid,
+        asgn_cd=asgn_cd,
+        weight_before=weight_before,
+        weight_after=weight_after,
+        delta=delta,
+    )
+    day = timezone.localdate(event.created_at)
+    for period, start in ((DisposalRollup.PERIOD_DAY, day), (DisposalRollup.PERIOD_MONTH, day.replace(day=1))):
+        _add_to_rollup(period, start, asgn_cd, delta)
+    return event
+
+
+def _add_to_rollup(period, period_start, asgn_cd, delta):
+    rollup = DisposalRollup.objects.filter(period=period, period_start=period_start, asgn_cd=asgn_cd)
+    if rollup.update(total=F('total') + delta, event_count=F('event_count') + 1):
+        return
+    try:
+        # 해당 기간 첫 이벤트. 동시에 다른 요청이 먼저 만들었으면 갱신으로 처리
+        with transaction.atomic():
+            DisposalRollup.objects.create(
+                period=period, period_start=period_start, asgn_cd=asgn_cd, total=delta, event_count=1,
+            )
+    except IntegrityError:
+        rollup.update(total=F('total') + delta, event_count=F('event_count') + 1)
+
+
+def mark_published(event_ids):
+    """아웃박스 전송 완료 시 호출 - 이벤트 발행 상태 갱신"""
+    if event_ids:
+        DisposalEvent.objects.filter(id__in=event_ids).update(publish_status=DisposalEvent.PUBLISH_SENT)
+
+
+def events_between(asgn_cd, start, end):
+    """회사별 기간 이벤트 목록((asgn_cd, created_at) 인덱스 범위 조회)"""
+    return DisposalEvent.objects.filter(asgn_cd=asgn_cd, created_at__gte=start, created_at__lt=end).order_by('created_at')
+
+
+def monthly_totals(month_start):
+    """해당 월의 회사별 폐기량 합계 {asgn_cd: (total, event_count)}"""
+    rows = DisposalRollup.objects.filter(
+        period=DisposalRollup.PERIOD_MONTH, period_start=month_start.replace(day=1),
+    ).values_list('asgn_cd', 'total', 'event_count')
+    return {asgn_cd: (total, count) for asgn_cd, total, count in rows}
+
+
+def daily_totals(asgn_cd, start, end):
+    """회사의 일별 폐기량 [(날짜, total, event_count), ...]"""
+    return list(DisposalRollup.objects.filter(
+        period=DisposalRollup.PERIOD_DAY, asgn_cd=asgn_cd, period_start__gte=start, period_start__lt=end,
+    ).order_by('period_start').values_list('period_start', 'total', 'event_count'))
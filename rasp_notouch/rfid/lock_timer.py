@@ -0,0 +1,125 @@
+# rfid/lock_timer.py
+# 세션별 자동 잠금 타이머.
+# disposal에서 문을 열 때 마감 시각을 등록(arm)하고 result에서 취소(cancel)하면,
+# 스레드 하나가 가장 가까운 마감 시각까지 잠들었다가 정확히 그 시각에 콜백(문 잠금)을 실행한다.
+# 마감 시각은 ActiveSession 테이블에도 남아 있으므로 재시작 시 load()로 다시 등록한다.
+# 타이머는 장치를 여는 프로세스(hardware.owns_devices())에서만 돈다.
+# HARDWARE_MODE = 'daemon'이면 하드웨어 데몬(run_hwd)이 돌리고, 웹 워커는 RemoteTimer로 등록/취소만 보낸다.
+import heapq
+import logging
+import threading
+import time
+
+from django.db import close_old_connections
+
+from rfid import hardware
+
+logger = logging.getLogger('rasp')
+
+
+class DeadlineScheduler(threading.Thread):
+    """(마감 시각, key) 최소 힙 + Condition 대기"""
+
+    def __init__(self, on_expire):
+        super().__init__(name='lock-timer', daemon=True)
+        self.on_expire = on_expire  # 만료된 key를 받는 콜백
+        self._heap = []  # (마감 epoch 초, 세대, key)
+        self._armed = {}  # key -> 세대 (취소/재등록된 힙 항목은 꺼낼 때 버린다)
+        self._generation = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+
+    def arm(self, key, deadline):
+        """key의 마감 시각(aware datetime)을 등록. 이미 있으면 새 시각으로 교체"""
+        with self._cond:
+            self._generation += 1
+            self._armed[key] = self._generation
+            heapq.heappush(self._heap, (deadline.timestamp(), self._generation, key))
+            self._cond.notify()
+
+    def cancel(self, key):
+        with self._cond:
+            return self._armed.pop(key, None) is not None
+
+    def pending(self):
+        with self._cond:
+            return len(self._armed)
+
+    def stop(self, timeout=5):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self.join(timeout)
+
+    def _pop_expired(self):
+        """만료된 key 목록, 없으면 다음 마감까지 남은 초(없으면 None)"""
+        now = time.time()
+        expired = []
+        while self._heap:
+            when, generation, key = self._heap[0]
+            if self._armed.get(key) != generation:
+                heapq.heappop(self._heap)  # 취소되었거나 다시 등록된 항목
+                continue
+            if when > now:
+                break
+            heapq.heappop(self._heap)
+            del self._armed[key]
+            expired.append(key)
+        if expired:
+            return expired, None
+        return [], (self._heap[0][0] - now if self._heap else None)
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    expired, wait = self._pop_expired()
+                    if expired:
+                        break
+                    self._cond.wait(wait)
+                if self._stopped:
+                    return
+            for key in expired:
+                try:
+                    self.on_expire(key)
+                except Exception as e:
+                    logger.error(f"자동 잠금 처리 중 오류: {e}")
+
+
+def _expire(session_key):
+    # 타이머 스레드에서 Django DB 사용 - 끊긴 연결 정리 후 처리
+    from rfid import session_tasks
+    close_old_connections()
+    session_tasks.expire_session(session_key)
+
+
+_timer = None
+_timer_lock = threading.Lock()
+
+
+def get_lock_timer():
+    global _timer
+    with _timer_lock:
+        if _timer is None:
+            if hardware.owns_devices():
+                _timer = DeadlineScheduler(on_expire=_expire)
+                _timer.start()
+            else:
+                from rfid.hwd import RemoteTimer, get_client
+                _timer = RemoteTimer(get_client())
+    return _timer
+
+
+def load():
+    """재시작 시 ActiveSession에 남은 마감 시각을 다시 등록(이미 지난 것은 즉시 실행됨)"""
+    from rfid.models import ActiveSession
+    timer = get_lock_timer()
+    if not isinstance(timer, DeadlineScheduler):
+        return 0  # 타이머는 하드웨어 데몬이 시작할 때 복원한다
+    count = 0
+    for session_key, deadline in ActiveSession.objects.values_list('session_key', 'deadline'):
+        timer.arm(session_key, deadline)
+        count += 1
+    if count:
+        logger.info(f"자동 잠금 타이머 복원: {count}건")
+    return count
@@ -0,0 +1,394 @@
+import csv
+import gzip
+import json
+import os
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# verbose 포매터: '{levelname} {asctime} {module} {funcName} {message}'
+LINE_PATTERN = re.compile(
+    r"^(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL) "
+    r"(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d,\d{3}) (?P<module>\S+) (?P<func>\S+) (?P<msg>.*)$"
+)
+USER_PATTERN = re.compile(r"(?:사용자 확인 성공|문 열기): (?P<name>.*), UID: (?P<uid>.+)$")
+DELTA_PATTERN = re.compile(r"(?P<name>.*)님의 폐기량(?:은| 업데이트:) ?(?P<kg>-?\d+(?:\.\d+)?) ?kg")
+STATUS_PATTERN = re.compile(r"\(Status Code: (\d+)\)")
+
+TIMELINE_FIELDS = [
+    'uid', 'name', 'company', 'asgn_cd', 'opened_at', 'result_at', 'published_at',
+    'open_weight_s', 'door_open_s', 'result_weight_s', 'update_s', 'publish_s', 'result_total_s',
+    'delta_kg', 'errors', 'status',
+]
+STAGES = ['open_weight_s', 'door_open_s', 'result_weight_s', 'update_s', 'publish_s', 'result_total_s']
+RESERVOIR_SIZE = 5000  # 구간별 백분위 계산용 표본(메모리 상한)
+
+
+def parse_ts(text):
+    # strptime보다 빠른 고정 위치 파싱: 2024-12-04 09:05:09,958
+    return datetime(
+        int(text[0:4]), int(text[5:7]), int(text[8:10]),
+        int(text[11:13]), int(text[14:16]), int(text[17:19]), int(text[20:23]) * 1000,
+    )
+
+
+def parse_line(line):
+    """로그 한 줄 -> (level, datetime, module, func, msg, extra) 또는 None(트레이스백 등 이어지는 줄)"""
+    if line.startswith('{'):  # LOG_FORMAT = 'json'
+        try:
+            entry = json.loads(line)
+            ts = datetime.fromisoformat(entry['ts']).astimezone().replace(tzinfo=None)
+            return entry['level'], ts, entry.get('module', ''), entry.get('func', ''), entry.get('msg', ''), entry
+        except (ValueError, KeyError):
+            return None
+    match = LINE_PATTERN.match(line)
+    if match is None:
+        return None
+    return match['level'], parse_ts(match['ts']), match['module'], match['func'], match['msg'], None
+
+
+def _seconds(start, end):
+    if start is None or end is None:
+        return None
+    return round((end - start).total_seconds(), 3)
+
+
+class TimelineBuilder:
+    """
+    한 키오스크의 로그를 순서대로 받아 폐기 1건의 타임라인을 만든다.
+    문 열기(disposal) -> 저울 읽기 -> Result 호출 -> 저울 읽기 -> update_weight -> MQTT 발행
+    '문 열기' 줄이 없는 이전 로그는 INFO로 찍히던 check_user '사용자 확인 성공' 줄을 시작점으로 쓴다.
+    진행 중인 1건만 메모리에 두고, 그동안의 경고/오류/상태코드 줄 수를 errors로 센다.
+    """
+
+    def __init__(self, emit, pending=None, timeout=None):
+        self.emit = emit
+        self.timeout = timedelta(seconds=timeout or settings.DISPOSAL_TIMEOUT)
+        self.current = self._load(pending)
+
+    @staticmethod
+    def _load(pending):
+        if not pending:
+            return None
+        return {k: (datetime.fromisoformat(v) if k.endswith('_at') and v else v) for k, v in pending.items()}
+
+    def dump(self):
+        if self.current is None:
+            return None
+        return {k: (v.isoformat() if isinstance(v, datetime) else v) for k, v in self.current.items()}
+
+    def _finish(self, status):
+        c = self.current
+        self.current = None
+        if c is None:
+            return
+        if status != 'complete' and c.get('updated_at'):
+            status = 'unpublished'  # 누적량은 갱신됐지만 발행 로그가 없음
+        self.emit({
+            'uid': c.get('uid'), 'name': c.get('name'), 'company': c.get('company'), 'asgn_cd': c.get('asgn_cd'),
+            'opened_at': c.get('opened_at'), 'result_at': c.get('result_at'), 'published_at': c.get('published_at'),
+            'open_weight_s': c.get('open_weight_s'),
+            'door_open_s': _seconds(c.get('opened_at'), c.get('result_at')),
+            'result_weight_s': c.get('result_weight_s'),
+            'update_s': _seconds(c.get('weight_done_at'), c.get('updated_at')),
+            'publish_s': _seconds(c.get('updated_at'), c.get('published_at')),
+            'result_total_s': _seconds(c.get('result_at'), c.get('published_at') or c.get('updated_at')),
+            'delta_kg': c.get('delta_kg'),
+            'errors': c.get('errors', 0),
+            'status': status,
+        })
+
+    def feed(self, ts, module, func, msg, extra, error=False):
+        c = self.current
+        if c is not None and ts - c['opened_at'] > self.timeout:
+            self._finish('timeout')  # 오래 열린 채 끝나지 않은 건(DISPOSAL_TIMEOUT 초과)
+            c = None
+        if func == '<module>' and msg.startswith("로깅 시작"):
+            if c is not None:  # 프로세스 재시작
+                self._finish('interrupted')
+            return
+        opened = func == 'disposal' and msg.startswith("문 열기")
+        if opened or (func == 'check_user' and msg.startswith("사용자 확인 성공")):
+            match = USER_PATTERN.search(msg)
+            uid = (extra or {}).get('uid') or (match['uid'] if match else None)
+            if c is not None and (c.get('updated_at') or c.get('uid') != uid):
+                # 발행 로그 없이 끝났거나, 결과 전에 다른 사용자가 태깅함
+                self._finish('abandoned')
+                c = None
+            if c is None:
+                self.current = {'uid': uid, 'name': match['name'] if match else None, 'opened_at': ts, 'errors': 0}
+            elif not opened and c.get('result_at') is None and c.get('weight_done_at'):
+                c['result_at'] = ts  # Result 호출 로그가 없는 이전 버전: 문 열린 뒤 다시 태깅한 시점
+            return
+        if c is None:
+            return
+        if error:
+            c['errors'] = c.get('errors', 0) + 1
+        if msg.startswith("저울과 통신 시작"):
+            c['weight_started_at'] = ts
+        elif msg.startswith("직렬 포트를 닫았습니다") or (msg.startswith("평균 무게 값") and extra):
+            if extra and extra.get('latency_ms') is not None:
+                duration = extra['latency_ms'] / 1000
+            else:
+                duration = _seconds(c.get('weight_started_at'), ts)
+            c['result_weight_s' if c.get('result_at') else 'open_weight_s'] = duration
+            c['weight_done_at'] = ts
+        elif func == 'result' and msg.startswith("Result 호출"):
+            c['result_at'] = ts
+            c.pop('result_weight_s', None)
+        elif func == 'update_weight':
+            match = DELTA_PATTERN.search(msg)
+            if match:
+                c['delta_kg'] = float(match['kg'])
+                c['updated_at'] = ts
+            if c.get('result_at') is None:
+                # 문 열 때 무게를 읽지 않던 초기 버전: 방금 읽은 무게가 결과 측정이다
+                c['result_at'] = c.get('weight_started_at') or ts
+                c['result_weight_s'] = c.pop('open_weight_s', None)
+        elif msg.startswith("MQTT 메시지 발행 완료") and c.get('updated_at'):
+            try:
+                payload = json.loads(msg.split(":", 1)[1])
+                if len(payload) == 1:  # 이전 버전은 전체 회사 누적량을 한꺼번에 발행해 회사를 특정할 수 없다
+                    c['company'] = payload[0].get('company')
+                    c['asgn_cd'] = str(payload[0].get('asgn_cd'))
+            except (ValueError, IndexError, AttributeError):
+                pass
+            c['published_at'] = ts
+            self._finish('complete')
+
+    def close(self):
+        """입력이 끝났을 때 갱신까지 된 진행 중 건을 기록"""
+        if self.current is not None and self.current.get('updated_at'):
+            self._finish('unpublished')
+
+
+class CsvSink:
+
+    def __init__(self, path, fields, append):
+        exists = append and path.exists()
+        self._file = open(path, 'a' if exists else 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._file, fieldnames=fields)
+        if not exists:
+            self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    """pyarrow가 있을 때만. 행을 묶음 단위로 모아 row group으로 쓴다(이어쓰기 시 파일을 새로 만든다)"""
+
+    def __init__(self, path, fields, append, batch_size=5000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise CommandError("Parquet 출력에는 pyarrow가 필요합니다(--format csv 사용 가능).")
+        self._pa = pa
+        if append and path.exists():
+            path = path.with_name(f"{path.stem}-{int(time.time())}{path.suffix}")
+        self.path = path
+        self.fields = fields
+        self.batch_size = batch_size
+        self._rows = []
+        self._writer = None
+        self._pq = pq
+
+    def write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        columns = {f: [None if r.get(f) is None else str(r[f]) if isinstance(r.get(f), datetime) else r[f]
+                       for r in self._rows] for f in self.fields}
+        table = self._pa.table(columns)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(str(self.path), table.schema, compression='zstd')
+        self._writer.write_table(table.cast(self._writer.schema))
+        self._rows = []
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "verbose/JSON 로그를 한 번에 스트리밍으로 읽어 폐기 건별 구간 시간, 시간대별 실패율, 회사별 폐기량을 집계합니다. "
+        "--state 파일로 지난번 위치부터 이어 읽을 수 있습니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help="로그 파일(.gz 가능). 기본: LOG_DIR/info.log")
+        parser.add_argument('--out', default='log_report', help="결과 디렉터리")
+        parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+        parser.add_argument('--state', help="읽은 위치 저장 파일(JSON). 있으면 그 위치부터 읽고 결과를 이어 쓴다")
+        parser.add_argument('--follow', action='store_true', help="파일 끝에서 기다리며 새 줄을 계속 처리(Ctrl+C로 종료)")
+        parser.add_argument('--interval', type=float, default=5.0, help="--follow 확인 주기(초)")
+
+    def handle(self, *args, **options):
+        files = [Path(f) for f in options['files']] or [Path(settings.LOG_DIR) / 'info.log']
+        state_path = Path(options['state']) if options['state'] else None
+        state = json.loads(state_path.read_text()) if state_path and state_path.exists() else {}
+        append = bool(state)
+
+        out = Path(options['out'])
+        out.mkdir(parents=True, exist_ok=True)
+        sink_class = ParquetSink if options['format'] == 'parquet' else CsvSink
+        suffix = '.parquet' if options['format'] == 'parquet' else '.csv'
+        timelines = sink_class(out / f"timelines{suffix}", TIMELINE_FIELDS, append)
+
+        self.hourly = Counter()  # (시각(시 단위), 항목) -> 건수
+        self.companies = defaultdict(lambda: [0, 0.0])  # (회사, asgn_cd) -> [건수, kg]
+        self.stage_samples = {stage: [] for stage in STAGES}
+        self.stage_seen = Counter()
+        self._rng = random.Random(0)
+        self.timeline_count = Counter()
+
+        def emit(row):
+            self.timeline_count[row['status']] += 1
+            for stage in STAGES:
+                if row[stage] is not None:
+                    self._sample(stage, row[stage])
+            hour = row['opened_at'].strftime('%Y-%m-%d %H:00')
+            self.hourly[(hour, 'sessions')] += 1
+            if row['status'] != 'complete' or row['errors']:
+                self.hourly[(hour, 'failed_sessions')] += 1
+            if row['status'] == 'complete' and row['delta_kg'] is not None:
+                entry = self.companies[(row['company'], row['asgn_cd'])]
+                entry[0] += 1
+                entry[1] += row['delta_kg']
+                self.hourly[(hour, 'disposals')] += 1
+            timelines.write(row)
+
+        builder = TimelineBuilder(emit, state.get('pending'))
+        offsets = state.get('files', {})
+        lines = 0
+        started = time.perf_counter()
+        try:
+            while True:
+                for path in files:
+                    lines += self._read_file(path, offsets, builder)
+                if state_path:
+                    state_path.write_text(json.dumps({'files': offsets, 'pending': builder.dump()}, ensure_ascii=False))
+                if not options['follow']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        if not state_path:
+            builder.close()  # 이어 읽지 않으면 남은 진행 중 건도 기록
+        timelines.close()
+        self._write_tables(out, sink_class, suffix, append)
+        self._report(lines, time.perf_counter() - started, out)
+
+    def _read_file(self, path, offsets, builder):
+        """파일을 저장된 위치부터 끝까지 읽는다. 회전(다른 inode/크기 감소)되었으면 처음부터"""
+        if not path.exists():
+            raise CommandError(f"로그 파일이 없습니다: {path}")
+        key = str(path.resolve())
+        stat = path.stat()
+        saved = offsets.get(key, {})
+        compressed = path.suffix == '.gz'
+        offset = saved.get('offset', 0)
+        if compressed or saved.get('inode') != stat.st_ino or stat.st_size < offset:
+            offset = 0 if not (compressed and saved.get('inode') == stat.st_ino) else None
+        if offset is None:  # 이미 읽은 압축 파일
+            return 0
+
+        count = 0
+        opener = gzip.open if compressed else open
+        with opener(path, 'rb') as f:
+            if offset:
+                f.seek(offset)
+            while True:
+                raw = f.readline()
+                if not raw:
+                    break
+                if not raw.endswith(b"\n") and not compressed:
+                    break  # 아직 쓰는 중인 줄은 다음에
+                offset += len(raw)
+                count += 1
+                parsed = parse_line(raw.decode('utf-8', errors='replace').rstrip("\r\n"))
+                if parsed is None:
+                    continue
+                level, ts, module, func, msg, extra = parsed
+                error = self._count(level, ts, msg)
+                builder.feed(ts, module, func, msg, extra, error)
+        offsets[key] = {'inode': stat.st_ino, 'offset': offset}
+        return count
+
+    def _count(self, level, ts, msg):
+        """시간대별 줄 수를 세고, 경고/오류/상태코드 줄이면 True"""
+        hour = ts.strftime('%Y-%m-%d %H:00')
+        self.hourly[(hour, 'lines')] += 1
+        error = level in ('WARNING', 'ERROR', 'CRITICAL')
+        if error:
+            self.hourly[(hour, level.lower())] += 1
+        match = STATUS_PATTERN.search(msg)
+        if match:
+            self.hourly[(hour, f"status_{match.group(1)}")] += 1
+        return error or match is not None
+
+    def _sample(self, stage, value):
+        # 구간별 reservoir sampling - 메모리는 RESERVOIR_SIZE로 고정
+        self.stage_seen[stage] += 1
+        samples = self.stage_samples[stage]
+        if len(samples) < RESERVOIR_SIZE:
+            samples.append(value)
+        else:
+            i = self._rng.randrange(self.stage_seen[stage])
+            if i < RESERVOIR_SIZE:
+                samples[i] = value
+
+    def _write_tables(self, out, sink_class, suffix, append):
+        hourly = sink_class(out / f"hourly{suffix}", ['hour', 'kind', 'count'], append)
+        for (hour, kind), count in sorted(self.hourly.items()):
+            hourly.write({'hour': hour, 'kind': kind, 'count': count})
+        hourly.close()
+        companies = sink_class(out / f"companies{suffix}", ['company', 'asgn_cd', 'disposals', 'total_kg'], append)
+        for (company, asgn_cd), (count, kg) in sorted(self.companies.items(), key=lambda item: -item[1][1]):
+            companies.write({'company': company, 'asgn_cd': asgn_cd, 'disposals': count, 'total_kg': round(kg, 2)})
+        companies.close()
+
+    def _report(self, lines, elapsed, out):
+        self.stdout.write(f"{lines}줄 처리 ({elapsed:.2f}초), 폐기 타임라인 {dict(self.timeline_count)}")
+        self.stdout.write(f"\n{'구간':<18}{'건수':>7}{'p50':>9}{'p95':>9}  (초)")
+        for stage in STAGES:
+            samples = sorted(self.stage_samples[stage])
+            if not samples:
+                continue
+            p50 = samples[len(samples) // 2]
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            self.stdout.write(f"{stage:<20}{self.stage_seen[stage]:>7}{p50:>9.2f}{p95:>9.2f}")
+
+        sessions_by_hour = Counter()
+        failed_by_hour = Counter()
+        for (hour, kind), count in self.hourly.items():
+            hour_of_day = hour[11:13]
+            if kind == 'sessions':
+                sessions_by_hour[hour_of_day] += count
+            elif kind == 'failed_sessions':
+                failed_by_hour[hour_of_day] += count
+        self.stdout.write("\n시간대별 실패율(완료되지 않았거나 경고/오류가 있었던 폐기 ÷ 전체 폐기)")
+        for hour_of_day in sorted(sessions_by_hour):
+            rate = failed_by_hour[hour_of_day] / sessions_by_hour[hour_of_day]
+            self.stdout.write(f"  {hour_of_day}시 {rate:6.1%} ({failed_by_hour[hour_of_day]}/{sessions_by_hour[hour_of_day]})")
+
+        self.stdout.write("\n회사별 폐기량")
+        for (company, asgn_cd), (count, kg) in sorted(self.companies.items(), key=lambda item: -item[1][1])[:15]:
+            self.stdout.write(f"  {company or '-'} ({asgn_cd or '-'}): {count}건 {kg:.1f}kg")
+        self.stdout.write(f"\n결과: {os.path.abspath(out)}")
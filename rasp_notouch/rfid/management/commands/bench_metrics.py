@@ -0,0 +1,56 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from rfid import metrics
+
+# 폐기 한 건(home -> check_rfid -> disposal -> check_rfid_disposal -> result)에서 기록되는 구간 수
+TIMERS_PER_SESSION = 14
+
+
+def _noop():
+    return None
+
+
+def _per_call_ns(func, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started) / iterations * 1e9
+
+
+class Command(BaseCommand):
+    help = "metrics 계측(타이머/카운터)이 호출 한 번에 더하는 시간을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200000)
+
+    def handle(self, *args, **options):
+        n = options['iterations']
+        decorated = metrics.timed('bench.decorator')(_noop)
+
+        def with_block():
+            with metrics.timed('bench.context'):
+                pass
+
+        def counter():
+            metrics.inc('rasp_bench_total')
+
+        baseline = _per_call_ns(_noop, n)
+        results = [
+            ("@timed 함수 호출", _per_call_ns(decorated, n) - baseline),
+            ("with timed() 블록", _per_call_ns(with_block, n) - baseline),
+            ("inc() 카운터", _per_call_ns(counter, n) - baseline),
+        ]
+        for name, ns in results:
+            self.stdout.write(f"{name:<20} {ns:8.0f}ns/회")
+
+        worst = max(ns for _, ns in results)
+        self.stdout.write(
+            f"폐기 1건당 구간 {TIMERS_PER_SESSION}개 기준 계측 비용 약 {worst * TIMERS_PER_SESSION / 1000:.1f}µs"
+        )
+
+        started = time.perf_counter()
+        body = metrics.render()
+        self.stdout.write(f"/metrics 렌더링 {(time.perf_counter() - started) * 1000:.2f}ms ({len(body)} bytes)")
+        metrics.reset()
@@ -0,0 +1,78 @@
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from rfid.scale_parser import parse_frame
+from rfid.sim.scale import make_frame
+
+# 기존 get_weight_v2 의 프레임 처리 경로(비교용)
+LEGACY_PATTERN = r"-?\s*\d+\.\d{1,2}\s*kg"
+
+
+def legacy_parse(raw):
+    data = raw.decode("ascii", errors="ignore").strip()
+    cleaned_data = re.sub(r"[^\x20-\x7E]", "", data)
+    match = re.search(LEGACY_PATTERN, cleaned_data)
+    if match:
+        weight_str = match.group().replace('kg', '').replace(' ', '').strip()
+        return float(weight_str)
+    return None
+
+
+def synthetic_frames(count, seed=0):
+    """녹화본이 없을 때 쓰는 가상 저울 프레임(불안정/과부하/깨진 프레임 일부 포함)"""
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(count):
+        r = rng.random()
+        if r < 0.02:
+            frames.append(b"\x02\x00ST,GS,+ 1\x1b2.30kg\r\n")
+        elif r < 0.03:
+            frames.append(b"OL,GS,+   OL  kg\r\n")
+        else:
+            status = "US" if r < 0.2 else "ST"
+            frames.append(make_frame(rng.uniform(-2, 250), status))
+    return frames
+
+
+class Command(BaseCommand):
+    help = "저울 프레임 파서 처리량(frames/s)을 기존 get_weight_v2 경로와 비교합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--frames', help="저울 원본 캡처 파일(한 줄에 한 프레임). 없으면 가상 프레임 사용")
+        parser.add_argument('--count', type=int, default=100000, help="가상 프레임 개수")
+        parser.add_argument('--repeat', type=int, default=5, help="반복 측정 횟수(최고 기록 사용)")
+
+    def handle(self, *args, **options):
+        if options['frames']:
+            with open(options['frames'], 'rb') as f:
+                frames = [line for line in f if line.strip()]
+        else:
+            frames = synthetic_frames(options['count'])
+
+        # 두 경로가 같은 무게를 읽는지 먼저 확인
+        mismatch = 0
+        for raw in frames:
+            frame = parse_frame(raw)
+            new = frame.weight if frame else None
+            if new != legacy_parse(raw):
+                mismatch += 1
+
+        results = {}
+        for name, func in (("legacy", legacy_parse), ("parse_frame", parse_frame)):
+            best = None
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                for raw in frames:
+                    func(raw)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[name] = len(frames) / best
+            self.stdout.write(f"{name:12s} {results[name]:12,.0f} frames/s")
+
+        self.stdout.write(f"frames={len(frames)} 무게 불일치={mismatch}")
+        self.stdout.write(self.style.SUCCESS(
+            f"속도 향상: x{results['parse_frame'] / results['legacy']:.2f}"
+        ))
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# 웹/관리 프로세스 시작 시 import되면 안 되는 장치 드라이버(및 무거운 의존성)
+DRIVER_MODULES = ('gpiozero', 'spidev', 'mfrc522', 'smartcard', 'serial', 'numpy', 'RPi', 'lgpio')
+
+SCRIPT = "import django, importlib; django.setup(); importlib.import_module({target!r})"
+
+
+def parse_importtime(stderr):
+    """python -X importtime 출력 -> [(모듈, self us, cumulative us, 깊이), ...]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        try:
+            head, cumulative_us, name = line.split("|", 2)
+            self_us = int(head.split(":", 1)[1])
+            cumulative_us = int(cumulative_us)
+        except ValueError:
+            continue
+        # 패키지 깊이는 이름 앞 공백(2칸씩)으로 표시된다
+        rows.append((name.strip(), self_us, cumulative_us, (len(name) - len(name.lstrip())) // 2))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "새 인터프리터에서 django.setup() + URLconf import에 걸리는 시간을 -X importtime으로 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', default=settings.ROOT_URLCONF, help="django.setup() 후 import할 모듈")
+        parser.add_argument('--runs', type=int, default=5, help="반복 횟수(가장 빠른 실행 기준으로 보고)")
+        parser.add_argument('--top', type=int, default=15, help="self 시간 기준 상위 모듈 개수")
+        parser.add_argument('--budget-ms', type=float, help="이 시간(ms)을 넘으면 실패로 종료")
+
+    def run_once(self, target):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'rasp.settings'))
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", SCRIPT.format(target=target)],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        if proc.returncode != 0:
+            errors = [line for line in proc.stderr.splitlines() if not line.startswith("import time:")]
+            raise CommandError("시작 실패:\n" + "\n".join(errors[-15:]))
+        return elapsed, parse_importtime(proc.stderr)
+
+    def handle(self, *args, **options):
+        runs = [self.run_once(options['target']) for _ in range(max(1, options['runs']))]
+        elapsed, rows = min(runs, key=lambda run: run[0])
+
+        top_depth = min((depth for *_, depth in rows), default=0)
+        import_ms = sum(cum for _, _, cum, depth in rows if depth == top_depth) / 1000
+        self.stdout.write(
+            f"{options['target']}: 프로세스 {elapsed:.0f}ms (최소, {len(runs)}회) / import {import_ms:.0f}ms / 모듈 {len(rows)}개"
+        )
+
+        self.stdout.write(f"\nself 시간 상위 {options['top']}개")
+        for name, self_us, cumulative_us, _ in sorted(rows, key=lambda row: -row[1])[:options['top']]:
+            self.stdout.write(f"  {self_us / 1000:8.1f}ms  (누적 {cumulative_us / 1000:8.1f}ms)  {name}")
+
+        drivers = sorted({
+            name for name, *_ in rows if name.split('.')[0] in DRIVER_MODULES
+        }, key=lambda name: name.count('.'))
+        if drivers:
+            self.stdout.write(self.style.WARNING(f"\n시작 시 장치 드라이버 import: {', '.join(drivers[:10])}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("\n시작 시 import된 장치 드라이버 없음"))
+
+        if options['budget_ms'] is not None and elapsed > options['budget_ms']:
+            raise CommandError(f"시작 시간 {elapsed:.0f}ms > 예산 {options['budget_ms']:.0f}ms")
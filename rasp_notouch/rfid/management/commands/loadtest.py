@@ -0,0 +1,230 @@
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from rfid.models import User_v3, Weight_v3
+
+LOADTEST_COMPANY = "금양기업"  # Company 등록부(0012 마이그레이션 기본값)에 있는 회사여야 result가 누적량을 갱신한다
+LOADTEST_ASGN_CD = 8414
+ENDPOINTS = ('home', 'check_rfid', 'disposal', 'check_rfid_disposal', 'result')
+ERROR_TEMPLATES = {'error.html', 'err_lock.html'}  # 뷰가 오류를 200 응답의 오류 화면으로 돌려주는 경우
+
+
+def percentile(sorted_values, p):
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return None
+    k = max(0, min(len(sorted_values) - 1, round(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class Kiosk:
+    """가상 키오스크 하나: home -> check_rfid -> disposal -> check_rfid_disposal -> result 반복"""
+
+    def __init__(self, uid, rig, think, rng):
+        self.uid = uid
+        self.rig = rig
+        self.think = think
+        self.rng = rng
+        self.client = Client()
+        self.timings = {name: [] for name in ENDPOINTS}
+        self.errors = {name: 0 for name in ENDPOINTS}
+        self.sessions = 0
+        self.poured = 0.0  # 완료 세션에서 부은 양(kg) 합계 - 누적량 검증용
+
+    def request(self, name, path, ok=(200,)):
+        started = time.perf_counter()
+        response = self.client.get(path)
+        self.timings[name].append(time.perf_counter() - started)
+        rendered = {t.name for t in response.templates}
+        if response.status_code not in ok or rendered & ERROR_TEMPLATES:
+            self.errors[name] += 1
+            return None
+        return response
+
+    def tag(self, name, path):
+        # 리더는 한 대뿐이므로 태깅 + 확인 요청은 키오스크끼리 번갈아 가며 한다
+        with self.rig.reader_lock:
+            self.rig.reader.present(self.uid)
+            response = self.request(name, path)
+        if response is not None and response.json().get('uid') != self.uid:
+            self.errors[name] += 1
+            return False
+        return response is not None
+
+    def run(self, sessions):
+        for _ in range(sessions):
+            self.request('home', '/home/')
+            if not self.tag('check_rfid', '/check-rfid/'):
+                continue
+            # 저울도 한 대뿐이므로 문 열기(무게 기록) -> 붓기 -> 결과(무게 차이)는 키오스크끼리 번갈아 한다.
+            # 다른 키오스크가 그 사이에 부으면 폐기량이 섞인다.
+            with self.rig.scale_lock:
+                if self.request('disposal', f'/disposal/{quote(self.uid)}/') is None:
+                    continue
+                time.sleep(self.think)
+                kg = round(self.rng.uniform(0.1, 2.0), 2)
+                self.rig.pour(kg)
+                if not self.tag('check_rfid_disposal', f'/check-rfid-disposal/?current_uid={quote(self.uid)}'):
+                    continue
+                if self.request('result', f'/result/?uid={quote(self.uid)}') is not None:
+                    self.sessions += 1
+                    self.poured = round(self.poured + kg, 2)
+
+
+class Rig:
+    """키오스크들이 공유하는 가상 장치(리더 1대, 저울 1대)"""
+
+    def __init__(self, reader, scale):
+        self.reader = reader
+        self.scale = scale
+        self.reader_lock = threading.Lock()
+        self.scale_lock = threading.Lock()  # 문 열기 ~ 결과 동안 저울을 한 키오스크만 씀
+
+    def pour(self, kg, timeout=5):
+        """저울에 kg만큼 올리고, 리더의 최근 안정 판정 창이 모두 새 무게가 될 때까지 기다린다"""
+        target = round(self.scale.fake.weight + kg, 2)
+        self.scale.fake.set_weight(target)
+        window = settings.SCALE_STABLE_WINDOW
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            recent = self.scale.readings()[-window:]
+            if len(recent) == window and all(abs(v - target) < 0.005 for v in recent):
+                return
+            time.sleep(self.scale.fake.interval)
+
+
+class Command(BaseCommand):
+    help = (
+        "가상 장치(리더/저울/잠금장치/MQTT 브로커)로 여러 키오스크 세션을 동시에 돌려 "
+        "실제 뷰의 엔드포인트별 p50/p95/p99 지연과 처리량을 측정합니다. 임시 DB를 사용합니다. "
+        "완료 세션 수와 브로커 수신 메시지 수, 부은 양과 누적량이 다르면 실패로 끝납니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kiosks', type=int, default=4, help="동시에 도는 가상 키오스크 수")
+        parser.add_argument('--sessions', type=int, default=20, help="키오스크당 폐기 세션 수")
+        parser.add_argument('--think', type=float, default=0.0, help="문이 열린 뒤 결과 태깅까지 대기(초)")
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        from rfid.sim.broker import FakeBroker
+
+        with tempfile.TemporaryDirectory() as tmp, FakeBroker() as broker:
+            overrides = override_settings(
+                HARDWARE_MODE='local',
+                LOCK_BACKEND='sim',
+                RFID_BACKEND='sim',
+                SCALE_BACKEND='sim',
+                MQTT_HOST=broker.host,
+                MQTT_PORT=broker.port,
+                MQTT_OUTBOX_PATH=Path(tmp) / 'outbox.sqlite3',
+                MQTT_PUBLISH_MODE='event',  # 완료 세션 1건 = 메시지 1건으로 검증
+            )
+            # 운영 DB 대신 마이그레이션만 적용된 임시 DB에서 실행
+            test_name = connection.settings_dict.setdefault('TEST', {}).get('NAME')
+            options_dict = connection.settings_dict.setdefault('OPTIONS', {})
+            old_options = dict(options_dict)
+            if connection.vendor == 'sqlite':
+                connection.settings_dict['TEST']['NAME'] = str(Path(tmp) / 'loadtest.sqlite3')
+                # 키오스크 스레드가 동시에 쓰므로 "database is locked" 대신 잠금이 풀릴 때까지 기다린다
+                options_dict.setdefault('timeout', 20)
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            setup_test_environment()  # 응답에 렌더링된 템플릿 기록(오류 화면 집계용)
+            try:
+                with overrides:
+                    self.run_load(options, broker)
+            finally:
+                self.stop_outbox()  # 임시 DB를 지우기 전에 드레이너(원장 발행 상태 갱신)를 멈춘다
+                teardown_test_environment()
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                connection.settings_dict['TEST']['NAME'] = test_name
+                options_dict.clear()
+                options_dict.update(old_options)
+
+    @staticmethod
+    def stop_outbox():
+        from rfid import outbox
+        with outbox._outbox_lock:
+            if outbox._outbox is not None:
+                outbox._outbox.stop()
+                outbox._outbox = None
+
+    def run_load(self, options, broker):
+        from rfid import scale, tag_monitor
+
+        company = Weight_v3.objects.create(asgn_cd=LOADTEST_ASGN_CD, company=LOADTEST_COMPANY, weight=0)
+        uids = [f"51 4D {i // 256:02X} {i % 256:02X}" for i in range(options['kiosks'])]
+        User_v3.objects.bulk_create(
+            User_v3(uid=uid, name=f"kiosk{i}", asgn_cd=company, company=LOADTEST_COMPANY)
+            for i, uid in enumerate(uids)
+        )
+
+        rig = Rig(tag_monitor.get_tag_monitor().backend, scale.get_scale_reader())
+        rng = random.Random(options['seed'])
+        kiosks = [Kiosk(uid, rig, options['think'], random.Random(rng.random())) for uid in uids]
+
+        errors = []
+
+        def worker(kiosk):
+            try:
+                kiosk.run(options['sessions'])
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()  # 스레드별 DB 연결 정리
+
+        threads = [threading.Thread(target=worker, args=(kiosk,)) for kiosk in kiosks]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        if errors:
+            raise CommandError(f"부하 테스트 중 오류 {len(errors)}건: {errors[0]!r}")
+
+        self.report(kiosks, elapsed)
+        completed = sum(k.sessions for k in kiosks)
+        received = len(broker.wait_for(completed, timeout=10))
+        poured = round(sum(k.poured for k in kiosks), 2)
+        company.refresh_from_db()
+        accumulated = float(company.weight)
+        self.stdout.write(f"MQTT 브로커 수신 메시지 {received}건 (완료 세션 {completed}건)")
+        self.stdout.write(f"누적량 {accumulated:.2f}kg (부은 양 {poured:.2f}kg)")
+
+        failures = []
+        if received != completed:
+            failures.append(f"브로커 수신 메시지 {received}건 != 완료 세션 {completed}건")
+        if abs(accumulated - poured) > 0.01 * max(1, completed):  # 세션마다 반올림 오차 0.01kg까지 허용
+            failures.append(f"누적량 {accumulated:.2f}kg != 부은 양 {poured:.2f}kg")
+        if failures:
+            raise CommandError("부하 테스트 실패: " + ", ".join(failures))
+
+    def report(self, kiosks, elapsed):
+        self.stdout.write(f"{'엔드포인트':<22}{'요청':>7}{'오류':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'최대':>9}  (ms)")
+        total = 0
+        for name in ENDPOINTS:
+            timings = sorted(t for k in kiosks for t in k.timings[name])
+            errors = sum(k.errors[name] for k in kiosks)
+            total += len(timings)
+            if not timings:
+                continue
+            p50, p95, p99 = (percentile(timings, p) * 1000 for p in (50, 95, 99))
+            self.stdout.write(
+                f"{name:<24}{len(timings):>7}{errors:>6}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}{timings[-1] * 1000:>9.1f}"
+            )
+        completed = sum(k.sessions for k in kiosks)
+        self.stdout.write(
+            f"\n키오스크 {len(kiosks)}대, {elapsed:.1f}초: 완료 세션 {completed}건 ({completed / elapsed:.2f}/s), "
+            f"요청 {total}건 ({total / elapsed:.1f}/s)"
+        )
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from rfid.outbox import read_stats
+
+
+class Command(BaseCommand):
+    help = "MQTT 아웃박스의 미전송 이벤트 수와 가장 오래된 미전송 이벤트 경과 시간을 보여줍니다."
+
+    def handle(self, *args, **options):
+        # get_outbox()는 발행기와 드레이너를 띄우므로 쓰지 않고 저널만 읽는다
+        stats = read_stats(settings.MQTT_OUTBOX_PATH)
+        age = stats['oldest_age']
+        self.stdout.write(f"미전송 이벤트: {stats['depth']}건")
+        self.stdout.write(f"가장 오래된 미전송 이벤트: {f'{age:.0f}초 전' if age is not None else '없음'}")
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from rfid import background, hardware, lock_timer
+from rfid.hwd import DeviceBackend, HardwareServer
+
+
+class Command(BaseCommand):
+    help = "잠금장치/RFID 리더/저울을 전담하는 하드웨어 데몬을 실행합니다(웹 워커는 HARDWARE_MODE = 'daemon')."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default=str(settings.HARDWARE_SOCKET), help="유닉스 소켓 경로")
+        parser.add_argument(
+            '--backend', choices=['device', 'mock'], default='device',
+            help="device: 실제 장치 / mock: 가상 장치(rfid/sim/hardware.py)",
+        )
+        parser.add_argument('--mock-weight', type=float, default=0.0, help="mock 백엔드가 돌려줄 무게(kg)")
+
+    def handle(self, *args, **options):
+        # 장치와 자동 잠금 타이머는 이 프로세스가 맡는다(웹 워커는 요청만 보냄)
+        hardware.claim_devices()
+        if options['backend'] == 'mock':
+            from rfid.sim.hardware import MockBackend
+            backend = MockBackend(weight=options['mock_weight'], max_events=settings.RFID_EVENT_BUFFER)
+        else:
+            backend = DeviceBackend()
+
+        try:
+            server = HardwareServer(
+                options['socket'], backend, keepalive=settings.TAG_STREAM_KEEPALIVE, timer=lock_timer.get_lock_timer(),
+            )
+        except RuntimeError as e:
+            backend.close()
+            raise CommandError(str(e))
+
+        background.start_device_tasks()
+        self.stdout.write(f"하드웨어 데몬 시작: {options['socket']} ({options['backend']})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            backend.close()
@@ -0,0 +1,145 @@
+# rfid/metrics.py
+# 구간별 소요 시간(히스토그램)과 오류 카운터를 프로세스 메모리에 모아 /metrics(Prometheus 텍스트)로 내보낸다.
+#
+#   @metrics.timed('get_weight')          # 함수 전체
+#   with metrics.timed('weight_save'):    # 일부 구간
+#       ...
+#   metrics.inc('rasp_publish_failures_total')
+#
+# 기록 한 번은 perf_counter 2회 + 버킷 bisect + 잠금 1회 정도이며 비용은 bench_metrics로 확인한다.
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+STAGE_METRIC = 'rasp_stage_duration_seconds'
+
+COUNTERS = {
+    'rasp_reader_errors_total': "RFID 리더 UID 읽기 오류",
+    'rasp_scale_failures_total': "저울 무게 읽기 실패(484/404 경로), reason별",
+    'rasp_publish_failures_total': "MQTT 발행 실패(아웃박스 기록 실패 또는 브로커 전송 실패)",
+}
+
+
+class Histogram:
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+_lock = threading.Lock()
+_stages = {}  # stage -> Histogram
+_counters = {}  # (이름, ((라벨, 값), ...)) -> 값
+_collectors = []  # 스크랩 시점에 값을 읽어오는 함수 목록
+
+
+def _stage(stage):
+    with _lock:
+        histogram = _stages.get(stage)
+        if histogram is None:
+            histogram = _stages[stage] = Histogram()
+        return histogram
+
+
+def observe(stage, seconds):
+    histogram = _stages.get(stage) or _stage(stage)
+    with _lock:
+        histogram.observe(seconds)
+
+
+def inc(name, amount=1, **labels):
+    key = (name, tuple(sorted(labels.items())) if labels else ())
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def register_collector(func):
+    """func() -> [(이름, 'gauge'|'counter', 설명, [({라벨}, 값), ...]), ...] 스크랩할 때마다 호출"""
+    _collectors.append(func)
+    return func
+
+
+class timed:
+    """데코레이터/컨텍스트 매니저 겸용 구간 타이머(예외가 나도 기록)"""
+
+    __slots__ = ('stage', '_started')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self._started)
+        return False
+
+    def __call__(self, func):
+        stage = self.stage
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(stage, time.perf_counter() - started)
+        return wrapper
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def render():
+    """Prometheus 텍스트 형식(0.0.4)"""
+    with _lock:
+        stages = {stage: (list(h.counts), h.sum, h.count) for stage, h in _stages.items()}
+        counters = dict(_counters)
+
+    lines = [
+        f"# HELP {STAGE_METRIC} 처리 구간별 소요 시간",
+        f"# TYPE {STAGE_METRIC} histogram",
+    ]
+    for stage in sorted(stages):
+        counts, total, count = stages[stage]
+        cumulative = 0
+        for bound, n in zip(BUCKETS + ('+Inf',), counts):
+            cumulative += n
+            lines.append(f'{STAGE_METRIC}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{STAGE_METRIC}_sum{{stage="{stage}"}} {total:.6f}')
+        lines.append(f'{STAGE_METRIC}_count{{stage="{stage}"}} {count}')
+
+    for name, help_text in COUNTERS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        samples = [(labels, value) for (n, labels), value in counters.items() if n == name]
+        for labels, value in sorted(samples) or [((), 0)]:
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    for collect in _collectors:
+        for name, kind, help_text, samples in collect():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(sorted(labels.items()))} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-17 13:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rfid', '0008_alter_weight_v3_asgn_cd'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user_v3',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.2 on 2026-10-17 03:45
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rfid', '0009_user_v3_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DisposalEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uid', models.CharField(max_length=255)),
+                ('asgn_cd', models.IntegerField()),
+                ('weight_before', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('weight_after', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('delta', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('publish_status', models.CharField(choices=[('pending', 'pending'), ('sent', 'sent')], default='pending', max_length=10)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['asgn_cd', 'created_at'], name='disposal_asgn_time_idx'), models.Index(fields=['created_at'], name='disposal_time_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DisposalRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('D', 'day'), ('M', 'month')], max_length=1)),
+                ('period_start', models.DateField()),
+                ('asgn_cd', models.IntegerField()),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('event_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('period', 'period_start', 'asgn_cd'), name='disposal_rollup_unique')],
+            },
+        ),
+    ]
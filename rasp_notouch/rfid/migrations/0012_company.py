@@ -0,0 +1,56 @@
+# Generated by Django 5.1.2 on 2026-10-17 05:10
+
+from django.db import migrations, models
+
+# 기존 user_management.get_asgn_cd 매핑표
+COMPANIES = [
+    (0, "환경보건부", "환경보건부"),
+    (8414, "금양기업", "선행도장부"),
+    (8419, "은성기업", "선행도장부"),
+    (8463, "태양인더스트리", "선행도장부"),
+    (8417, "한솔선박", "선행도장부"),
+    (8466, "미주이엔지", "도장부"),
+    (8460, "부림기업", "도장부"),
+    (8458, "세왕기업", "도장부"),
+    (8468, "안진테크", "도장부"),
+    (8469, "찬승", "도장부"),
+    (8459, "일영기업", "도장부"),
+    (8467, "해강이엔지", "도장부"),
+    (8462, "번영이엔지", "기장부"),
+    (8645, "석영", "기장부"),
+]
+
+
+def seed_companies(apps, schema_editor):
+    Company = apps.get_model('rfid', 'Company')
+    Company.objects.bulk_create(
+        Company(asgn_cd=asgn_cd, name=name, department=department) for asgn_cd, name, department in COMPANIES
+    )
+
+
+def unseed_companies(apps, schema_editor):
+    Company = apps.get_model('rfid', 'Company')
+    Company.objects.filter(asgn_cd__in=[asgn_cd for asgn_cd, _, _ in COMPANIES]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rfid', '0011_activesession'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Company',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asgn_cd', models.IntegerField(unique=True)),
+                ('name', models.CharField(max_length=25, unique=True)),
+                ('department', models.CharField(blank=True, max_length=25)),
+            ],
+            options={
+                'ordering': ['asgn_cd'],
+            },
+        ),
+        migrations.RunPython(seed_companies, unseed_companies),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.forms import ValidationError
+from django.utils import timezone
 
 # Create your models here.
 
@@ -18,6 +19,23 @@ class Weight_v3(models.Model):
             raise ValidationError("Weight must be a positive value.")
 
 
+# 협력사 회사코드 등록부 - 회사명 <-> asgn_cd(4자리). 새 협력사는 배포 없이 행 추가로 등록
+class Company(models.Model):
+    asgn_cd = models.IntegerField(unique=True)  # 환경보건부처럼 0으로 시작하는 코드는 code로 4자리 표시
+    name = models.CharField(max_length=25, unique=True)
+    department = models.CharField(max_length=25, blank=True)  # 선행도장부/도장부/기장부 등
+
+    class Meta:
+        ordering = ['asgn_cd']
+
+    @property
+    def code(self):
+        return f"{self.asgn_cd:04d}"
+
+    def __str__(self):
+        return f"{self.code} {self.name}"
+
+
 # User_v3 모델
 class User_v3(models.Model):
     uid = models.CharField(max_length=255, primary_key=True)  # UID
@@ -25,6 +43,62 @@ class User_v3(models.Model):
     asgn_cd = models.ForeignKey(Weight_v3, on_delete=models.CASCADE)  # 1:N 관계
     depart = models.CharField(max_length=25, default="Unknown")
     company = models.CharField(max_length=25, default="Unknown")
+    updated_at = models.DateTimeField(auto_now=True)  # 사용자 캐시(rfid/user_cache.py) 버전 확인용
     
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+# 폐기 이벤트 원장(append-only) - 폐기 1건당 1행, 누적량 갱신과 같은 트랜잭션에서 기록
+class DisposalEvent(models.Model):
+    PUBLISH_PENDING = 'pending'  # 아웃박스에 기록됨(미전송)
+    PUBLISH_SENT = 'sent'        # 브로커 전달 완료
+    PUBLISH_CHOICES = [(PUBLISH_PENDING, 'pending'), (PUBLISH_SENT, 'sent')]
+
+    uid = models.CharField(max_length=255)  # 사용자 삭제 후에도 이력 유지(FK 아님)
+    asgn_cd = models.IntegerField()
+    weight_before = models.DecimalField(max_digits=10, decimal_places=2)  # 회사 누적량(갱신 전)
+    weight_after = models.DecimalField(max_digits=10, decimal_places=2)   # 회사 누적량(갱신 후)
+    delta = models.DecimalField(max_digits=10, decimal_places=2)          # 측정된 폐기량
+    created_at = models.DateTimeField(default=timezone.now)
+    publish_status = models.CharField(max_length=10, choices=PUBLISH_CHOICES, default=PUBLISH_PENDING)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['asgn_cd', 'created_at'], name='disposal_asgn_time_idx'),
+            models.Index(fields=['created_at'], name='disposal_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.asgn_cd} {self.uid}: {self.delta}kg ({self.created_at})"
+
+
+# 일/월 단위 회사별 폐기량 집계 - 이벤트 기록 시 증분 갱신
+class DisposalRollup(models.Model):
+    PERIOD_DAY = 'D'
+    PERIOD_MONTH = 'M'
+    PERIOD_CHOICES = [(PERIOD_DAY, 'day'), (PERIOD_MONTH, 'month')]
+
+    period = models.CharField(max_length=1, choices=PERIOD_CHOICES)
+    period_start = models.DateField()  # 일: 해당 날짜, 월: 해당 월 1일
+    asgn_cd = models.IntegerField()
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    event_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'period_start', 'asgn_cd'], name='disposal_rollup_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.period} {self.period_start} {self.asgn_cd}: {self.total}kg"
+
+
+# 문이 열려 있는 폐기 세션 - 자동 잠금 시각(deadline) 인덱스로 만료분만 조회
+class ActiveSession(models.Model):
+    session_key = models.CharField(max_length=40, primary_key=True)
+    uid = models.CharField(max_length=255)
+    started_at = models.DateTimeField(default=timezone.now)
+    deadline = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.uid} ~{self.deadline}"
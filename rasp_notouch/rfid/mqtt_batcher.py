@@ -0,0 +1,54 @@
+# rfid/mqtt_batcher.py
+# 폐기 이벤트를 일정 시간(또는 N건) 모아 하나의 MQTT 메시지로 발행한다.
+# 이벤트는 메모리에 모으지 않고 하나씩 바로 아웃박스 저널에 묶음 대상(coalesce=1)으로 기록하고,
+# 아웃박스 드레이너가 보낼 때 창 단위로 합친다(프로세스가 죽어도 창 안의 이벤트가 사라지지 않음).
+# 같은 asgn_cd의 이벤트는 폐기량(delta)을 합치고 마지막 누적량(total)만 남긴다.
+import json
+from datetime import datetime, timezone
+
+
+def encode_event(asgn_cd, company, delta, total=None):
+    """저널에 기록할 이벤트 1건(묶음 대상 행의 payload)"""
+    return json.dumps({
+        "asgn_cd": asgn_cd, "company": company, "delta": delta,
+        "total": float(total) if total is not None else None,
+    }, ensure_ascii=False, separators=(",", ":"))
+
+
+def _isoformat(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+class DisposalCoalescer:
+    """아웃박스 드레이너가 연속된 묶음 대상 행을 한 메시지로 합칠 때 쓴다"""
+
+    def __init__(self, window=5, max_events=20, source="rp165"):
+        self.window = window
+        self.max_events = max_events
+        self.source = source
+
+    def closes_at(self, first_created_at):
+        """창의 첫 이벤트 기록 시각 -> 창이 닫히는 시각(epoch 초)"""
+        return first_created_at + self.window
+
+    def build(self, events):
+        """events: [(기록 시각, payload)] -> 메시지. 같은 행들로 다시 만들면 같은 메시지(재전송 시에도 동일)"""
+        entries = {}
+        for _, payload in events:
+            event = json.loads(payload)
+            entry = entries.get(event["asgn_cd"])
+            if entry is None:
+                entry = entries[event["asgn_cd"]] = {
+                    "asgn_cd": event["asgn_cd"], "company": event["company"], "delta": 0.0, "total": None, "count": 0,
+                }
+            entry["delta"] = round(entry["delta"] + event["delta"], 2)
+            entry["count"] += 1
+            if event["total"] is not None:
+                entry["total"] = event["total"]
+        return json.dumps({
+            "source": self.source,
+            "window_start": _isoformat(events[0][0]),
+            "window_end": _isoformat(events[-1][0]),  # 창의 마지막 이벤트 시각
+            "events": len(events),
+            "companies": list(entries.values()),
+        }, ensure_ascii=False, separators=(",", ":"))
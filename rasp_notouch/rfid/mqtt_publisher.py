@@ -0,0 +1,106 @@
+# rfid/mqtt_publisher.py
+# 프로세스 전체에서 하나의 MQTT 연결을 유지하는 발행기.
+# 발행할 때마다 connect/disconnect 하던 방식 대신 loop_start()로 연결을 유지한다.
+# 뷰는 아웃박스 저널(rfid/outbox.py)에 기록만 하고, 아웃박스 드레이너가 publish_batch()로 보낸다.
+import logging
+import threading
+
+import paho.mqtt.client as mqtt
+from django.conf import settings
+
+logger = logging.getLogger('rasp')
+
+
+class MqttPublisher:
+    """연결을 유지하며 메시지를 발행한다. 끊기면 백오프로 재연결."""
+
+    def __init__(self, host, port=1883, client_id="rp165", keepalive=60,
+                 min_delay=1, max_delay=60):
+        self.host = host
+        self.port = port
+        self.keepalive = keepalive
+
+        self._client = mqtt.Client(client_id=client_id)
+        self._client.reconnect_delay_set(min_delay=min_delay, max_delay=max_delay)
+        self._client.on_connect = self._on_connect
+        self._client.on_disconnect = self._on_disconnect
+
+        self._connected = threading.Event()
+
+    def start(self):
+        # connect_async + loop_start: 브로커가 꺼져 있어도 바로 반환하고
+        # 네트워크 스레드가 reconnect_delay_set 설정에 따라 재연결을 시도한다.
+        self._client.connect_async(self.host, self.port, self.keepalive)
+        self._client.loop_start()
+        return self
+
+    def stop(self):
+        self._connected.clear()  # 직접 끊는 것이므로 연결 끊김 경고를 남기지 않는다
+        self._client.disconnect()
+        self._client.loop_stop()
+
+    @property
+    def connected(self):
+        return self._connected.is_set()
+
+    def _on_connect(self, client, userdata, flags, rc, *args):
+        if rc == 0:
+            logger.info(f"MQTT 브로커 연결: {self.host}:{self.port}")
+            self._connected.set()
+        else:
+            logger.error(f"MQTT 브로커 연결 실패: rc={rc}")
+
+    def _on_disconnect(self, client, userdata, *args):
+        if self._connected.is_set():
+            logger.warning("MQTT 브로커 연결 끊김, 재연결 대기")
+        self._connected.clear()
+
+    def publish(self, topic, payload, qos=1, retain=False, timeout=10):
+        """연결될 때까지 기다렸다가 발행하고 전송 완료(QoS 1이면 PUBACK)까지 대기한다. 성공 여부 반환"""
+        if not self._connected.wait(timeout):
+            return False
+        info = self._client.publish(topic, payload, qos=qos, retain=retain)
+        if info.rc != mqtt.MQTT_ERR_SUCCESS:
+            return False
+        try:
+            info.wait_for_publish(timeout)
+        except (ValueError, RuntimeError):
+            return False
+        return info.is_published()
+
+    def publish_batch(self, messages, qos=1, timeout=10):
+        """
+        (topic, payload) 목록을 한꺼번에 보낸 뒤 각각의 전송 완료를 기다린다.
+        앞에서부터 연속으로 성공한 개수를 반환한다(순서 유지를 위해 첫 실패 이후는 실패로 본다).
+        """
+        if not self._connected.wait(timeout):
+            return 0
+        infos = [self._client.publish(topic, payload, qos=qos) for topic, payload in messages]
+        delivered = 0
+        for info in infos:
+            if info.rc != mqtt.MQTT_ERR_SUCCESS:
+                break
+            try:
+                info.wait_for_publish(timeout)
+            except (ValueError, RuntimeError):
+                break
+            if not info.is_published():
+                break
+            delivered += 1
+        return delivered
+
+
+_publisher = None
+_publisher_lock = threading.Lock()
+
+
+def get_publisher():
+    global _publisher
+    with _publisher_lock:
+        if _publisher is None:
+            _publisher = MqttPublisher(
+                host=settings.MQTT_HOST,
+                port=settings.MQTT_PORT,
+                client_id=settings.MQTT_CLIENT_ID,
+            ).start()
+    return _publisher
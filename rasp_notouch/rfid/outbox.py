@@ -0,0 +1,280 @@
+# rfid/outbox.py
+# MQTT 폐기 이벤트 저장 후 전달(store-and-forward) 아웃박스.
+# 발행 전에 로컬 SQLite(WAL, synchronous=FULL) 저널에 먼저 기록하고,
+# 백그라운드 드레이너가 브로커 연결이 살아 있을 때 QoS 1로 묶어서 보낸다.
+# 브로커가 꺼져 있어도 이벤트는 저널에 남아 있다가 복구 후 순서대로 재전송된다.
+# 드레이너는 장치를 맡은 프로세스(hardware.owns_devices())에서만 돈다.
+# HARDWARE_MODE = 'daemon'이면 웹 워커는 저널에 기록만 하고 하드웨어 데몬을 깨워(wake_outbox) 전송을 맡긴다.
+# 묶음 대상 행(coalesce=1, MQTT_PUBLISH_MODE = 'batch')은 드레이너가 보낼 때 창 단위로 한 메시지로 합친다.
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from rfid import hardware, metrics, mqtt_batcher, mqtt_publisher
+
+logger = logging.getLogger('rasp')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    delivered_at REAL,
+    event_ids TEXT,
+    coalesce INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (id) WHERE delivered_at IS NULL;
+"""
+
+
+class Outbox:
+    """append-only 저널 + 드레이너 스레드(publisher가 없으면 기록만 하고 notify로 드레이너 쪽을 깨운다)"""
+
+    def __init__(self, path, publisher, batch_size=50, poll_interval=5, retention_days=7, on_delivered=None,
+                 notify=None, coalescer=None):
+        self.path = str(path)
+        self.publisher = publisher
+        self.coalescer = coalescer  # 묶음 대상 행을 합치는 mqtt_batcher.DisposalCoalescer
+        self.on_delivered = on_delivered  # 전송 완료된 이벤트의 event_ids 목록을 받는 콜백
+        self.notify = notify  # 다른 프로세스의 드레이너를 깨우는 콜백
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retention = retention_days * 24 * 3600
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")  # 커밋마다 fsync
+        self._conn.executescript(SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(outbox)")}
+        if 'event_ids' not in columns:  # 이전 버전 저널
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN event_ids TEXT")
+        if 'coalesce' not in columns:
+            self._conn.execute("ALTER TABLE outbox ADD COLUMN coalesce INTEGER NOT NULL DEFAULT 0")
+        self._db_lock = threading.Lock()
+        self._window_closes_at = None  # 열려 있는 묶음 창이 닫히는 시각(드레이너가 그때 깨어남)
+
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._drainer = threading.Thread(target=self._drain_loop, name='mqtt-outbox', daemon=True)
+
+    def start(self):
+        if self.publisher is not None:
+            self._drainer.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._drainer.is_alive():
+            self._drainer.join(timeout)
+
+    def wake(self):
+        """드레이너를 바로 깨운다(다른 프로세스가 저널에 기록했을 때)"""
+        self._wakeup.set()
+
+    def append(self, topic, payload, event_ids=None, coalesce=False):
+        """이벤트를 저널에 기록(fsync)하고 드레이너를 깨운다. 저널 id 반환. coalesce=True면 창 단위로 합쳐 보냄"""
+        with self._db_lock:
+            cur = self._conn.execute(
+                "INSERT INTO outbox (topic, payload, created_at, event_ids, coalesce) VALUES (?, ?, ?, ?, ?)",
+                (topic, payload, time.time(), json.dumps(event_ids) if event_ids else None, int(coalesce)),
+            )
+            event_id = cur.lastrowid
+        self._wakeup.set()
+        if self.notify is not None:
+            try:
+                self.notify()
+            except Exception as e:  # 깨우지 못해도 드레이너가 poll_interval마다 확인한다
+                logger.debug(f"아웃박스 드레이너 깨우기 실패: {e}")
+        return event_id
+
+    def pending(self, limit):
+        with self._db_lock:
+            return self._conn.execute(
+                "SELECT id, topic, payload, event_ids, created_at, coalesce FROM outbox "
+                "WHERE delivered_at IS NULL ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def stats(self):
+        """미전송 이벤트 수와 가장 오래된 미전송 이벤트의 경과 시간(초)"""
+        with self._db_lock:
+            return _query_stats(self._conn)
+
+    def _mark(self, delivered_ids, failed_ids):
+        now = time.time()
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "UPDATE outbox SET delivered_at = ?, attempts = attempts + 1 WHERE id = ?",
+                [(now, i) for i in delivered_ids],
+            )
+            self._conn.executemany(
+                "UPDATE outbox SET attempts = attempts + 1 WHERE id = ?",
+                [(i,) for i in failed_ids],
+            )
+            self._conn.execute("COMMIT")
+
+    def purge(self):
+        """보존 기간이 지난 전송 완료 이벤트 정리"""
+        with self._db_lock:
+            self._conn.execute(
+                "DELETE FROM outbox WHERE delivered_at IS NOT NULL AND delivered_at < ?",
+                (time.time() - self.retention,),
+            )
+
+    def _messages(self, rows):
+        """
+        행 -> [(topic, payload, 행 목록)]. 연속된 묶음 대상 행은 같은 topic끼리 최대 max_events개씩 한 메시지로 합친다.
+        마지막 창이 아직 열려 있으면(시간도 건수도 차지 않음) 그 행들은 남겨 두고 닫히는 시각을 기록한다.
+        """
+        messages = []
+        self._window_closes_at = None
+        i = 0
+        while i < len(rows):
+            topic, payload, created_at, coalesce = rows[i][1], rows[i][2], rows[i][4], rows[i][5]
+            if not coalesce or self.coalescer is None:
+                messages.append((topic, payload, rows[i:i + 1]))
+                i += 1
+                continue
+            j = i + 1
+            while (j < len(rows) and j - i < self.coalescer.max_events
+                   and rows[j][5] and rows[j][1] == topic):
+                j += 1
+            closes_at = self.coalescer.closes_at(created_at)
+            if j == len(rows) and j - i < self.coalescer.max_events and time.time() < closes_at:
+                self._window_closes_at = closes_at
+                break
+            window = rows[i:j]
+            messages.append((topic, self.coalescer.build([(row[4], row[2]) for row in window]), window))
+            i = j
+        return messages
+
+    def drain_once(self):
+        """미전송 이벤트를 한 묶음 보낸다. 보낸 행 수 반환(연결이 없으면 0)"""
+        if not self.publisher.connected:
+            return 0
+        rows = self.pending(self.batch_size)
+        if not rows:
+            return 0
+        messages = self._messages(rows)
+        if not messages:
+            return 0
+        delivered = self.publisher.publish_batch([(topic, payload) for topic, payload, _ in messages], qos=1)
+        sent_rows = [row for _, _, window in messages[:delivered] for row in window]
+        failed_rows = [row for _, _, window in messages[delivered:delivered + 1] for row in window]
+        self._mark([row[0] for row in sent_rows], [row[0] for row in failed_rows])
+        event_ids = []
+        for _, payload, _ in messages[:delivered]:
+            logger.info("MQTT 메시지 발행 완료: %s", payload)
+        for row in sent_rows:
+            if row[3]:
+                event_ids.extend(json.loads(row[3]))
+        if event_ids and self.on_delivered is not None:
+            try:
+                self.on_delivered(event_ids)
+            except Exception as e:
+                logger.error(f"발행 상태 갱신 중 오류: {e}")
+        if delivered < len(messages):
+            metrics.inc('rasp_publish_failures_total', reason='broker')
+            logger.warning(f"MQTT 아웃박스 전송 중단: {len(messages) - delivered}건 재시도 대기")
+        return len(sent_rows)
+
+    def _drain_loop(self):
+        last_purge = 0
+        while not self._stop_event.is_set():
+            self._wakeup.clear()
+            try:
+                # 한 묶음이 꽉 찼으면 쉬지 않고 다음 묶음을 보낸다
+                if self.drain_once() >= self.batch_size:
+                    continue
+                if time.time() - last_purge > 3600:
+                    self.purge()
+                    last_purge = time.time()
+            except Exception as e:
+                logger.error(f"MQTT 아웃박스 처리 중 오류: {e}")
+            wait = self.poll_interval
+            if self._window_closes_at is not None:  # 열린 묶음 창은 닫히는 시각에 바로 보낸다
+                wait = max(0, min(wait, self._window_closes_at - time.time()))
+            self._wakeup.wait(wait)
+
+
+def _query_stats(conn):
+    depth, oldest = conn.execute(
+        "SELECT COUNT(*), MIN(created_at) FROM outbox WHERE delivered_at IS NULL"
+    ).fetchone()
+    return {
+        'depth': depth,
+        'oldest_age': time.time() - oldest if oldest is not None else None,
+    }
+
+
+def read_stats(path):
+    """
+    저널 파일을 읽기 전용으로 열어 stats()와 같은 값을 돌려준다.
+    발행기/드레이너를 띄우지 않으므로 실행 중인 키오스크와 MQTT 세션이나 저널을 다투지 않는다(outbox_status 명령).
+    """
+    if not os.path.exists(path):
+        return {'depth': 0, 'oldest_age': None}
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return _query_stats(conn)
+    finally:
+        conn.close()
+
+
+def _wake_daemon():
+    from rfid.hwd import get_client
+    get_client().call('wake_outbox')
+
+
+def _mark_published(event_ids):
+    # 드레이너 스레드에서 Django DB 사용 - 끊긴 연결 정리 후 원장 발행 상태 갱신
+    from rfid import ledger
+    close_old_connections()
+    ledger.mark_published(event_ids)
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+@metrics.register_collector
+def _collect_metrics():
+    if _outbox is None:
+        return []
+    stats = _outbox.stats()
+    return [
+        ('rasp_outbox_depth', 'gauge', "MQTT 아웃박스 미전송 이벤트 수", [({}, stats['depth'])]),
+        ('rasp_outbox_oldest_age_seconds', 'gauge', "가장 오래된 미전송 이벤트 경과 시간", [({}, stats['oldest_age'] or 0)]),
+    ]
+
+
+def get_outbox():
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            drains = hardware.owns_devices()
+            _outbox = Outbox(
+                path=settings.MQTT_OUTBOX_PATH,
+                publisher=mqtt_publisher.get_publisher() if drains else None,
+                notify=None if drains else _wake_daemon,
+                batch_size=settings.MQTT_OUTBOX_BATCH_SIZE,
+                poll_interval=settings.MQTT_OUTBOX_POLL_INTERVAL,
+                retention_days=settings.MQTT_OUTBOX_RETENTION_DAYS,
+                on_delivered=_mark_published,
+                coalescer=mqtt_batcher.DisposalCoalescer(
+                    window=settings.MQTT_BATCH_WINDOW,
+                    max_events=settings.MQTT_BATCH_MAX_EVENTS,
+                    source=settings.MQTT_CLIENT_ID,
+                ),
+            ).start()
+    return _outbox
@@ -0,0 +1,186 @@
+# rfid/scale.py
+# 저울 시리얼 포트를 프로세스 안에서 하나의 스레드가 전담해서 읽는다.
+# 요청마다 포트를 열고 닫던 방식(1~3초 대기) 대신 최근 측정값을 링 버퍼에 보관하고
+# 뷰에서는 스냅샷만 가져간다.
+import logging
+import threading
+import time
+
+import numpy as np
+import serial
+from django.conf import settings
+
+from rfid import metrics
+from rfid.scale_parser import OVERLOAD, UNSTABLE, parse_frame
+
+logger = logging.getLogger('rasp')
+
+
+class ScaleReader(threading.Thread):
+    """저울 포트를 소유하고 측정값을 계속 읽어 링 버퍼에 쌓는 백그라운드 스레드"""
+
+    def __init__(self, port, baudrate=9600, timeout=1, buffer_size=32, reconnect_delay=2.0):
+        super().__init__(name='scale-reader', daemon=True)
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.reconnect_delay = reconnect_delay
+
+        # 고정 크기 링 버퍼(측정 시각/무게/저울 안정 플래그). _head는 다음에 쓸 위치
+        self._times = np.zeros(buffer_size, dtype=np.float64)
+        self._values = np.zeros(buffer_size, dtype=np.float64)
+        self._settled = np.zeros(buffer_size, dtype=bool)
+        self._head = 0
+        self._count = 0
+        self._cond = threading.Condition()
+        self._stop_event = threading.Event()
+
+        self.connected = False
+        self.last_error = None
+        self.frame_errors = 0
+        self.overload = False
+
+    def _open(self):
+        return serial.Serial(
+            port=self.port,
+            baudrate=self.baudrate,
+            bytesize=serial.EIGHTBITS,
+            parity=serial.PARITY_NONE,
+            stopbits=serial.STOPBITS_ONE,
+            timeout=self.timeout,
+            rtscts=False,
+            xonxoff=False,
+        )
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                with self._open() as ser:
+                    self.connected = True
+                    self.last_error = None
+                    logger.info("저울과 통신 시작")
+                    self._read_loop(ser)
+            except serial.SerialException as e:
+                self.last_error = str(e)
+                logger.error(f"시리얼 통신 오류: {e}")
+            finally:
+                if self.connected:
+                    logger.info("직렬 포트를 닫았습니다.")
+                self.connected = False
+            # 포트가 끊기면 잠시 쉬었다가 재연결
+            self._stop_event.wait(self.reconnect_delay)
+
+    def _read_loop(self, ser):
+        while not self._stop_event.is_set():
+            raw = ser.readline()
+            if not raw:
+                continue  # 타임아웃: 저울이 아무것도 보내지 않음
+            frame = parse_frame(raw)
+            if frame is None:
+                self.frame_errors += 1
+                continue
+            self.overload = frame.status == OVERLOAD
+            if self.overload:
+                continue
+            with self._cond:
+                self._times[self._head] = time.monotonic()
+                self._values[self._head] = frame.weight
+                self._settled[self._head] = frame.status != UNSTABLE
+                self._head = (self._head + 1) % len(self._values)
+                self._count = min(self._count + 1, len(self._values))
+                self._cond.notify_all()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _snapshot(self, max_age=None):
+        """버퍼 복사본(무게, 저울 안정 플래그). 오래된 것 -> 최신 순, max_age(초)보다 오래된 값은 제외"""
+        with self._cond:
+            idx = (np.arange(self._head - self._count, self._head)) % len(self._values)
+            times = self._times[idx]
+            values = self._values[idx]
+            settled = self._settled[idx]
+        if max_age is not None:
+            fresh = times >= time.monotonic() - max_age
+            values, settled = values[fresh], settled[fresh]
+        return values, settled
+
+    def readings(self, max_age=None):
+        """버퍼에 쌓인 측정값 목록(오래된 것 -> 최신). max_age(초)보다 오래된 값은 제외"""
+        return self._snapshot(max_age)[0].tolist()
+
+    def current_weight(self, max_age=None):
+        """가장 최근 측정값. 없으면 None"""
+        values, _ = self._snapshot(max_age)
+        return float(values[-1]) if len(values) else None
+
+    def stable_weight(self, window, tolerance, max_wait, max_age=None, outlier_k=3.5):
+        """
+        최근 window개의 측정값이 안정될 때까지 기다렸다가 (무게, 안정여부)를 반환한다.
+        저울이 불안정(US) 플래그를 보낸 값이 창 안에 있으면 안정으로 보지 않는다.
+        이미 안정된 상태면 바로 반환하고, max_wait초 안에 안정되지 않으면
+        그때까지의 값으로 계산한 결과를 안정여부 False로 반환한다. 측정값이 없으면 None.
+        """
+        deadline = time.monotonic() + max_wait
+        result = None
+        with self._cond:
+            while True:
+                values, settled = self._snapshot(max_age)
+                values, settled = values[-window:], settled[-window:]
+                if len(values):
+                    weight, stable = evaluate_window(values, tolerance, outlier_k)
+                    result = (weight, stable and bool(settled.all()))
+                    if len(values) >= window and result[1]:
+                        return result
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return result
+                self._cond.wait(remaining)
+
+
+def evaluate_window(values, tolerance, outlier_k=3.5):
+    """
+    median/MAD 기반 안정 판정.
+    중앙값에서 outlier_k * MAD(정규화) 이상 벗어난 값은 튀는 값으로 보고 버리고,
+    버린 값이 창의 1/4(최소 1개) 이하이면서 남은 값들의 폭이 tolerance(kg) 이내이면 안정으로 본다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    median = np.median(values)
+    deviation = np.abs(values - median)
+    mad = 1.4826 * np.median(deviation)
+    inliers = values[deviation <= max(outlier_k * mad, tolerance)]
+    stable = (
+        len(values) - len(inliers) <= max(1, len(values) // 4)
+        and np.ptp(inliers) <= tolerance
+    )
+    return float(np.median(inliers)), bool(stable)
+
+
+_reader = None
+_reader_lock = threading.Lock()
+
+
+@metrics.register_collector
+def _collect_metrics():
+    if _reader is None:
+        return []
+    return [
+        ('rasp_scale_frame_errors_total', 'counter', "파싱하지 못한 저울 프레임 수", [({}, _reader.frame_errors)]),
+        ('rasp_scale_connected', 'gauge', "저울 포트 연결 상태", [({}, int(_reader.connected))]),
+    ]
+
+
+def get_scale_reader():
+    global _reader
+    with _reader_lock:
+        if _reader is None or not _reader.is_alive():
+            from rfid.hardware import get_backend
+            _reader = get_backend('scale', settings.SCALE_BACKEND)(
+                port=settings.SCALE_PORT,
+                baudrate=settings.SCALE_BAUDRATE,
+                timeout=settings.SCALE_TIMEOUT,
+                buffer_size=settings.SCALE_BUFFER_SIZE,
+                reconnect_delay=settings.SCALE_RECONNECT_DELAY,
+            )
+            _reader.start()
+    return _reader
@@ -0,0 +1,55 @@
+# rfid/scale_parser.py
+# 저울 프레임 파서. 시리얼에서 읽은 bytes/memoryview를 그대로 받아
+# 미리 컴파일한 바이트 정규식 한 번으로 상태 플래그와 무게를 뽑는다.
+# (decode -> 제어문자 제거 -> 정규식 -> replace -> float 순서의 문자열 할당을 없앰)
+#
+# 프레임 예: b"ST,GS,+  12.30kg\r\n"  /  b"US,NT,-   0.40kg\r\n"  /  b"OL,GS,+   OL  kg\r\n"
+# 상태 머리말이 없는 프레임(b" 12.30 kg")도 기존과 같이 무게만 읽는다.
+import re
+from collections import namedtuple
+
+STABLE = "ST"
+UNSTABLE = "US"
+OVERLOAD = "OL"
+UNKNOWN = "??"
+
+Frame = namedtuple("Frame", ["status", "weight"])
+
+FRAME_PATTERN = re.compile(
+    rb"(?:(?P<status>ST|US|OL)\s*,\s*[A-Z]{2}\s*,)?"  # 상태, 구분(GS:총중량/NT:순중량)
+    rb"\s*(?P<sign>[+-])?\s*"
+    rb"(?:(?P<value>\d+\.\d{1,2})|OL)\s*kg"
+)
+
+# 제어 문자(0x00~0x1F, 0x7F 이상) - 프레임 중간에 끼어든 경우에만 제거
+CONTROL_BYTES = bytes(range(0x20)) + bytes(range(0x7F, 0x100))
+_CONTROL_SET = frozenset(CONTROL_BYTES)
+
+_STATUS = {b"ST": STABLE, b"US": UNSTABLE, b"OL": OVERLOAD}
+
+
+def parse_frame(raw):
+    """저울 프레임(bytes/memoryview) -> Frame(status, weight). 인식 불가 시 None.
+
+    과부하 프레임은 weight가 None이다.
+    """
+    match = FRAME_PATTERN.search(raw)
+    if match is None or (
+        match.group("status") is None and match.start() and raw[match.start() - 1] in _CONTROL_SET
+    ):
+        # 노이즈가 프레임 중간에 끼어든 경우에만 정리 후 한 번 더 시도
+        cleaned = bytes(raw).translate(None, CONTROL_BYTES)
+        if len(cleaned) == len(raw):
+            return None
+        match = FRAME_PATTERN.search(cleaned)
+        if match is None:
+            return None
+
+    status = _STATUS.get(match.group("status"), UNKNOWN)
+    value = match.group("value")
+    if value is None:
+        return Frame(OVERLOAD, None)
+    weight = float(value)
+    if match.group("sign") == b"-":
+        weight = -weight
+    return Frame(status, weight)
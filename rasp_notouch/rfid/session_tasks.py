@@ -1,34 +1,65 @@
 import logging
 from datetime import timedelta
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
 from django.utils import timezone
 from django.contrib.sessions.models import Session
 from rfid.hardware import get_lock
+from rfid.lock_timer import get_lock_timer
+from rfid.models import ActiveSession
 
 logger = logging.getLogger('rasp')
 
+
+# 문이 열린 폐기 세션 등록/해제 (views_v2.disposal / result 에서 호출)
+def register_session(request, uid):
+    if not request.session.session_key:
+        request.session.create()
+    deadline = timezone.now() + timedelta(seconds=settings.DISPOSAL_TIMEOUT)
+    ActiveSession.objects.update_or_create(
+        session_key=request.session.session_key,
+        defaults={'uid': uid, 'started_at': timezone.now(), 'deadline': deadline},
+    )
+    # 마감 시각에 정확히 문을 잠그도록 타이머 등록(행은 재시작 복원용)
+    get_lock_timer().arm(request.session.session_key, deadline)
+    return deadline
+
+
+def release_session(request):
+    if request.session.session_key:
+        get_lock_timer().cancel(request.session.session_key)
+        ActiveSession.objects.filter(session_key=request.session.session_key).delete()
+
+
+def expire_session(session_key):
+    """마감 시각이 지난 세션의 문을 잠그고 세션 값을 정리(lock_timer 스레드에서 호출)"""
+    active = ActiveSession.objects.filter(session_key=session_key, deadline__lte=timezone.now()).first()
+    # 그 사이 result로 해제되었거나 다시 등록된 세션은 건너뜀
+    if active is None:
+        return False
+    try:
+        # 30분 초과 → 문 닫기 & 세션 정리
+        lock = get_lock()
+        lock.off()
+
+        store = SessionStore(session_key=session_key)
+        if store.exists(session_key):
+            store.pop('uid', None)
+            store.pop('cur_weight', None)
+            store.save()
+
+        logger.warning(f"[자동정리] UID={active.uid} 30분 경과 → 문 닫음 & 세션 초기화")
+    except Exception as e:
+        logger.error(f"세션 처리 중 오류: {e}")
+    ActiveSession.objects.filter(pk=active.pk, deadline=active.deadline).delete()
+    return True
+
+
 def check_timeout_sessions():
+    # 자동 잠금은 lock_timer가 담당. 여기서는 타이머가 놓친 세션(다른 프로세스에서 등록 등)만 정리
     now = timezone.now()
-    expired_time = now - timedelta(minutes=30)
-
-    for session in Session.objects.all():
-        data = session.get_decoded()
-        uid = data.get('uid')
-        start_time = data.get('start_time')
-
-        if uid and start_time:
-            try:
-                start_dt = timezone.datetime.fromisoformat(start_time)
-                if start_dt < expired_time:
-                    # 30분 초과 → 문 닫기 & 세션 정리
-                    lock = get_lock()
-                    lock.on()
-
-                    data.pop('uid', None)
-                    data.pop('cur_weight', None)
-                    data.pop('start_time', None)
-                    session.session_data = Session.objects.encode(data)
-                    session.save()
-
-                    logger.warning(f"[자동정리] UID={uid} 30분 경과 → 문 닫음 & 세션 초기화")
-            except Exception as e:
-                logger.error(f"세션 처리 중 오류: {e}")
+    for session_key in ActiveSession.objects.filter(deadline__lte=now).values_list('session_key', flat=True):
+        expire_session(session_key)
+
+    # 만료된 Django 세션 일괄 삭제(expire_date 인덱스)
+    Session.objects.filter(expire_date__lt=now).delete()
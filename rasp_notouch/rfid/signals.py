@@ -0,0 +1,24 @@
+# rfid/signals.py
+# 모델 변경 시 프로세스 캐시 무효화 (RfidConfig.ready()에서 import)
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .company_registry import get_company_registry
+from .models import Company, User_v3
+from .user_cache import get_user_cache
+
+
+@receiver(post_save, sender=User_v3)
+@receiver(post_delete, sender=User_v3)
+def invalidate_user(sender, instance, **kwargs):
+    get_user_cache().invalidate(instance.uid)
+
+
+# Weight_v3 삭제 시 연관 User_v3도 CASCADE로 삭제되면서 위 post_delete가 불린다.
+# 사용자 캐시는 누적량(Weight_v3.weight)을 담지 않으므로 Weight_v3 저장에는 반응하지 않는다.
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+def invalidate_companies(sender, instance, **kwargs):
+    get_company_registry().invalidate()
@@ -0,0 +1 @@
+# 하드웨어 없이 개발/테스트하기 위한 가상 장치 모음
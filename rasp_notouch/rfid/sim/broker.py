@@ -0,0 +1,202 @@
+# rfid/sim/broker.py
+# 프로세스 안에서 띄우는 최소 MQTT 3.1.1 브로커(개발/테스트용).
+# CONNECT/PUBLISH(QoS 0,1,2)/SUBSCRIBE/PINGREQ/DISCONNECT만 처리하고,
+# 받은 메시지는 messages 목록에 쌓아 발행 결과를 확인할 수 있게 한다.
+#
+#   broker = FakeBroker().start()
+#   settings.MQTT_HOST, settings.MQTT_PORT = broker.host, broker.port
+#   ...
+#   broker.wait_for(1)   # 메시지 1개 수신 대기
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+CONNECT, CONNACK, PUBLISH, PUBACK, PUBREC, PUBREL, PUBCOMP = 1, 2, 3, 4, 5, 6, 7
+SUBSCRIBE, SUBACK, PINGREQ, PINGRESP, DISCONNECT = 8, 9, 12, 13, 14
+
+
+def topic_matches(pattern, topic):
+    """MQTT 와일드카드(+, #) 매칭"""
+    p_parts = pattern.split('/')
+    t_parts = topic.split('/')
+    for i, p in enumerate(p_parts):
+        if p == '#':
+            return True
+        if i >= len(t_parts) or (p != '+' and p != t_parts[i]):
+            return False
+    return len(p_parts) == len(t_parts)
+
+
+def _encode_length(n):
+    out = bytearray()
+    while True:
+        byte, n = n % 128, n // 128
+        out.append(byte | (0x80 if n else 0))
+        if not n:
+            return bytes(out)
+
+
+def _packet(ptype, body=b"", flags=0):
+    return bytes([(ptype << 4) | flags]) + _encode_length(len(body)) + body
+
+
+class _Handler(socketserver.BaseRequestHandler):
+
+    def _recv_exact(self, n):
+        buf = b""
+        while len(buf) < n:
+            chunk = self.request.recv(n - len(buf))
+            if not chunk:
+                raise ConnectionError
+            buf += chunk
+        return buf
+
+    def _read_packet(self):
+        header = self._recv_exact(1)[0]
+        length, mult = 0, 1
+        while True:
+            byte = self._recv_exact(1)[0]
+            length += (byte & 0x7F) * mult
+            mult *= 128
+            if not byte & 0x80:
+                break
+        return header >> 4, header & 0x0F, self._recv_exact(length) if length else b""
+
+    def send(self, data):
+        with self.send_lock:
+            self.request.sendall(data)
+
+    def handle(self):
+        broker = self.server.broker
+        self.send_lock = threading.Lock()
+        self.subscriptions = []
+        broker._add_session(self)
+        try:
+            while True:
+                ptype, flags, body = self._read_packet()
+                if ptype == CONNECT:
+                    self.send(_packet(CONNACK, b"\x00\x00"))
+                elif ptype == PUBLISH:
+                    self._handle_publish(flags, body)
+                elif ptype == PUBREL:
+                    self.send(_packet(PUBCOMP, body[:2]))
+                elif ptype == SUBSCRIBE:
+                    self._handle_subscribe(body)
+                elif ptype == PINGREQ:
+                    self.send(_packet(PINGRESP))
+                elif ptype == DISCONNECT:
+                    break
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            broker._remove_session(self)
+
+    def _handle_publish(self, flags, body):
+        qos = (flags >> 1) & 0x03
+        (tlen,) = struct.unpack("!H", body[:2])
+        topic = body[2:2 + tlen].decode("utf-8")
+        pos = 2 + tlen
+        packet_id = None
+        if qos:
+            packet_id = body[pos:pos + 2]
+            pos += 2
+        payload = body[pos:]
+        self.server.broker._deliver(topic, payload, qos)
+        if qos == 1:
+            self.send(_packet(PUBACK, packet_id))
+        elif qos == 2:
+            self.send(_packet(PUBREC, packet_id))
+
+    def _handle_subscribe(self, body):
+        packet_id, pos, granted = body[:2], 2, bytearray()
+        while pos < len(body):
+            (tlen,) = struct.unpack("!H", body[pos:pos + 2])
+            self.subscriptions.append(body[pos + 2:pos + 2 + tlen].decode("utf-8"))
+            pos += 2 + tlen + 1
+            granted.append(0)  # 구독자에게는 QoS 0으로만 전달
+        self.send(_packet(SUBACK, packet_id + bytes(granted)))
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FakeBroker:
+    """테스트용 인프로세스 MQTT 브로커. port=0이면 빈 포트를 자동으로 사용"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.messages = []  # (topic, payload bytes, qos)
+        self._cond = threading.Condition()
+        self._sessions = set()
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.broker = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-broker', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """브로커 종료(장애 상황 재현용). start()로 같은 포트에서 다시 띄울 수 있다."""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self.drop_connections()
+        self._server = None
+
+    def drop_connections(self):
+        """접속 중인 클라이언트 연결을 모두 끊는다."""
+        with self._cond:
+            sessions = list(self._sessions)
+        for session in sessions:
+            try:
+                session.request.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _add_session(self, session):
+        with self._cond:
+            self._sessions.add(session)
+
+    def _remove_session(self, session):
+        with self._cond:
+            self._sessions.discard(session)
+
+    def _deliver(self, topic, payload, qos):
+        with self._cond:
+            self.messages.append((topic, payload, qos))
+            sessions = [s for s in self._sessions
+                        if any(topic_matches(p, topic) for p in s.subscriptions)]
+            self._cond.notify_all()
+        body = struct.pack("!H", len(topic.encode("utf-8"))) + topic.encode("utf-8") + payload
+        for session in sessions:
+            try:
+                session.send(_packet(PUBLISH, body))
+            except OSError:
+                pass
+
+    def wait_for(self, count, timeout=5):
+        """메시지가 count개 이상 쌓일 때까지 대기. 받은 메시지 목록 반환"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while len(self.messages) < count:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return list(self.messages)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,30 @@
+# rfid/sim/gpio.py
+# 가상 잠금장치(LOCK_BACKEND = 'sim'). gpiozero.DigitalOutputDevice처럼 on()=열림, off()=잠김.
+import threading
+import time
+
+
+class FakeLock:
+
+    def __init__(self):
+        self.value = 0
+        self.history = []  # (시각, 'on' | 'off')
+        self._lock = threading.Lock()
+
+    def _set(self, value):
+        with self._lock:
+            self.value = value
+            self.history.append((time.time(), 'on' if value else 'off'))
+
+    def on(self):
+        self._set(1)
+
+    def off(self):
+        self._set(0)
+
+    @property
+    def is_active(self):
+        return bool(self.value)
+
+    def close(self):
+        pass
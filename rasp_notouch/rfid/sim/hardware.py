@@ -0,0 +1,50 @@
+# rfid/sim/hardware.py
+# 하드웨어 데몬용 가상 백엔드(manage.py run_hwd --backend mock).
+# 잠금 상태는 메모리에만 두고, 무게는 set_weight()로 정하며, 태그는 FakeReader로 만든다.
+#
+#   backend = MockBackend(weight=1.5)
+#   server = HardwareServer(path, backend)
+#   backend.reader.present("DF 79 1A 82")
+import threading
+
+from rfid.exceptions import CustomException
+from rfid.sim.reader import FakeReader
+from rfid.tag_monitor import TagMonitor
+
+
+class MockBackend:
+
+    def __init__(self, weight=0.0, max_events=32):
+        self.locked = True
+        self.weight = weight
+        self.error = None  # (메시지, 상태 코드) - read_weight가 이 오류를 낸다
+        self.calls = []  # 받은 요청 기록
+        self.reader = FakeReader()
+        self.tags = TagMonitor(self.reader, max_events=max_events).start()
+        self._lock = threading.Lock()
+
+    def _record(self, op):
+        with self._lock:
+            self.calls.append(op)
+
+    def unlock(self):
+        self._record('unlock')
+        self.locked = False
+
+    def lock(self):
+        self._record('lock')
+        self.locked = True
+
+    def set_weight(self, weight, error=None):
+        self.weight = weight
+        self.error = error
+
+    def read_weight(self):
+        self._record('read_weight')
+        if self.error is not None:
+            message, status_code = self.error
+            raise CustomException(message, status_code=status_code)
+        return self.weight
+
+    def close(self):
+        self.tags.stop()
@@ -0,0 +1,46 @@
+# rfid/sim/reader.py
+# 가상 RFID 리더 백엔드(RFID_BACKEND = 'sim').
+# present(uid)로 카드를 올려놓은 것처럼 이벤트를 만들고, script()로 순서를 미리 짜 둘 수 있다.
+#
+#   reader = get_tag_monitor().backend
+#   reader.present("DF 79 1A 82")
+import threading
+
+
+class FakeReader:
+
+    def __init__(self):
+        self._on_tag = None
+        self._on_remove = None
+        self._thread = None
+        self._stop_event = threading.Event()
+
+    def start(self, on_tag, on_remove):
+        self._on_tag = on_tag
+        self._on_remove = on_remove
+
+    def stop(self):
+        self._stop_event.set()
+
+    def present(self, uid):
+        """카드 태깅"""
+        self._on_tag(uid)
+
+    def remove(self):
+        """카드 제거"""
+        self._on_remove()
+
+    def script(self, steps):
+        """[(지연 초, uid 또는 None), ...] 순서대로 태깅/제거를 재생한다(None은 제거)."""
+        def run():
+            for delay, uid in steps:
+                if self._stop_event.wait(delay):
+                    return
+                if uid is None:
+                    self.remove()
+                else:
+                    self.present(uid)
+
+        self._thread = threading.Thread(target=run, name='fake-reader', daemon=True)
+        self._thread.start()
+        return self._thread
@@ -0,0 +1,96 @@
+# rfid/sim/scale.py
+# pty 기반 가상 저울. 실제 저울처럼 일정 주기로 무게 프레임을 흘려보낸다.
+#
+#   fake = FakeScale(weight=12.3)
+#   fake.start()
+#   settings.SCALE_PORT = fake.port   # ScaleReader가 이 경로를 연다
+import os
+import threading
+import tty
+
+from django.conf import settings
+
+from rfid.scale import ScaleReader
+
+
+def make_frame(weight, status="ST"):
+    """저울 한 줄 프레임(bytes). 예: b'ST,GS,+  12.30kg\\r\\n'"""
+    sign = "-" if weight < 0 else "+"
+    return f"{status},GS,{sign}{abs(weight):7.2f}kg\r\n".encode("ascii")
+
+
+class FakeScale:
+    """가상 저울(pty). port 속성의 경로를 시리얼 포트처럼 열 수 있다."""
+
+    def __init__(self, weight=0.0, interval=0.1, status="ST"):
+        self.weight = weight
+        self.interval = interval
+        self.status = status  # ST: 안정, US: 불안정, OL: 과부하
+
+        self.master_fd, self.slave_fd = os.openpty()
+        tty.setraw(self.slave_fd)  # 에코/개행 변환 없이 바이트 그대로 전달
+        self.port = os.ttyname(self.slave_fd)
+
+        self._pending = []  # 다음 주기에 끼워 넣을 임의 바이트(깨진 프레임 등)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def frame(self):
+        return make_frame(self.weight, self.status)
+
+    def set_weight(self, weight, status="ST"):
+        with self._lock:
+            self.weight = weight
+            self.status = status
+
+    def inject(self, raw):
+        """깨진 프레임/노이즈 등 임의 바이트를 다음 주기에 흘려보낸다."""
+        with self._lock:
+            self._pending.append(raw)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='fake-scale', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            with self._lock:
+                chunks = self._pending + [self.frame()]
+                self._pending = []
+            for chunk in chunks:
+                try:
+                    os.write(self.master_fd, chunk)
+                except OSError:
+                    return
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        for fd in (self.master_fd, self.slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class SimScaleReader(ScaleReader):
+    """SCALE_BACKEND = 'sim' - FakeScale을 띄우고 그 pty를 읽는다(port 인자는 무시). fake.set_weight()로 무게 변경"""
+
+    def __init__(self, port=None, **kwargs):
+        fake = FakeScale(weight=settings.SCALE_SIM_WEIGHT).start()
+        super().__init__(port=fake.port, **kwargs)
+        self.fake = fake
+
+    def stop(self):
+        super().stop()
+        self.fake.stop()
@@ -0,0 +1,155 @@
+# rfid/tag_monitor.py
+# RFID 리더를 전담하는 백그라운드 모니터.
+# 요청마다 readers()/connect()를 반복하며 1초씩 쉬던 폴링 대신,
+# 카드 삽입 이벤트(PC/SC CardMonitor)를 받아 UID와 시각을 메모리 큐에 쌓는다.
+# 뷰에서는 큐에서 이벤트를 꺼내기만 하므로 바로 응답한다.
+import logging
+import threading
+import time
+from collections import deque, namedtuple
+
+from django.conf import settings
+
+from rfid import hardware, metrics
+
+logger = logging.getLogger('rasp')
+
+TagEvent = namedtuple('TagEvent', ['seq', 'uid', 'timestamp'])
+
+GET_UID_COMMAND = [0xFF, 0xCA, 0x00, 0x00, 0x00]
+
+
+class PcscBackend:
+    """PC/SC 리더 백엔드. 카드 삽입/제거를 CardMonitor(SCardGetStatusChange)로 감시한다."""
+
+    def __init__(self):
+        self._monitor = None
+        self._observer = None
+
+    def start(self, on_tag, on_remove):
+        from smartcard.CardMonitoring import CardMonitor, CardObserver
+        from smartcard.util import toHexString
+
+        class _Observer(CardObserver):
+            def update(self, observable, actions):
+                added, removed = actions
+                for card in added:
+                    try:
+                        connection = card.createConnection()
+                        connection.connect()
+                        data, sw1, sw2 = connection.transmit(GET_UID_COMMAND)
+                        connection.disconnect()
+                    except Exception as e:
+                        metrics.inc('rasp_reader_errors_total')
+                        logger.warning(f"카드 UID 읽기 오류: {e}")
+                        continue
+                    if sw1 == 0x90 and sw2 == 0x00:
+                        on_tag(toHexString(data))
+                    else:
+                        metrics.inc('rasp_reader_errors_total')
+                        logger.warning(f"UID 읽기 실패: SW1={sw1}, SW2={sw2}")
+                if removed:
+                    on_remove()
+
+        self._observer = _Observer()
+        self._monitor = CardMonitor()
+        self._monitor.addObserver(self._observer)
+
+    def stop(self):
+        if self._monitor is not None:
+            self._monitor.deleteObserver(self._observer)
+
+
+class TagMonitor:
+    """
+    태그 이벤트 큐. 백엔드가 publish()로 이벤트를 넣고 뷰가 pop_event()로 꺼낸다.
+    백엔드에 claim(seq)가 있으면(IpcTagBackend) 처리 표시를 그쪽에도 맡겨,
+    여러 워커 프로세스 중 한 곳에서만 같은 태그를 꺼내도록 한다.
+    """
+
+    def __init__(self, backend, max_events=32):
+        self.backend = backend
+        self.present_uid = None  # 현재 리더 위에 올라와 있는 카드
+
+        self._events = deque(maxlen=max_events)
+        self._cond = threading.Condition()
+        self._seq = 0
+        self._consumed = 0  # 이 seq까지는 이미 처리됨
+
+    def start(self):
+        self.backend.start(self.publish, self._on_remove)
+        logger.info(f"RFID 모니터 시작: {type(self.backend).__name__}")
+        return self
+
+    def stop(self):
+        self.backend.stop()
+
+    def publish(self, uid, seq=None, timestamp=None):
+        """seq/timestamp를 주면(데몬에서 받은 이벤트) 그대로 쓴다. seq는 늘어나기만 해야 한다"""
+        with self._cond:
+            self._seq = seq if seq is not None else self._seq + 1
+            self._events.append(TagEvent(self._seq, uid, timestamp or time.time()))
+            self.present_uid = uid
+            self._cond.notify_all()
+        logger.info(f"카드 UID: {uid}")
+
+    def _on_remove(self):
+        self.present_uid = None
+
+    @property
+    def last_seq(self):
+        return self._seq
+
+    def pop_event(self, max_age=None):
+        """아직 처리하지 않은 가장 최근 태그 이벤트를 꺼낸다(이전 이벤트도 함께 처리됨). 없으면 None"""
+        with self._cond:
+            if not self._events or self._events[-1].seq <= self._consumed:
+                return None
+            event = self._events[-1]
+            self._consumed = event.seq
+        if max_age is not None and time.time() - event.timestamp > max_age:
+            return None
+        claim = getattr(self.backend, 'claim', None)
+        if claim is not None and not claim(event.seq):
+            return None  # 다른 워커가 먼저 꺼냄
+        return event
+
+    def consume(self, seq):
+        """seq까지의 이벤트를 처리된 것으로 표시(SSE로 전달한 이벤트를 폴링에서 다시 꺼내지 않도록)"""
+        self.claim(seq)
+        claim = getattr(self.backend, 'claim', None)
+        if claim is not None:
+            claim(seq)
+
+    def claim(self, seq):
+        """seq까지를 처리된 것으로 표시하고, 이미 처리된 seq였으면 False(데몬의 claim_tag 요청)"""
+        with self._cond:
+            if seq <= self._consumed:
+                return False
+            self._consumed = seq
+            return True
+
+    def wait_event(self, after_seq, timeout):
+        """seq가 after_seq보다 큰 이벤트가 생길 때까지 최대 timeout초 기다린다(처리 표시는 하지 않음)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._seq <= after_seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            return self._events[-1]
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_tag_monitor():
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            name = 'ipc' if settings.HARDWARE_MODE == 'daemon' else settings.RFID_BACKEND
+            backend = hardware.get_backend('reader', name)()
+            _monitor = TagMonitor(backend, max_events=settings.RFID_EVENT_BUFFER).start()
+    return _monitor
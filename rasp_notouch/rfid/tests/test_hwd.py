@@ -0,0 +1,151 @@
+import json
+import socket
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from rfid.exceptions import CustomException
+from rfid.hwd import HardwareClient, HardwareServer
+from rfid.lock_timer import DeadlineScheduler
+from rfid.sim.hardware import MockBackend
+
+UID_A = "DF 79 1A 82"
+UID_B = "51 4D 00 01"
+
+
+class HardwareDaemonTests(SimpleTestCase):
+    """임시 유닉스 소켓에 HardwareServer(MockBackend)를 띄우고 HardwareClient로 요청을 주고받는다"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'hwd.sock'
+
+        self.expired = []
+        self.timer = DeadlineScheduler(on_expire=self.expired.append)
+        self.timer.start()
+        self.addCleanup(self.timer.stop)
+
+        self.backend = MockBackend(weight=1.5)
+        self.addCleanup(self.backend.close)
+        self.server = HardwareServer(self.path, self.backend, keepalive=0.2, timer=self.timer)
+        thread = threading.Thread(target=self.server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.client = HardwareClient(self.path, timeout=2, keepalive=0.2)
+
+    def test_unlock_and_lock(self):
+        self.client.unlock()
+        self.assertFalse(self.backend.locked)
+        self.client.lock()
+        self.assertTrue(self.backend.locked)
+        self.assertEqual(self.backend.calls, ['unlock', 'lock'])
+
+    def test_read_weight(self):
+        self.assertEqual(self.client.read_weight(), 1.5)
+        self.backend.set_weight(2.25)
+        self.assertEqual(self.client.read_weight(), 2.25)
+
+    def test_backend_error_keeps_status(self):
+        self.backend.set_weight(0, error=("저울 과부하 상태입니다.", 484))
+        with self.assertRaises(CustomException) as ctx:
+            self.client.read_weight()
+        self.assertEqual((ctx.exception.message, ctx.exception.status_code), ("저울 과부하 상태입니다.", 484))
+
+    def test_claim_tag(self):
+        self.backend.reader.present(UID_A)
+        self.assertTrue(self.client.claim_tag(1))
+        self.assertFalse(self.client.claim_tag(1))  # 다른 워커가 이미 꺼냄
+        with self.assertRaises(CustomException) as ctx:
+            self.client.call('claim_tag')
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_arm_and_cancel_timer(self):
+        self.client.arm_timer('keep', datetime.now(timezone.utc) + timedelta(seconds=60))
+        self.assertTrue(self.client.cancel_timer('keep'))
+        self.assertFalse(self.client.cancel_timer('keep'))
+
+        self.client.arm_timer('expire', datetime.now(timezone.utc) + timedelta(seconds=0.05))
+        deadline = time.monotonic() + 2
+        while not self.expired and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.expired, ['expire'])
+
+        with self.assertRaises(CustomException) as ctx:
+            self.client.call('arm_timer', key='missing-deadline')
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_timer_ops_without_timer(self):
+        self.server.timer = None
+        with self.assertRaises(CustomException) as ctx:
+            self.client.cancel_timer('any')
+        self.assertEqual(ctx.exception.status_code, 503)
+
+    def test_wake_outbox(self):
+        with mock.patch('rfid.outbox.get_outbox') as get_outbox:
+            self.assertIsNone(self.client.call('wake_outbox'))
+        get_outbox.return_value.wake.assert_called_once_with()
+
+    def test_subscribe_tags(self):
+        self.backend.reader.present(UID_A)
+        stream = self.client.subscribe_tags(0)
+        self.addCleanup(stream.close)
+        event = next(stream)
+        self.assertEqual((event.seq, event.uid), (1, UID_A))
+
+        # keepalive가 몇 번 지나간 뒤에 온 태그도 받는다
+        self.backend.reader.script([(0.5, UID_B)])
+        event = next(stream)
+        self.assertEqual((event.seq, event.uid), (2, UID_B))
+
+    def test_unknown_op_and_bad_json(self):
+        with self.assertRaises(CustomException) as ctx:
+            self.client.call('explode')
+        self.assertEqual(ctx.exception.status_code, 400)
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(2)
+            sock.connect(str(self.path))
+            sock.sendall(b"not json\n")
+            reply = json.loads(sock.makefile('rb').readline())
+        self.assertEqual((reply['ok'], reply['status']), (False, 400))
+
+    def test_second_daemon_refuses_socket(self):
+        with self.assertRaises(RuntimeError):
+            HardwareServer(self.path, MockBackend())
+
+
+class HardwareClientErrorTests(SimpleTestCase):
+
+    def test_missing_daemon(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            client = HardwareClient(Path(tmp) / 'missing.sock', timeout=1)
+            with self.assertRaises(CustomException) as ctx:
+                client.unlock()
+        self.assertEqual(ctx.exception.status_code, 503)
+
+    def test_daemon_closes_without_reply(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / 'mute.sock')
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+                server.bind(path)
+                server.listen(1)
+
+                def accept_and_close():
+                    conn, _ = server.accept()
+                    conn.recv(1024)
+                    conn.close()
+
+                thread = threading.Thread(target=accept_and_close, daemon=True)
+                thread.start()
+                with self.assertRaises(CustomException) as ctx:
+                    HardwareClient(path, timeout=2).read_weight()
+                thread.join(2)
+        self.assertEqual(ctx.exception.status_code, 503)
@@ -0,0 +1,124 @@
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from rfid.mqtt_batcher import DisposalCoalescer, encode_event
+from rfid.mqtt_publisher import MqttPublisher
+from rfid.outbox import Outbox
+from rfid.sim.broker import FakeBroker
+
+TOPIC = "test/disposal"
+
+
+def wait_until(predicate, timeout=5, interval=0.02):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
+
+
+class BrokerTestCase(SimpleTestCase):
+    """인프로세스 FakeBroker + 실제 MqttPublisher(paho) 연결"""
+
+    def setUp(self):
+        self.broker = FakeBroker().start()
+        self.addCleanup(self.broker.stop)
+        self.publisher = MqttPublisher(
+            self.broker.host, self.broker.port, client_id="rasp-test", min_delay=0.1, max_delay=0.5,
+        ).start()
+        self.addCleanup(self.publisher.stop)
+        self.assertTrue(wait_until(lambda: self.publisher.connected))
+
+    def take_broker_down(self):
+        with self.assertLogs('rasp', level='WARNING'):  # "MQTT 브로커 연결 끊김"
+            self.broker.stop()
+            self.assertTrue(wait_until(lambda: not self.publisher.connected))
+
+
+class MqttPublisherTests(BrokerTestCase):
+
+    def test_publish_is_acked_with_qos1(self):
+        self.assertTrue(self.publisher.publish(TOPIC, "hello", qos=1))
+        self.assertEqual(self.broker.wait_for(1), [(TOPIC, b"hello", 1)])
+
+    def test_publish_batch_keeps_order(self):
+        messages = [(TOPIC, f"m{i}") for i in range(5)]
+        self.assertEqual(self.publisher.publish_batch(messages, qos=1), 5)
+        received = self.broker.wait_for(5)
+        self.assertEqual([payload for _, payload, _ in received], [f"m{i}".encode() for i in range(5)])
+        self.assertEqual({qos for _, _, qos in received}, {1})
+
+    def test_publish_fails_while_broker_is_down(self):
+        self.take_broker_down()
+        self.assertFalse(self.publisher.publish(TOPIC, "lost", timeout=0.2))
+        self.assertEqual(self.publisher.publish_batch([(TOPIC, "lost")], timeout=0.2), 0)
+        self.assertEqual(self.broker.messages, [])
+
+
+class OutboxDrainTests(BrokerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        # start()하지 않으므로 드레이너 스레드 없이 drain_once()를 직접 부른다
+        self.delivered_ids = []
+        self.outbox = Outbox(
+            Path(tmp.name) / 'outbox.sqlite3', self.publisher, batch_size=10, on_delivered=self.delivered_ids.extend,
+        )
+        self.addCleanup(self.outbox.stop)
+
+    def test_drain_delivers_pending_rows(self):
+        for i in range(3):
+            self.outbox.append(TOPIC, f"event{i}", event_ids=[i + 1])
+        self.assertEqual(self.outbox.stats()['depth'], 3)
+
+        self.assertEqual(self.outbox.drain_once(), 3)
+        received = self.broker.wait_for(3)
+        self.assertEqual([payload for _, payload, _ in received], [b"event0", b"event1", b"event2"])
+        self.assertEqual({qos for _, _, qos in received}, {1})
+        self.assertEqual(self.outbox.stats(), {'depth': 0, 'oldest_age': None})
+        self.assertEqual(self.delivered_ids, [1, 2, 3])
+        self.assertEqual(self.outbox.drain_once(), 0)  # 이미 보낸 행은 다시 보내지 않는다
+
+    def test_rows_stay_pending_while_broker_is_down_and_are_redelivered(self):
+        self.outbox.append(TOPIC, "before")
+        self.assertEqual(self.outbox.drain_once(), 1)
+        self.broker.wait_for(1)
+
+        self.take_broker_down()
+        for i in range(3):
+            self.outbox.append(TOPIC, f"outage{i}")
+        self.assertEqual(self.outbox.drain_once(), 0)
+        self.assertEqual(self.outbox.stats()['depth'], 3)
+
+        self.broker.start()  # 같은 포트로 복구, 발행기는 백오프로 재연결
+        self.assertTrue(wait_until(lambda: self.publisher.connected))
+        self.assertEqual(self.outbox.drain_once(), 3)
+        received = self.broker.wait_for(4)
+        self.assertEqual(
+            [payload for _, payload, _ in received], [b"before", b"outage0", b"outage1", b"outage2"],
+        )
+        self.assertEqual(self.outbox.stats()['depth'], 0)
+
+    def test_batch_rows_are_coalesced_per_window(self):
+        self.outbox.coalescer = DisposalCoalescer(window=60, max_events=3, source="rasp-test")
+        for n, delta in enumerate((1.5, 2.0, 0.25, 4.0), start=1):
+            self.outbox.append(TOPIC, encode_event("0001", "테스트", delta, 100), event_ids=[n], coalesce=True)
+
+        # 3건이 찬 창만 한 메시지로 보내고, 아직 열려 있는 네 번째 창은 저널에 남긴다
+        self.assertEqual(self.outbox.drain_once(), 3)
+        (_, payload, _), = self.broker.wait_for(1)
+        message = json.loads(payload)
+        self.assertEqual(message["events"], 3)
+        self.assertEqual(message["companies"], [
+            {"asgn_cd": "0001", "company": "테스트", "delta": 3.75, "total": 100.0, "count": 3},
+        ])
+        self.assertEqual(self.delivered_ids, [1, 2, 3])
+        self.assertEqual(self.outbox.stats()['depth'], 1)
+        self.assertEqual(self.outbox.drain_once(), 0)
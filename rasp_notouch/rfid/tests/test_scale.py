@@ -0,0 +1,87 @@
+import os
+import time
+
+from django.test import SimpleTestCase
+
+from rfid.scale import ScaleReader
+from rfid.sim.scale import FakeScale
+
+
+def wait_until(predicate, timeout=5, interval=0.02):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
+
+
+class ScaleReaderTests(SimpleTestCase):
+    """가상 저울(pty)을 실제 ScaleReader 스레드로 읽는다"""
+
+    def setUp(self):
+        self.fake = FakeScale(weight=12.3, interval=0.02).start()
+        self.reader = ScaleReader(self.fake.port, timeout=0.2, reconnect_delay=0.1)
+        self.reader.start()
+        self.addCleanup(self.stop_reader_then, self.fake)
+
+    def stop_reader_then(self, fake):
+        """리더 스레드를 멈추고 기다린 뒤 가상 저울을 닫는다(반대 순서면 리더가 끊김 오류를 남긴다)"""
+        self.reader.stop()
+        self.reader.join(1)
+        fake.stop()
+
+    def test_stable_weight_returns_fake_weight(self):
+        self.assertEqual(self.reader.stable_weight(window=5, tolerance=0.01, max_wait=3), (12.3, True))
+        self.assertTrue(self.reader.connected)
+        self.assertEqual(self.reader.current_weight(), 12.3)
+
+    def test_weight_change_is_picked_up(self):
+        self.reader.stable_weight(window=5, tolerance=0.01, max_wait=3)
+        self.fake.set_weight(14.05)
+        self.assertTrue(wait_until(
+            lambda: self.reader.stable_weight(window=5, tolerance=0.01, max_wait=0.5) == (14.05, True)
+        ))
+
+    def test_unstable_flag_is_not_stable(self):
+        self.fake.set_weight(3.0, status="US")
+        self.assertTrue(wait_until(lambda: self.reader.readings()[-5:] == [3.0] * 5))
+        self.assertEqual(self.reader.stable_weight(window=5, tolerance=0.01, max_wait=0.2), (3.0, False))
+
+    def test_garbage_counts_frame_errors(self):
+        self.assertTrue(wait_until(lambda: self.reader.current_weight() is not None))
+        before = self.reader.frame_errors
+        self.fake.inject(b"\x00\xffST,GS,+ 12.3\r\n")
+        self.fake.inject(b"noise\r\n")
+        self.assertTrue(wait_until(lambda: self.reader.frame_errors >= before + 2))
+        # 깨진 프레임 뒤에도 정상 프레임은 계속 읽는다
+        self.assertEqual(self.reader.stable_weight(window=5, tolerance=0.01, max_wait=3), (12.3, True))
+
+    def test_overload_is_flagged_and_not_buffered(self):
+        self.assertTrue(wait_until(lambda: self.reader.current_weight() is not None))
+        self.fake.set_weight(999.99, status="OL")
+        self.assertTrue(wait_until(lambda: self.reader.overload))
+        self.assertNotIn(999.99, self.reader.readings())
+
+    def test_reconnects_after_port_loss(self):
+        self.assertTrue(wait_until(lambda: self.reader.connected))
+        with self.assertLogs('rasp', level='ERROR') as logs:
+            # 저울 쪽(pty master)이 사라지면 readline이 SerialException을 낸다
+            self.fake._stop_event.set()
+            os.close(self.fake.master_fd)
+            self.assertTrue(wait_until(lambda: not self.reader.connected))
+            self.assertIsNotNone(self.reader.last_error)
+
+            # 포트를 다시 열 수 없는 동안에도 스레드는 죽지 않고 reconnect_delay마다 재시도한다
+            time.sleep(self.reader.reconnect_delay * 3)
+            self.assertTrue(self.reader.is_alive())
+            self.assertFalse(self.reader.connected)
+
+            replacement = FakeScale(weight=7.5, interval=0.02).start()
+            self.addCleanup(self.stop_reader_then, replacement)
+            self.reader.port = replacement.port
+            self.assertTrue(wait_until(lambda: self.reader.connected))
+            self.assertTrue(wait_until(
+                lambda: self.reader.stable_weight(window=5, tolerance=0.01, max_wait=0.5) == (7.5, True)
+            ))
+        self.assertGreaterEqual(sum("시리얼 통신 오류" in line for line in logs.output), 2)
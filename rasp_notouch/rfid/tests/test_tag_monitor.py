@@ -0,0 +1,108 @@
+import time
+
+from django.test import SimpleTestCase
+
+from rfid.sim.reader import FakeReader
+from rfid.tag_monitor import TagMonitor
+
+UID_A = "DF 79 1A 82"
+UID_B = "51 4D 00 01"
+
+
+class ClaimingReader(FakeReader):
+    """claim(seq)이 있는 백엔드(IpcTagBackend처럼 다른 워커와 처리 표시를 나눠 가짐)"""
+
+    def __init__(self):
+        super().__init__()
+        self.claimed = []
+        self.taken_elsewhere = set()
+
+    def claim(self, seq):
+        self.claimed.append(seq)
+        return seq not in self.taken_elsewhere
+
+
+class TagMonitorTests(SimpleTestCase):
+
+    def setUp(self):
+        self.reader = FakeReader()
+        self.monitor = TagMonitor(self.reader, max_events=4).start()
+        self.addCleanup(self.monitor.stop)
+
+    def play(self, steps):
+        self.reader.script(steps).join(5)
+
+    def test_pop_event_returns_latest_and_consumes_earlier(self):
+        self.play([(0, UID_A), (0, None), (0.01, UID_B)])
+        event = self.monitor.pop_event()
+        self.assertEqual((event.seq, event.uid), (2, UID_B))
+        self.assertIsNone(self.monitor.pop_event())  # A도 함께 처리됨
+
+    def test_consume_marks_events_without_popping(self):
+        self.play([(0, UID_A)])
+        self.monitor.consume(self.monitor.last_seq)  # SSE로 이미 전달
+        self.assertIsNone(self.monitor.pop_event())
+        self.play([(0, None), (0, UID_B)])
+        self.assertEqual(self.monitor.pop_event().uid, UID_B)
+
+    def test_claim_only_moves_forward(self):
+        self.play([(0, UID_A), (0, None), (0, UID_B)])
+        self.assertTrue(self.monitor.claim(1))
+        self.assertFalse(self.monitor.claim(1))  # 다른 워커가 먼저 표시
+        self.assertTrue(self.monitor.claim(2))
+        self.assertFalse(self.monitor.claim(1))
+        self.assertIsNone(self.monitor.pop_event())
+
+    def test_pop_event_skips_stale_events(self):
+        self.play([(0, UID_A)])
+        time.sleep(0.05)
+        self.assertIsNone(self.monitor.pop_event(max_age=0.01))
+        self.assertIsNone(self.monitor.pop_event())  # 오래된 이벤트도 처리된 것으로 본다
+
+    def test_wait_event_times_out(self):
+        started = time.monotonic()
+        self.assertIsNone(self.monitor.wait_event(self.monitor.last_seq, timeout=0.1))
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+
+    def test_wait_event_wakes_on_tag(self):
+        self.reader.script([(0.05, UID_A)])
+        event = self.monitor.wait_event(0, timeout=5)
+        self.assertEqual((event.seq, event.uid), (1, UID_A))
+        self.assertEqual(self.monitor.pop_event(), event)  # wait_event는 처리 표시를 하지 않는다
+
+    def test_card_left_on_reader_is_one_event(self):
+        self.play([(0, UID_A)])
+        self.assertEqual(self.monitor.present_uid, UID_A)
+        self.assertEqual(self.monitor.pop_event().uid, UID_A)
+
+        # 카드를 올려 둔 채로는 새 이벤트가 생기지 않는다
+        self.assertIsNone(self.monitor.wait_event(1, timeout=0.1))
+        self.assertIsNone(self.monitor.pop_event())
+        self.assertEqual(self.monitor.last_seq, 1)
+
+        self.play([(0, None)])
+        self.assertIsNone(self.monitor.present_uid)
+        self.play([(0, UID_A)])  # 떼었다 다시 태깅하면 새 이벤트
+        self.assertEqual(self.monitor.pop_event().seq, 2)
+
+
+class TagMonitorBackendClaimTests(SimpleTestCase):
+
+    def setUp(self):
+        self.reader = ClaimingReader()
+        self.monitor = TagMonitor(self.reader).start()
+        self.addCleanup(self.monitor.stop)
+
+    def test_pop_event_asks_backend(self):
+        self.reader.present(UID_A)
+        self.reader.taken_elsewhere.add(1)
+        self.assertIsNone(self.monitor.pop_event())  # 다른 워커가 먼저 꺼냄
+        self.reader.present(UID_B)
+        self.assertEqual(self.monitor.pop_event().uid, UID_B)
+        self.assertEqual(self.reader.claimed, [1, 2])
+
+    def test_consume_is_forwarded(self):
+        self.reader.present(UID_A)
+        self.monitor.consume(1)
+        self.assertEqual(self.reader.claimed, [1])
+        self.assertIsNone(self.monitor.pop_event())
@@ -0,0 +1,73 @@
+import random
+import threading
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.db.models import Sum
+from django.test import TransactionTestCase
+
+from rfid.models import Company, DisposalEvent, DisposalRollup, Weight_v3
+from rfid.weight import update_weight
+
+ASGN_CD = 8414
+COMPANY = "금양기업"
+
+
+class UpdateWeightConcurrencyTests(TransactionTestCase):
+    """여러 키오스크가 같은 회사에 동시에 폐기해도 누적량이 정확히 맞는지(update_weight 경로)"""
+
+    workers = 8
+    iterations = 25
+
+    @classmethod
+    def setUpClass(cls):
+        # 스레드마다 DB 연결을 따로 쓰므로 메모리 SQLite 테스트 DB에서는 돌릴 수 없다
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise unittest.SkipTest("메모리 SQLite 테스트 DB는 연결을 여러 개 열 수 없습니다.")
+        super().setUpClass()
+
+    def setUp(self):
+        # 첫 TransactionTestCase에는 0012 마이그레이션의 회사 목록이 남아 있다
+        Company.objects.get_or_create(name=COMPANY, defaults={'asgn_cd': ASGN_CD})
+        Weight_v3.objects.create(asgn_cd=ASGN_CD, company=COMPANY, weight=0)
+
+    def test_parallel_disposals_sum_exactly(self):
+        rng = random.Random(0)
+        plans = [
+            [Decimal(rng.randint(1, 50000)) / 100 for _ in range(self.iterations)]
+            for _ in range(self.workers)
+        ]
+        expected = sum(sum(plan) for plan in plans)
+        errors = []
+        start = threading.Barrier(len(plans))
+
+        def kiosk(n, plan):
+            try:
+                start.wait()
+                for delta in plan:
+                    # 문 열 때 무게를 -delta로 두면 저울(0kg)과의 차이가 폐기량 delta가 된다
+                    update_weight(COMPANY, f"kiosk{n}", -float(delta), uid=f"UID {n:02d}")
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()  # 스레드별 DB 연결 정리
+
+        with mock.patch('rfid.weight.get_weight_v2', return_value=0.0):
+            threads = [threading.Thread(target=kiosk, args=(n, plan)) for n, plan in enumerate(plans)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Weight_v3.objects.get(asgn_cd=ASGN_CD).weight, expected)
+        events = DisposalEvent.objects.filter(asgn_cd=ASGN_CD)
+        self.assertEqual(events.count(), self.workers * self.iterations)
+        self.assertEqual(events.aggregate(total=Sum('delta'))['total'], expected)
+        rollups = DisposalRollup.objects.filter(period=DisposalRollup.PERIOD_DAY, asgn_cd=ASGN_CD)
+        self.assertEqual(
+            rollups.aggregate(total=Sum('total'), count=Sum('event_count')),
+            {'total': expected, 'count': self.workers * self.iterations},
+        )
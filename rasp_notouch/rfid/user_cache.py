@@ -0,0 +1,123 @@
+# rfid/user_cache.py
+# UID -> 사용자 정보 읽기 캐시.
+# 태깅 한 번에 check_user가 여러 번 불리므로 프로세스 메모리에 LRU로 보관하고,
+# User_v3 저장·삭제 시그널(rfid/signals.py)로 무효화한다.
+# ORM 객체를 여러 요청 스레드가 함께 쓰지 않도록 필요한 값만 바뀌지 않는 CachedUser로 보관한다.
+# 다른 프로세스(관리자 화면, 다른 워커)에서 바뀐 내용은 USER_CACHE_CHECK_INTERVAL마다
+# 사용자 수와 최근 수정 시각(updated_at)을 한 번의 쿼리로 확인해 달라졌으면 비운다.
+# TTL은 확인 쿼리로 잡히지 않는 변경(queryset.update 등)에 대비한 안전장치로 길게 둔다.
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from .models import User_v3
+
+logger = logging.getLogger('rasp')
+
+
+class CachedUser(NamedTuple):
+    uid: str
+    name: str
+    company: str
+    depart: str
+    asgn_cd: int
+
+    @classmethod
+    def from_model(cls, user):
+        return cls(user.uid, user.name, user.company, user.depart, user.asgn_cd_id)
+
+
+class UserCache:
+
+    def __init__(self, max_size=512, ttl=3600, check_interval=5):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self._items = OrderedDict()  # uid -> (적재 시각, CachedUser)
+        self._lock = threading.Lock()
+        self._version = None  # (사용자 수, 최근 수정 시각)
+        self._checked_at = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _current_version():
+        row = User_v3.objects.aggregate(count=Count('uid'), updated=Max('updated_at'))
+        return row['count'], row['updated']
+
+    def _check_version(self):
+        """check_interval마다 DB의 사용자 버전을 확인해 바뀌었으면 캐시를 비운다"""
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+        version = self._current_version()
+        with self._lock:
+            if version != self._version:
+                if self._version is not None:
+                    self._items.clear()
+                self._version = version
+
+    def _put(self, user):
+        with self._lock:
+            self._items[user.uid] = (time.monotonic(), user)
+            self._items.move_to_end(user.uid)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def get(self, uid):
+        """캐시에서 사용자 조회, 없거나 만료됐으면 DB에서 읽어 캐시. 없는 UID는 User_v3.DoesNotExist"""
+        self._check_version()
+        with self._lock:
+            item = self._items.get(uid)
+            if item is not None and time.monotonic() - item[0] < self.ttl:
+                self._items.move_to_end(uid)
+                self.hits += 1
+                return item[1]
+            self.misses += 1
+
+        user = CachedUser.from_model(User_v3.objects.get(uid=uid))
+        self._put(user)
+        return user
+
+    def invalidate(self, uid):
+        with self._lock:
+            self._items.pop(uid, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def warm_up(self):
+        """시작 시 사용자 전체(최대 max_size명)를 한 번의 쿼리로 미리 적재"""
+        version = self._current_version()
+        count = 0
+        for user in User_v3.objects.all()[:self.max_size]:
+            self._put(CachedUser.from_model(user))
+            count += 1
+        with self._lock:
+            self._version, self._checked_at = version, time.monotonic()
+        logger.info(f"사용자 캐시 적재: {count}명")
+        return count
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_user_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = UserCache(
+                max_size=settings.USER_CACHE_SIZE,
+                ttl=settings.USER_CACHE_TTL,
+                check_interval=settings.USER_CACHE_CHECK_INTERVAL,
+            )
+    return _cache
@@ -2,8 +2,10 @@ import logging
 from django.shortcuts import render
 from django.shortcuts import render
 from rasp import settings
-from rfid import rfid_reader
+from rfid import metrics, rfid_reader
+from rfid.company_registry import get_company_registry
 from rfid.exceptions import CustomException
+from rfid.user_cache import get_user_cache
 from rfid.utils import handle_exception
 from .models import User_v3, Weight_v3
 from django.core.exceptions import ObjectDoesNotExist
@@ -12,11 +14,13 @@ logger = logging.getLogger('rasp')
 logger.setLevel(logging.INFO)
 
 # 사용자 확인 함수 (ORM 사용)
+# 태깅 한 번에 여러 번 불리므로 user_cache를 거쳐 DB 조회를 줄인다.
+@metrics.timed('check_user')
 def check_user(uid):
     try:
         # UID를 기반으로 사용자 검색
-        user = User_v3.objects.get(uid=uid)
-        logger.info(f"사용자 확인 성공: {user.name}, UID: {uid}")
+        user = get_user_cache().get(uid)
+        logger.debug(f"사용자 확인 성공: {user.name}, UID: {uid}")
         return user
     except ObjectDoesNotExist:
         # 사용자를 찾지 못한 경우 예외 처리
@@ -65,35 +69,15 @@ def add_user(request):
         raise CustomException(f"사용자 추가 중 오류 발생: {str(e)}", status_code=500)
 
     
-# 회사코드 생성
+# 회사코드 조회 - 매핑은 Company 테이블(0012 마이그레이션에서 기존 매핑표로 채움)
 # 선행도장부 : 금양기업, 은성기업, 태양인더스트리, 한솔선박
 # 도장부     : 미주이엔지, 부림기업, 세왕기업, 안진테크, 찬승, 일영기업, 해강이엔지
 # 기장부     : 번영이엔지, 석영
-@handle_exception
 def get_asgn_cd(company_name):
-    company_mapping = {
-        
-        # 환경보건부
-        "환경보건부": 0000,
-
-        # 선행도장부
-        "금양기업": 8414,
-        "은성기업": 8419,
-        "태양인더스트리": 8463,
-        "한솔선박": 8417,
-
-        # 도장부
-        "미주이엔지": 8466,
-        "부림기업": 8460,
-        "세왕기업": 8458,
-        "안진테크": 8468,
-        "찬승": 8469,
-        "일영기업": 8459,
-        "해강이엔지": 8467,
+    asgn_cd = get_company_registry().asgn_cd(company_name)
+    return "UNKNOWN" if asgn_cd is None else asgn_cd
 
-        # 기장부
-        "번영이엔지": 8462,
-        "석영": 8645,
 
-    }    
-    return company_mapping.get(company_name, "UNKNOWN")
+# asgn_cd -> 회사명(등록되지 않은 코드는 None)
+def get_company(asgn_cd):
+    return get_company_registry().company(asgn_cd)
@@ -3,21 +3,20 @@ from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.shortcuts import render, redirect
 from django.urls import reverse
-import gpiozero
-from mfrc522 import SimpleMFRC522
 from rasp import settings
 from rfid.exceptions import CustomException
-from gpiozero import DigitalOutputDevice
-import spidev
 import paho.mqtt.client as mqtt
 import paho.mqtt.publish as publish
-spi = spidev.SpiDev()
-spi.open(0, 0)
-spi.max_speed_hz = 50000  # SPI 속도를 50kHz로 낮춤
 
 # Create your views here.
 
 
+# MFRC522(SPI) 리더 - 드라이버는 실제로 태깅할 때 불러온다(import 시 SPI/GPIO를 열지 않음)
+def _mfrc522_reader():
+    from mfrc522 import SimpleMFRC522
+    return SimpleMFRC522(reset_pin=16)  # 실제 연결된 gpio핀 번호로 리셋핀 설정
+
+
 #잠금장치 ---> on이 열림 / off가 잠김
 # lock = DigitalOutputDevice(21, active_high=False)
 
@@ -55,7 +54,7 @@ class User_Control:
     # RFID 태그 읽기 및 사용자 확인
     def read_tag(request):
         try:
-            reader = SimpleMFRC522(reset_pin=16)  # RFID리더기 객체 생성, 실제 연결된 gpio핀 번호로 리셋핀 설정
+            reader = _mfrc522_reader()  # RFID리더기 객체 생성
             uid, data = reader.read() # RFID 태그 읽기
             user = User_Control.check_user(uid)  # UID로 사용자 확인
             if user:
@@ -77,6 +76,7 @@ class User_Control:
         except Exception as e:
             # 오류 발생 시 에러 페이지로 이동
             print(e)
+            from gpiozero import DigitalOutputDevice
             DigitalOutputDevice(16).off()
             return render(request, 'error.html', {'message': f"태깅 중 에러 발생: {e}"})
 
@@ -93,7 +93,7 @@ class User_Control:
             
             if name and company:  # 입력 데이터 유효성 검사
                 try:
-                    reader = SimpleMFRC522(reset_pin=16)  # RFID리더기 객체 생성, 실제 연결된 gpio핀 번호로 리셋핀 설정
+                    reader = _mfrc522_reader()  # RFID리더기 객체 생성
                     # RFID 태그 읽기
                     uid, data = reader.read()
 
@@ -195,7 +195,7 @@ class Paint_Control:
 
     # 처음에 댔던 태그랑 맞는지 비교
     def lockTag(name, company):
-        reader = SimpleMFRC522(reset_pin=16)  # RFID 리더기 초기화
+        reader = _mfrc522_reader()  # RFID 리더기 초기화
         try:
             uid, data = reader.read()
             if uid == None:
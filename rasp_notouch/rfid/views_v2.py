@@ -1,10 +1,14 @@
+import json
 import logging
-from django.http import JsonResponse
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
-from rfid import rfid_reader, user_management, weight
+from rfid import metrics, rfid_reader, session_tasks, tag_monitor, user_management, weight
 from rfid.exceptions import CustomException
 from rfid.utils import handle_exception
-from gpiozero import DigitalOutputDevice
 from rfid.hardware import get_lock
 # 로깅 설정
 logger = logging.getLogger('rasp')
@@ -15,6 +19,7 @@ logger.info("로깅 시작")
 
 
 # 메인 --> 폐기
+@metrics.timed('view.check_rfid')
 @handle_exception
 def check_rfid(request):
     # return JsonResponse({"uid": "04 E3 43 6A 76 13 90"}, status=200) # 이창환_사무실
@@ -26,9 +31,11 @@ def check_rfid(request):
             return JsonResponse({"uid": uid}, status=200)  # UID 반환
         return JsonResponse({"uid": None}, status=204)  # 태깅 안 됨
     except Exception as e:
+        metrics.inc('rasp_reader_errors_total')
         return JsonResponse({"error": str(e)}, status=500)  # 오류 발생 시
 
 # 폐기 --> 결과
+@metrics.timed('view.check_rfid_disposal')
 @handle_exception
 def check_rfid_disposal(request):
     # return JsonResponse({"tagged": True, "uid": "04 E3 43 6A 76 13 90"}, status=200) # 이창환_사무실
@@ -45,9 +52,68 @@ def check_rfid_disposal(request):
             return JsonResponse({"tagged": True, "uid": uid}, status=200)  # UID 반환
         return JsonResponse({"tagged": False, "uid": None}, status=200)  # 태깅 안 됨
     except Exception as e:
+        metrics.inc('rasp_reader_errors_total')
         return JsonResponse({"error": str(e)}, status=500)  # 오류 발생 시
 
-    
+
+
+# 태그 이벤트 스트림(SSE) - 카드가 인식되는 즉시 브라우저로 push
+# ASGI(uvicorn/daphne)로 실행하면 대기 중인 스트림이 워커를 점유하지 않는다.
+# WSGI에서도 동작하지만 연결마다 워커 스레드 하나를 사용한다.
+def _sse_tag(event):
+    data = json.dumps({"uid": event.uid, "ts": event.timestamp})
+    return f"id: {event.seq}\nevent: tag\ndata: {data}\n\n"
+
+
+def tag_events(request):
+    monitor = tag_monitor.get_tag_monitor()
+    # 재연결 시 브라우저가 보내는 Last-Event-ID 이후부터, 처음이면 지금 이후 이벤트만 전달
+    try:
+        after = int(request.headers.get('Last-Event-ID') or monitor.last_seq)
+    except ValueError:
+        after = monitor.last_seq
+    keepalive = settings.TAG_STREAM_KEEPALIVE
+    deadline = time.monotonic() + settings.TAG_STREAM_MAX_DURATION  # 이후 브라우저가 자동 재연결
+
+    def deliver(event):
+        monitor.consume(event.seq)  # 폴링(fallback)에서 같은 태그를 다시 꺼내지 않도록
+        return _sse_tag(event)
+
+    async def async_stream():
+        last = after
+        yield "retry: 2000\n\n"
+        wait = sync_to_async(monitor.wait_event, thread_sensitive=False)
+        while time.monotonic() < deadline:
+            event = await wait(last, keepalive)
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            last = event.seq
+            yield deliver(event)
+
+    def sync_stream():
+        last = after
+        yield "retry: 2000\n\n"
+        while time.monotonic() < deadline:
+            event = monitor.wait_event(last, keepalive)
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            last = event.seq
+            yield deliver(event)
+
+    stream = async_stream() if isinstance(request, ASGIRequest) else sync_stream()
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+# 처리 구간별 소요 시간/오류 카운터(Prometheus 텍스트)
+def metrics_view(request):
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 def set_session(request, key, value):
     # 세션 데이터 설정 함수
     request.session[key] = value
@@ -66,10 +132,12 @@ def delete_session(request, key):
         del request.session[key]
 
 
+@metrics.timed('view.home')
 @handle_exception
 def homePage(request):
     lock = get_lock()
     lock.off()  # 문 열기 # 잠금 장치 닫기
+    session_tasks.release_session(request)
     delete_session(request, 'uid')
     delete_session(request, 'current_weight')
     return render(request, 'home.html')
@@ -92,6 +160,7 @@ def del_card(request):
     return render(request, 'del_user.html')
 
 # 폐기 중 화면 렌더링
+@metrics.timed('view.disposal')
 @handle_exception
 def disposal(request, uid):
     # RFID 태깅 및 처리 화면
@@ -111,8 +180,17 @@ def disposal(request, uid):
         # 처리 성공 시 잠금 장치 해제 
         lock = get_lock()  
         lock.on() # 열기
+        # 폐기 1건의 시작 - analyze_logs가 타임라인 기준으로 쓰므로 INFO로 남긴다(check_user는 DEBUG)
+        logger.info(f"문 열기: {user.name}, UID: {uid}", extra={'uid': uid})
+        # 자동 잠금 대상 세션으로 등록(session_tasks.check_timeout_sessions)
+        session_tasks.register_session(request, uid)
         message = f"사용자 {user.name}이(가) 확인되었습니다."
-        return render(request, 'disposal.html', {'message': message, 'user': user, 'uid': user.uid})
+        return render(request, 'disposal.html', {
+            'message': message,
+            'user': user,
+            'uid': user.uid,
+            'auto_result_after_ms': settings.DISPOSAL_TIMEOUT * 1000,
+        })
 
     except CustomException as e:
         logger.warning(f"처리 중 오류 발생: {e}")
@@ -122,6 +200,7 @@ def disposal(request, uid):
         return render(request, 'error.html', {'message': "예기치 못한 오류가 발생했습니다."})
 
 # 처리 결과 화면
+@metrics.timed('view.result')
 @handle_exception
 def result(request):
     logger.info("Result 호출")
@@ -146,13 +225,18 @@ def result(request):
 
         cur_weight = get_session(request, 'cur_weight')
         
-        weight_info = weight.update_weight(company, name, cur_weight)
+        weight_info = weight.update_weight(company, name, cur_weight, uid=uid)
 
         # 잠금 장치 닫기
         lock = get_lock()  
         lock.off()
         #데이터 발행
-        weight.publish_weight(company, weight_info.get('disposal_weight'))
+        weight.publish_weight(
+            company,
+            weight_info.get('disposal_weight'),
+            weight_info.get('company_weight'),
+            event_id=weight_info.get('event_id'),
+        )
         return render(request, 'result.html', {
             'name': name,
             'company': company,
@@ -164,6 +248,7 @@ def result(request):
         logger.warning(f"결과 처리 중 오류 발생: {e}")
         return render(request, 'error.html', {'message': e.message})
     finally:
+        session_tasks.release_session(request)
         delete_session(request, 'uid')
         delete_session(request, 'cur_weight')
 
@@ -1,17 +1,20 @@
 import json
 import logging
-import re
-import serial
-from rfid import user_management
+import time
+from django.conf import settings
+from django.db import transaction
+from rfid import ledger, metrics, mqtt_batcher, outbox, user_management
+from rfid.company_registry import get_company_registry
 from rfid.exceptions import CustomException
 from .models import Weight_v3
-import paho.mqtt.client as mqtt
 
 
 logger = logging.getLogger('rasp')
 logger.setLevel(logging.INFO)
 
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
+
+WEIGHT_QUANTUM = Decimal("0.01")  # Weight_v3.weight decimal_places=2
 
 # Decimal 타입을 처리하기 위한 함수 정의
 def decimal_default(obj):
@@ -21,70 +24,72 @@ def decimal_default(obj):
 
 
 # 저울에서 무게 읽어오기
+# HARDWARE_MODE = 'daemon'이면 저울 포트를 가진 하드웨어 데몬에 요청한다.
+@metrics.timed('get_weight')
 def get_weight_v2():
     # return 0
-    PORT = "/dev/serial0"
-    BAUDRATE = 9600
-    TIMEOUT = 1
-    WEIGHT_PATTERN = r"-?\s*\d+\.\d{1,2}\s*kg"  # 음수와 공백 허용
+    if settings.HARDWARE_MODE == 'daemon':
+        from rfid.hwd import get_client
+        return get_client().read_weight()
+    return read_local_weight()
+
+
+# 포트는 scale.ScaleReader 스레드가 계속 열어두고 있으므로, 최근 측정값이 안정되는 즉시 반환한다.
+def read_local_weight():
+    from rfid import scale  # numpy/pyserial은 저울을 실제로 읽을 때 불러온다
+    reader = scale.get_scale_reader()
+    started = time.perf_counter()
+    result = reader.stable_weight(
+        window=settings.SCALE_STABLE_WINDOW,
+        tolerance=settings.SCALE_STABLE_TOLERANCE,
+        max_wait=settings.SCALE_STABLE_MAX_WAIT,
+        max_age=settings.SCALE_MAX_AGE,
+        outlier_k=settings.SCALE_OUTLIER_K,
+    )
+
+    if result is None:
+        if reader.overload:
+            metrics.inc('rasp_scale_failures_total', reason='overload')
+            logger.warning("저울 과부하 상태입니다.")
+            raise CustomException("저울 과부하 상태입니다.", status_code=484)
+        if not reader.connected:
+            metrics.inc('rasp_scale_failures_total', reason='disconnected')
+            raise CustomException(f"시리얼 통신 오류: {reader.last_error}", status_code=404)
+        metrics.inc('rasp_scale_failures_total', reason='no_data')
+        logger.warning("무게 값을 추출할 수 없습니다.")
+        raise CustomException("유효한 데이터가 수신되지 않았습니다.(저울)", status_code=484)
+
+    weight, stable = result
+    latency_ms = round((time.perf_counter() - started) * 1000, 1)
+    if not stable:
+        logger.warning(f"저울 값이 안정되지 않았습니다. 중앙값 사용: {weight}", extra={'latency_ms': latency_ms})
+    logger.info(f"평균 무게 값: {weight}", extra={'latency_ms': latency_ms})
+    return weight
+
+
+@metrics.timed('weight_save')
+def accumulate_weight(asgn_cd, delta, uid=None):
+    """
+    회사 누적 폐기량에 delta(kg)를 더한다(결과가 0 미만이면 0).
+    행 잠금(select_for_update) 트랜잭션 안에서 Decimal로 계산하므로
+    여러 키오스크가 같은 회사를 동시에 갱신해도 누락되지 않는다.
+    uid가 주어지면 같은 트랜잭션에서 폐기 이벤트 원장(ledger)도 기록한다.
+    (이전 값, 새 값, DisposalEvent 또는 None) 반환
+    """
+    delta = Decimal(str(delta)).quantize(WEIGHT_QUANTUM, rounding=ROUND_HALF_UP)
+    event = None
+    with transaction.atomic():
+        cur_state = Weight_v3.objects.select_for_update().get(asgn_cd=asgn_cd)  # 현재 해당 기업 무게
+        before = cur_state.weight
+        after = max(before + delta, Decimal("0.00"))
+        cur_state.weight = after
+        cur_state.save(update_fields=["weight"])
+        if uid is not None:
+            event = ledger.record_disposal(uid, asgn_cd, before, after, delta)
+    return before, after, event
 
-    total_weight = 0
-    count = 0
 
-    try:
-        ser = serial.Serial(
-            port=PORT,
-            baudrate=BAUDRATE,
-            bytesize=serial.EIGHTBITS,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            timeout=TIMEOUT,
-            rtscts=False,
-            xonxoff=False,
-        )
-        logger.info("저울과 통신 시작")
-        
-        for _ in range(3):
-            try:
-                # 원본 데이터 읽기
-                data = ser.readline().decode("ascii", errors="ignore").strip()
-                # 제어 문자 제거
-                cleaned_data = re.sub(r"[^\x20-\x7E]", "", data)
-                # 정규 표현식으로 무게 추출
-                match = re.search(WEIGHT_PATTERN, cleaned_data)
-                if match:
-                    # 공백 제거 후 float로 변환
-                    weight_str = match.group().replace('kg', '').replace(' ', '').strip()
-                    weight = float(weight_str)
-                    # logger.info(f"추출된 무게 값: {weight}")
-
-                    if weight <= 0:
-                        weight = 0.0
-                    total_weight += weight
-                    count += 1
-                else:
-                    logger.warning("무게 값을 추출할 수 없습니다.")
-            except Exception as e:
-                logger.warning(f"데이터 처리 중 오류 발생: {e}")
-
-        if count == 0:
-            raise CustomException("유효한 데이터가 수신되지 않았습니다.(저울)", status_code=484)
-
-        avg_weight = total_weight / count
-        logger.info(f"평균 무게 값: {avg_weight}")
-        return avg_weight
-
-    except serial.SerialException as e:
-        logger.error(f"시리얼 통신 오류: {e}")
-        raise CustomException(f"시리얼 통신 오류: {e}", status_code=404)
-
-    finally:
-        if 'ser' in locals() and ser.is_open:
-            ser.close()
-            logger.info("직렬 포트를 닫았습니다.")
-
-
-def update_weight(company, name, cur_weight):
+def update_weight(company, name, cur_weight, uid=None):
 
     if not company:
         logger.warning("회사명이 입력되지 않았습니다.")
@@ -93,20 +98,20 @@ def update_weight(company, name, cur_weight):
     asgn_cd = user_management.get_asgn_cd(company)
 
     try:
-        cur_state = Weight_v3.objects.get(asgn_cd = asgn_cd) # 현재 해당 기업 무게
-
         disposal_weight = get_weight_v2() - cur_weight # 현재 저울에 띄워져있는 무게 - 이전 사이클을 돌았을 때의 무게 --> 무게 변화량
+        disposal_weight = round(disposal_weight, 2)
 
-        company_disposal = float(cur_state.weight) + disposal_weight
-
-        if(company_disposal < 0): company_disposal = 0
-        
-        cur_state.weight = company_disposal
-        cur_state.save()
+        # 저울 대기 중에는 행을 잠그지 않도록 측정 후 한 번에 반영
+        _, company_disposal, event = accumulate_weight(asgn_cd, disposal_weight, uid=uid)
 
         message = f"{name}님의 폐기량은 {disposal_weight:.2f}kg입니다."
-        logger.info(message)
-        return {'message': message, 'disposal_weight': disposal_weight, 'company_weight': company_disposal}
+        logger.info(message, extra={'uid': uid, 'asgn_cd': asgn_cd, 'delta': disposal_weight})
+        return {
+            'message': message,
+            'disposal_weight': disposal_weight,
+            'company_weight': company_disposal,
+            'event_id': event.id if event else None,
+        }
 
     except Weight_v3.DoesNotExist:
         logger.error(f"회사 '{company}' 데이터가 없습니다.")
@@ -116,51 +121,56 @@ def update_weight(company, name, cur_weight):
         logger.error(f"서버 오류 발생: {e}")
         raise CustomException("서버 오류 발생", status_code=500)
 
-def publish_weight(company, disposal_weight, topic="test/rp165"):  
+def asgn_codes(company):
+    """회사명 -> 4자리 asgn_cd 문자열 목록"""
+    code = get_company_registry().code(company)
+    if code is not None:
+        return (code,)
+    # 등록부에 없는 회사는 DB에 등록된 코드를 사용
+    rows = Weight_v3.objects.filter(company=company).values_list("asgn_cd", flat=True)
+    return tuple(f"{a:04d}" for a in rows)
+
+
+@metrics.timed('publish')
+def publish_weight(company, disposal_weight, company_weight=None, event_id=None, topic=None):
     """
     payload 예: [ {"ASGN_CD":"HMD", "company":"HD현대미포", "weight":100}, ... ]
+    이벤트는 먼저 로컬 아웃박스 저널에 기록되고, 전송은 아웃박스 드레이너가 브로커 연결 상태에 맞춰 처리한다.
+    (브로커 장애 중에도 이벤트가 사라지지 않고 복구 후 재전송됨)
+    MQTT_PUBLISH_MODE = 'batch' 이면 이벤트를 묶음 대상으로 저널에 기록하고,
+    드레이너가 일정 시간(또는 N건) 단위로 회사별 합계를 한 메시지로 합쳐 발행한다(mqtt_batcher).
     """
-    client = mqtt.Client("rp165")
-    client.connect("10.150.232.41")
-    client.reconnect_delay_set(min_delay=1, max_delay=60)
-
     try:
-        # DB에서 asgn_cd(정수/문자 어떤 타입이 와도 4자리 문자열로 보정)
-        rows = list(
-            Weight_v3.objects
-            .filter(company=company)
-            .values("asgn_cd", "company")
-        )
-
-        payload = []
-        for r in rows:
-            asgn = r["asgn_cd"]
-            # 정수면 4자리 제로패딩, 문자열이어도 zfill(4)로 통일
-            if isinstance(asgn, int):
-                asgn_str = f"{asgn:04d}"
-            else:
-                asgn_str = str(asgn).zfill(4)
-
-            payload.append({
+        codes = asgn_codes(company)
+
+        if settings.MQTT_PUBLISH_MODE == 'batch':
+            messages = [mqtt_batcher.encode_event(asgn_str, company, disposal_weight, company_weight)
+                        for asgn_str in codes]
+        else:
+            payload = [{
                 "asgn_cd": asgn_str,
-                "company": r["company"],
+                "company": company,
                 "weight": disposal_weight,  # 숫자 그대로 유지
-            })
-
-        # JSON 변환
-        message = json.dumps(payload, ensure_ascii=False)  # default=decimal_default 필요시 유지
-
-        # MQTT 발행(QoS 1 권장) 및 전송 완료 대기
-        info = client.publish(topic, message, qos=0, retain=False)
-        info.wait_for_publish()
+            } for asgn_str in codes]
 
-        logger.info("MQTT 메시지 발행 완료: %s", message)
+            # JSON 변환
+            messages = [json.dumps(payload, ensure_ascii=False)]  # default=decimal_default 필요시 유지
 
     except Exception as e:
         logger.error(f"MQTT 발행 중 오류 발생: {e}")
         raise CustomException("MQTT 발행 오류", status_code=500)
-    finally:
-        client.disconnect()
+
+    # 아웃박스 저널에 기록(전송/재전송은 드레이너 스레드가 처리)
+    try:
+        for message in messages:
+            outbox.get_outbox().append(
+                topic or settings.MQTT_TOPIC, message, event_ids=[event_id] if event_id else None,
+                coalesce=settings.MQTT_PUBLISH_MODE == 'batch',
+            )
+    except Exception as e:
+        metrics.inc('rasp_publish_failures_total', reason='outbox')
+        logger.error(f"MQTT 아웃박스 기록 중 오류 발생: {e}")
+        raise CustomException("MQTT 발행 오류", status_code=500)
 
 # def publish_weight(company, disposal_weight):  # 이상적인 형태는 [ {“ASGN_CD”:”HMD”, “company”:”HD현대미포”, “weight”:100} , … ] 
 #     client = mqtt.Client("rp165")